@@ -11,7 +11,7 @@ data class ModelsResponseDto(
 @Serializable
 data class ModelDto(
     val id: String,
-    val script: String,
+    val script: String? = null,
     val active: Boolean,
 )
 
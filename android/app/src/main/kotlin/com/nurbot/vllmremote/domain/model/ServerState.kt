@@ -5,6 +5,7 @@ enum class ServerState(val label: String) {
     Stopped("Stopped"),
     Starting("Starting"),
     Stopping("Stopping"),
+    Sleeping("Sleeping"),
     Error("Error"),
     ShuttingDown("Shutting Down");
 
@@ -14,6 +15,7 @@ enum class ServerState(val label: String) {
             "stopped" -> Stopped
             "starting" -> Starting
             "stopping" -> Stopping
+            "sleeping" -> Sleeping
             "error" -> Error
             "shutting_down" -> ShuttingDown
             else -> Error
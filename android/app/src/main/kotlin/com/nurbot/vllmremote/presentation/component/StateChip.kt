@@ -18,6 +18,7 @@ fun StateChip(state: ServerState) {
         ServerState.Stopped -> ChipStopped
         ServerState.Starting -> SeverityYellow
         ServerState.Stopping -> SeverityYellow
+        ServerState.Sleeping -> ChipStopped
         ServerState.Error -> SeverityRed
         ServerState.ShuttingDown -> SeverityRed
     }
@@ -0,0 +1,90 @@
+"""Health probes per second: the manager's pooled httpx client against forking curl per probe.
+
+curl per probe is how the manager probed vLLM before the shared client. Without --url a
+local stub vLLM is started, so the numbers show the cost of the probe itself.
+
+    python bench/probe_throughput.py --probes 500 --concurrency 1 8
+"""
+import argparse
+import asyncio
+import logging
+import shutil
+import sys
+import time
+from pathlib import Path
+from typing import Optional
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import main as manager  # noqa: E402
+from stub_vllm import start_stub  # noqa: E402
+
+
+async def pooled_probe(base_url: str) -> bool:
+    ok, _, _ = await manager.check_vllm_health_details(base_url)
+    return ok
+
+
+async def curl_probe(base_url: str) -> bool:
+    process = await asyncio.create_subprocess_exec(
+        "curl", "-s", "-o", "/dev/null", "-w", "%{http_code}",
+        "--max-time", str(manager.HEALTH_REQUEST_TIMEOUT), f"{base_url}/health",
+        stdout=asyncio.subprocess.PIPE,
+        stderr=asyncio.subprocess.PIPE,
+    )
+    stdout, _ = await process.communicate()
+    return stdout.decode().strip() == "200"
+
+
+async def measure(probe, base_url: str, probes: int, concurrency: int) -> dict:
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def one() -> bool:
+        async with semaphore:
+            return await probe(base_url)
+
+    started = time.perf_counter()
+    results = await asyncio.gather(*(one() for _ in range(probes)))
+    duration = time.perf_counter() - started
+    return {
+        "probes": probes,
+        "failed": results.count(False),
+        "duration_s": round(duration, 3),
+        "probes_per_s": round(probes / duration, 1),
+    }
+
+
+async def run(base_url: str, probes: int, levels: list[int]) -> list[dict]:
+    methods = {"pooled httpx": pooled_probe}
+    if shutil.which("curl"):
+        methods["curl per probe"] = curl_probe
+    else:
+        print("curl is not installed, measuring the pooled client only", file=sys.stderr)
+    rows = []
+    for concurrency in levels:
+        for name, probe in methods.items():
+            await probe(base_url)  # connect before timing
+            rows.append({"method": name, "concurrency": concurrency, **await measure(probe, base_url, probes, concurrency)})
+    await manager.close_http_client()
+    return rows
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Compare vLLM health probe throughput")
+    parser.add_argument("--url", help="vLLM base URL; a local stub is started when omitted")
+    parser.add_argument("--probes", type=int, default=500, help="probes per method and concurrency level")
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 8])
+    args = parser.parse_args(argv)
+    logging.getLogger("httpx").setLevel(logging.WARNING)
+
+    base_url = args.url.rstrip("/") if args.url else start_stub()[1]
+    rows = asyncio.run(run(base_url, args.probes, args.concurrency))
+    print(f"Health probes against {base_url}")
+    print(f"{'method':<16} {'conc':>5} {'probes/s':>10} {'failed':>7}")
+    for row in rows:
+        print(f"{row['method']:<16} {row['concurrency']:>5} {row['probes_per_s']:>10} {row['failed']:>7}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
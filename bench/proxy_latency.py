@@ -0,0 +1,145 @@
+"""Per-token latency the manager's /v1 proxy adds to a streamed completion.
+
+Streams the same completions from a local stub vLLM directly and through the manager's
+proxy, both in their own processes, and compares how long each token takes to arrive
+after the stub sent it.
+
+    python bench/proxy_latency.py --requests 50 --tokens 64 --concurrency 1 8
+"""
+import argparse
+import asyncio
+import json
+import logging
+import multiprocessing
+import socket
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Optional
+
+import httpx
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from benchmark import percentile  # noqa: E402
+from stub_vllm import SERVED_MODEL, start_stub  # noqa: E402
+
+
+def serve_proxy(stub_url: str, ready):
+    """Run the manager with only its proxy in play: config, state and lifecycle are faked."""
+    import uvicorn
+
+    import main as manager
+
+    workdir = Path(tempfile.mkdtemp(prefix="proxy-bench-"))
+    script = workdir / "start_stub.sh"
+    script.write_text(f"#!/bin/bash\nexec vllm serve /models/{SERVED_MODEL}\n")
+    (workdir / "config.yaml").write_text(f"proxy:\n  enabled: true\nmodels:\n  stub:\n    script: {script}\n")
+    manager.config_store = manager.ConfigStore(workdir / "config.yaml")
+    manager.warmup_recorder = manager.WarmupRecorder(workdir / "warmup_prompts.json")
+    manager.VLLM_BASE_URL = stub_url
+    manager.app_state.current_model = "stub"
+    manager.app_state.state = "running"
+    manager.app_state.ready_event.set()
+
+    # IPPROTO_TCP, as uvicorn.run's own listener gets it, so asyncio turns Nagle off on accepted
+    # connections; a bare socket.socket() leaves it on and batches the tokens behind delayed ACKs
+    sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM, socket.IPPROTO_TCP)
+    sock.bind(("127.0.0.1", 0))
+    ready.put(sock.getsockname()[1])
+    server = uvicorn.Server(uvicorn.Config(manager.app, lifespan="off", log_level="warning"))
+    server.run(sockets=[sock])
+
+
+def start_proxy(stub_url: str) -> tuple[multiprocessing.Process, str]:
+    ready = multiprocessing.Queue()
+    process = multiprocessing.Process(target=serve_proxy, args=(stub_url, ready), daemon=True)
+    process.start()
+    return process, f"http://127.0.0.1:{ready.get(timeout=30)}"
+
+
+async def wait_until_serving(client: httpx.AsyncClient, base_url: str):
+    deadline = time.monotonic() + 30
+    while True:
+        try:
+            response = await client.get(f"{base_url}/v1/models")
+            if response.status_code == 200:
+                return
+        except httpx.HTTPError:
+            pass
+        if time.monotonic() > deadline:
+            raise RuntimeError(f"{base_url} did not come up")
+        await asyncio.sleep(0.1)
+
+
+async def token_latencies(client: httpx.AsyncClient, base_url: str, tokens: int) -> list[float]:
+    """One streamed completion; seconds between the stub sending each token and it arriving here."""
+    payload = {"model": SERVED_MODEL, "prompt": "hello", "max_tokens": tokens, "stream": True}
+    latencies = []
+    async with client.stream("POST", f"{base_url}/v1/completions", json=payload) as response:
+        response.raise_for_status()
+        async for line in response.aiter_lines():
+            if line.startswith("data:") and line[5:].strip() != "[DONE]":
+                latencies.append(time.time() - json.loads(line[5:])["sent"])
+    return latencies
+
+
+async def measure(client: httpx.AsyncClient, base_url: str, requests: int, tokens: int, concurrency: int) -> dict:
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def one() -> list[float]:
+        async with semaphore:
+            return await token_latencies(client, base_url, tokens)
+
+    await one()  # connect and warm up before timing
+    results = await asyncio.gather(*(one() for _ in range(requests)))
+    latencies = [latency for result in results for latency in result]
+    return {
+        "tokens": len(latencies),
+        **{f"p{q}_us": round(percentile(latencies, q) * 1e6) for q in (50, 99)},
+    }
+
+
+async def run(stub_url: str, proxy_url: str, requests: int, tokens: int, levels: list[int]) -> list[dict]:
+    limits = httpx.Limits(max_connections=max(levels), max_keepalive_connections=max(levels))
+    async with httpx.AsyncClient(timeout=60, limits=limits) as client:
+        await wait_until_serving(client, stub_url)
+        await wait_until_serving(client, proxy_url)
+        rows = []
+        for concurrency in levels:
+            direct = await measure(client, stub_url, requests, tokens, concurrency)
+            proxied = await measure(client, proxy_url, requests, tokens, concurrency)
+            rows.append({
+                "concurrency": concurrency,
+                "direct": direct,
+                "proxied": proxied,
+                "added_p50_us": proxied["p50_us"] - direct["p50_us"],
+                "added_p99_us": proxied["p99_us"] - direct["p99_us"],
+            })
+    return rows
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Measure the per-token latency added by the /v1 proxy")
+    parser.add_argument("--requests", type=int, default=50, help="streamed completions per concurrency level")
+    parser.add_argument("--tokens", type=int, default=64, help="tokens per completion")
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 8])
+    args = parser.parse_args(argv)
+    logging.getLogger("httpx").setLevel(logging.WARNING)
+
+    _, stub_url = start_stub()
+    _, proxy_url = start_proxy(stub_url)
+    rows = asyncio.run(run(stub_url, proxy_url, args.requests, args.tokens, args.concurrency))
+    print(f"Per-token latency, {args.requests} x {args.tokens}-token streams per level (microseconds)")
+    print(f"{'conc':>5} {'direct p50':>11} {'proxy p50':>10} {'added p50':>10} {'direct p99':>11} {'proxy p99':>10} {'added p99':>10}")
+    for row in rows:
+        print(
+            f"{row['concurrency']:>5} {row['direct']['p50_us']:>11} {row['proxied']['p50_us']:>10} {row['added_p50_us']:>10} "
+            f"{row['direct']['p99_us']:>11} {row['proxied']['p99_us']:>10} {row['added_p99_us']:>10}"
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,87 @@
+"""Minimal stand-in for a vLLM server, used by the scripts in this directory.
+
+Serves /health, /v1/models and streamed /v1/completions and /v1/chat/completions from a
+child process, so the manager's own code can be measured without a GPU and without sharing
+its interpreter with the stub. Run it on its own with `python bench/stub_vllm.py --port 8000`.
+"""
+import argparse
+import json
+import multiprocessing
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+SERVED_MODEL = "stub-model"
+TOKEN_INTERVAL = 0.005  # seconds between streamed tokens
+DEFAULT_MAX_TOKENS = 16
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    # Like uvicorn under vLLM; with Nagle on, small token chunks wait for delayed ACKs
+    disable_nagle_algorithm = True
+
+    def do_GET(self):
+        if self.path == "/health":
+            self.reply(200, b"")
+        elif self.path == "/v1/models":
+            models = {"object": "list", "data": [{"id": SERVED_MODEL, "root": f"/models/{SERVED_MODEL}"}]}
+            self.reply(200, json.dumps(models).encode(), "application/json")
+        else:
+            self.reply(404, b"")
+
+    def do_POST(self):
+        body = self.rfile.read(int(self.headers.get("Content-Length") or 0))
+        if self.path not in ("/v1/completions", "/v1/chat/completions"):
+            self.reply(404, b"")
+            return
+        request = json.loads(body or b"{}")
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Transfer-Encoding", "chunked")
+        self.end_headers()
+        for index in range(int(request.get("max_tokens") or DEFAULT_MAX_TOKENS)):
+            time.sleep(TOKEN_INTERVAL)
+            # `sent` lets a client on the same host time each token's trip from here
+            chunk = {"model": SERVED_MODEL, "choices": [{"index": 0, "text": f" t{index}"}], "sent": time.time()}
+            self.write_chunk(f"data: {json.dumps(chunk)}\n\n".encode())
+        self.write_chunk(b"data: [DONE]\n\n")
+        self.write_chunk(b"")
+
+    def write_chunk(self, data: bytes):
+        self.wfile.write(b"%x\r\n%s\r\n" % (len(data), data))
+        self.wfile.flush()
+
+    def reply(self, status: int, body: bytes, content_type: str = "text/plain"):
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def serve(host: str, port: int, ready=None):
+    server = ThreadingHTTPServer((host, port), StubHandler)
+    server.daemon_threads = True
+    if ready is not None:
+        ready.put(server.server_port)
+    server.serve_forever()
+
+
+def start_stub(host: str = "127.0.0.1", port: int = 0) -> tuple[multiprocessing.Process, str]:
+    """Serve the stub from a daemon child process; returns the process and its base URL."""
+    ready = multiprocessing.Queue()
+    process = multiprocessing.Process(target=serve, args=(host, port, ready), daemon=True)
+    process.start()
+    return process, f"http://{host}:{ready.get(timeout=10)}"
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Serve a minimal vLLM stand-in")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    args = parser.parse_args()
+    print(f"Stub vLLM on http://{args.host}:{args.port}")
+    serve(args.host, args.port)
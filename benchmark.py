@@ -0,0 +1,311 @@
+import argparse
+import asyncio
+import json
+import logging
+import math
+import random
+import sys
+import time
+import uuid
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Optional
+
+import httpx
+
+logger = logging.getLogger(__name__)
+
+BASE_DIR = Path(__file__).parent
+RESULTS_PATH = BASE_DIR / "benchmark_results.jsonl"
+DEFAULTS = {
+    "concurrency": [1, 4, 16],
+    "requests_per_level": 32,
+    "prompt_tokens": {"mean": 512, "stddev": 128},
+    "output_tokens": {"mean": 128, "stddev": 32},
+    "timeout": 300,
+    "seed": 0,
+}
+PERCENTILES = (50, 95, 99)
+# Short common words are close to one token each in most tokenizers
+PROMPT_WORDS = (
+    "the of and to in is was for on are as with his they at be this from have or by one had "
+    "not but what all were when we there can an your which their said if do will each about "
+    "how up out them then she many some so these would other into has more her two like him"
+).split()
+
+
+def utc_now_iso() -> str:
+    return datetime.now(timezone.utc).isoformat()
+
+
+def benchmark_settings(overrides: Optional[dict] = None) -> dict:
+    settings = json.loads(json.dumps(DEFAULTS))
+    for key, value in (overrides or {}).items():
+        if value is None:
+            continue
+        if key not in DEFAULTS:
+            raise ValueError(f"unknown benchmark setting '{key}'")
+        if isinstance(DEFAULTS[key], dict):
+            if not isinstance(value, dict):
+                raise ValueError(f"benchmark setting '{key}' must be a mapping like {DEFAULTS[key]}")
+            settings[key].update(value)
+        else:
+            settings[key] = value
+    if isinstance(settings["concurrency"], int):
+        settings["concurrency"] = [settings["concurrency"]]
+    if not isinstance(settings["concurrency"], list) or not all(is_int(level) for level in settings["concurrency"]):
+        raise ValueError("concurrency must be an integer or a list of integers")
+    if not is_int(settings["requests_per_level"]) or not is_int(settings["seed"]):
+        raise ValueError("requests_per_level and seed must be integers")
+    if not settings["concurrency"] or min(settings["concurrency"]) < 1 or settings["requests_per_level"] < 1:
+        raise ValueError("concurrency levels and requests_per_level must be positive")
+    for key in ("prompt_tokens", "output_tokens"):
+        distribution = settings[key]
+        if not all(is_number(distribution.get(field)) for field in ("mean", "stddev")) or distribution["mean"] < 1:
+            raise ValueError(f"{key} needs a positive numeric mean and a numeric stddev")
+    if not is_number(settings["timeout"]) or settings["timeout"] <= 0:
+        raise ValueError("timeout must be a positive number of seconds")
+    return settings
+
+
+def is_int(value) -> bool:
+    return isinstance(value, int) and not isinstance(value, bool)
+
+
+def is_number(value) -> bool:
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+
+def sample_length(rng: random.Random, distribution: dict) -> int:
+    return max(1, int(rng.gauss(distribution["mean"], distribution.get("stddev", 0))))
+
+
+def make_prompt(rng: random.Random, tokens: int) -> str:
+    return " ".join(rng.choice(PROMPT_WORDS) for _ in range(tokens))
+
+
+def percentile(values: list[float], q: float) -> Optional[float]:
+    """Linearly interpolated percentile, or None for no samples."""
+    if not values:
+        return None
+    ordered = sorted(values)
+    rank = (len(ordered) - 1) * q / 100
+    low = math.floor(rank)
+    high = min(low + 1, len(ordered) - 1)
+    return ordered[low] + (ordered[high] - ordered[low]) * (rank - low)
+
+
+def summarize(values: list[float]) -> dict:
+    summary = {f"p{q}": percentile(values, q) for q in PERCENTILES}
+    summary["mean"] = sum(values) / len(values) if values else None
+    return {key: None if value is None else round(value * 1000, 2) for key, value in summary.items()}
+
+
+async def served_model_name(client: httpx.AsyncClient, base_url: str) -> str:
+    response = await client.get(f"{base_url}/v1/models")
+    response.raise_for_status()
+    return response.json()["data"][0]["id"]
+
+
+async def timed_completion(
+    client: httpx.AsyncClient,
+    base_url: str,
+    model: str,
+    prompt: str,
+    max_tokens: int,
+) -> dict:
+    """One streamed completion, timed from send to first token and between tokens."""
+    payload = {
+        "model": model,
+        "prompt": prompt,
+        "max_tokens": max_tokens,
+        "stream": True,
+        "ignore_eos": True,
+        "stream_options": {"include_usage": True},
+    }
+    started = time.perf_counter()
+    token_times = []
+    usage_tokens = None
+    async with client.stream("POST", f"{base_url}/v1/completions", json=payload) as response:
+        if response.status_code != 200:
+            await response.aread()
+            raise RuntimeError(f"HTTP {response.status_code}: {response.text[:200]}")
+        async for line in response.aiter_lines():
+            if not line.startswith("data:"):
+                continue
+            data = line[5:].strip()
+            if data == "[DONE]":
+                break
+            chunk = json.loads(data)
+            if chunk.get("usage"):
+                usage_tokens = chunk["usage"].get("completion_tokens")
+            if any(choice.get("text") for choice in chunk.get("choices", [])):
+                token_times.append(time.perf_counter())
+    finished = time.perf_counter()
+    if not token_times:
+        raise RuntimeError("stream ended without any tokens")
+    return {
+        "ttft": token_times[0] - started,
+        "itl": [b - a for a, b in zip(token_times, token_times[1:])],
+        "latency": finished - started,
+        "output_tokens": usage_tokens or len(token_times),
+    }
+
+
+async def run_level(
+    client: httpx.AsyncClient,
+    base_url: str,
+    model: str,
+    concurrency: int,
+    workload: list[tuple[str, int]],
+) -> dict:
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def one(prompt: str, max_tokens: int):
+        async with semaphore:
+            return await timed_completion(client, base_url, model, prompt, max_tokens)
+
+    started = time.perf_counter()
+    outcomes = await asyncio.gather(*(one(prompt, tokens) for prompt, tokens in workload), return_exceptions=True)
+    duration = time.perf_counter() - started
+
+    results = [outcome for outcome in outcomes if isinstance(outcome, dict)]
+    errors = [str(outcome) for outcome in outcomes if not isinstance(outcome, dict)]
+    output_tokens = sum(result["output_tokens"] for result in results)
+    return {
+        "concurrency": concurrency,
+        "requests": len(workload),
+        "errors": len(errors),
+        "first_error": errors[0] if errors else None,
+        "duration_s": round(duration, 3),
+        "requests_per_s": round(len(results) / duration, 3),
+        "output_tokens_per_s": round(output_tokens / duration, 1),
+        "ttft_ms": summarize([result["ttft"] for result in results]),
+        "itl_ms": summarize([gap for result in results for gap in result["itl"]]),
+        "latency_ms": summarize([result["latency"] for result in results]),
+    }
+
+
+async def run_benchmark(
+    base_url: str,
+    settings: dict,
+    progress=None,
+    transport: Optional[httpx.AsyncBaseTransport] = None,
+) -> dict:
+    """Run the concurrency sweep against an OpenAI-compatible server and return one result record.
+
+    `progress`, if given, is called with each finished level; `transport` replaces the
+    network, as tests do with an in-process server.
+    """
+    rng = random.Random(settings["seed"])
+    workload = [
+        (
+            make_prompt(rng, sample_length(rng, settings["prompt_tokens"])),
+            sample_length(rng, settings["output_tokens"]),
+        )
+        for _ in range(settings["requests_per_level"])
+    ]
+    limits = httpx.Limits(max_connections=max(settings["concurrency"]), max_keepalive_connections=max(settings["concurrency"]))
+    timeout = httpx.Timeout(settings["timeout"], connect=10)
+    async with httpx.AsyncClient(limits=limits, timeout=timeout, transport=transport) as client:
+        served_model = await served_model_name(client, base_url)
+        levels = []
+        for concurrency in settings["concurrency"]:
+            level = await run_level(client, base_url, served_model, concurrency, workload)
+            levels.append(level)
+            logger.info(
+                f"Benchmark c={concurrency}: {level['output_tokens_per_s']} tok/s, "
+                f"TTFT p50={level['ttft_ms']['p50']}ms, ITL p50={level['itl_ms']['p50']}ms, errors={level['errors']}"
+            )
+            if progress:
+                progress(level)
+    return {
+        "id": uuid.uuid4().hex[:12],
+        "created_at": utc_now_iso(),
+        "base_url": base_url,
+        "served_model": served_model,
+        "settings": settings,
+        "levels": levels,
+    }
+
+
+class ResultsStore:
+    """Append-only JSONL file of benchmark results."""
+
+    def __init__(self, path: Path = RESULTS_PATH):
+        self.path = path
+
+    def append(self, result: dict):
+        with open(self.path, "a") as f:
+            f.write(json.dumps(result, sort_keys=True) + "\n")
+
+    def query(self, model: Optional[str] = None, variant: Optional[str] = None, limit: int = 20) -> list[dict]:
+        """Newest first, optionally only for one model (and variant)."""
+        if not self.path.exists():
+            return []
+        results = []
+        for line in self.path.read_text().splitlines():
+            try:
+                result = json.loads(line)
+            except ValueError:
+                continue
+            if model is not None and result.get("model") != model:
+                continue
+            if variant is not None and result.get("variant") != variant:
+                continue
+            results.append(result)
+        return results[::-1][:limit]
+
+
+def print_table(result: dict):
+    print(f"{result['served_model']} @ {result['base_url']}")
+    print(f"{'conc':>5} {'req/s':>8} {'tok/s':>9} {'ttft p50':>9} {'ttft p99':>9} {'itl p50':>8} {'itl p99':>8} {'errors':>6}")
+    for level in result["levels"]:
+        print(
+            f"{level['concurrency']:>5} {level['requests_per_s']:>8} {level['output_tokens_per_s']:>9} "
+            f"{level['ttft_ms']['p50']!s:>9} {level['ttft_ms']['p99']!s:>9} "
+            f"{level['itl_ms']['p50']!s:>8} {level['itl_ms']['p99']!s:>8} {level['errors']:>6}"
+        )
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Load-test an OpenAI-compatible vLLM endpoint")
+    parser.add_argument("--url", default="http://localhost:8000", help="server base URL (vLLM or the manager proxy)")
+    parser.add_argument("--concurrency", type=int, nargs="+", help="concurrency levels to sweep")
+    parser.add_argument("--requests", type=int, help="requests per concurrency level")
+    parser.add_argument("--prompt-tokens", type=int, help="mean prompt length in tokens")
+    parser.add_argument("--output-tokens", type=int, help="mean output length in tokens")
+    parser.add_argument("--seed", type=int)
+    parser.add_argument("--model", help="record the result under this config model id")
+    parser.add_argument("--save", action="store_true", help=f"append the result to {RESULTS_PATH.name}")
+    parser.add_argument("--json", action="store_true", help="print the full result as JSON")
+    args = parser.parse_args(argv)
+
+    overrides = {
+        "concurrency": args.concurrency,
+        "requests_per_level": args.requests,
+        "seed": args.seed,
+        "prompt_tokens": {"mean": args.prompt_tokens, "stddev": args.prompt_tokens / 4} if args.prompt_tokens else None,
+        "output_tokens": {"mean": args.output_tokens, "stddev": args.output_tokens / 4} if args.output_tokens else None,
+    }
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
+    logging.getLogger("httpx").setLevel(logging.WARNING)
+    try:
+        result = asyncio.run(run_benchmark(args.url.rstrip("/"), benchmark_settings(overrides)))
+    except (httpx.HTTPError, ValueError) as e:
+        print(f"Benchmark failed: {e}", file=sys.stderr)
+        return 1
+    result["model"] = args.model or result["served_model"]
+    result["variant"] = None
+    result["launch_args"] = None
+    if args.save:
+        ResultsStore().append(result)
+    if args.json:
+        print(json.dumps(result, indent=2))
+    else:
+        print_table(result)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,17 +1,47 @@
 import asyncio
+import copy
+import hashlib
 import json
 import logging
+import math
+import os
+import re
+import shlex
+import shutil
+import sqlite3
 import subprocess
 import sys
-from datetime import datetime, timezone
+import threading
+import time
+import uuid
+from abc import ABC, abstractmethod
+from array import array
+from datetime import datetime, timedelta, timezone, tzinfo
 from pathlib import Path
-from typing import Optional
+from typing import AsyncIterator, Optional
+from zoneinfo import ZoneInfo
 
+import httpx
 import yaml
-from fastapi import FastAPI, HTTPException
+from fastapi import FastAPI, HTTPException, Request
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import PlainTextResponse, StreamingResponse
 from pydantic import BaseModel
 
+import benchmark
+
+try:
+    from dbus_next import BusType
+    from dbus_next.aio import MessageBus
+    from dbus_next.errors import DBusError
+except ImportError:  # Optional: without dbus-next the manager forks systemctl instead
+    MessageBus = None
+
+try:
+    import pynvml
+except ImportError:  # Optional: without NVML bindings GPUs are read from nvidia-smi
+    pynvml = None
+
 logging.basicConfig(
     level=logging.INFO,
     format="%(asctime)s - %(levelname)s - %(message)s",
@@ -22,29 +52,584 @@ logger = logging.getLogger(__name__)
 BASE_DIR = Path(__file__).parent
 CONFIG_PATH = BASE_DIR / "config.yaml"
 STATE_PATH = BASE_DIR / "state.json"
+LAUNCH_DIR = BASE_DIR / "launch"
 VLLM_ENV_PATH = Path("/etc/vllm-manager/vllm.env")
 VLLM_SERVICE = "vllm.service"
-VLLM_HEALTH_URL = "http://localhost:8000/health"
+SERVICE_BACKEND = "auto"  # "auto", "dbus" or "subprocess"
+SYSTEMD_BUS_NAME = "org.freedesktop.systemd1"
+SYSTEMD_OBJECT_PATH = "/org/freedesktop/systemd1"
+SYSTEMD_JOB_TIMEOUT = 120
+VLLM_BASE_URL = "http://localhost:8000"
+VLLM_INSTANCE_UNIT = "vllm@{model}.service"
+VLLM_INSTANCE_ENV = "vllm-{model}.env"
+ROUTER_HOST = "0.0.0.0"
+ROUTER_BUFFER_SIZE = 64 * 1024
 HEALTH_POLL_INTERVAL = 5
 HEALTH_POLL_TIMEOUT = 900  # 15 minutes
 HEALTH_REQUEST_TIMEOUT = 3
+READINESS_DEFAULTS = {
+    "initial_interval": 1,
+    "max_interval": 15,
+    "backoff_factor": 1.5,
+    "timeout": HEALTH_POLL_TIMEOUT,
+    "stall_timeout": None,  # seconds; abort when the journal goes silent this long during a load
+}
+LOAD_HISTORY_SIZE = 10
+HTTP_MAX_CONNECTIONS = 20
+HTTP_MAX_KEEPALIVE = 10
+PROXY_MAX_CONNECTIONS = 256
+PROXY_CONNECT_TIMEOUT = 5
+PROXY_DEFAULTS = {
+    "enabled": False,
+    "queue_size": 64,  # requests held while a model is starting; more get 503
+    "queue_timeout": 900,
+}
+FLEET_DEFAULTS = {
+    "hosts": [],  # [{name, url, kind: manager | vllm}]
+    "timeout": 3,  # per host; a slow host is reported as unreachable, not waited for
+}
+FLEET_HOST_KINDS = ("manager", "vllm")
+PREFLIGHT_DEFAULTS = {
+    "mode": "warn",  # reject | warn | off
+    "overhead_mb": 1536,  # CUDA context, activations and graphs per GPU
+}
+DTYPE_BYTES = {
+    "float32": 4,
+    "float": 4,
+    "float16": 2,
+    "half": 2,
+    "bfloat16": 2,
+    "fp8": 1,
+    "fp8_e4m3": 1,
+    "fp8_e5m2": 1,
+    "float8_e4m3fn": 1,
+    "int8": 1,
+}
+PREWARM_CHUNK_SIZE = 16 * 1024 * 1024
+PREWARM_PROGRESS_INTERVAL = 1
+PREWARM_DEFAULTS = {
+    "auto": False,  # pre-warm the likely next models whenever a model becomes ready
+    "models": [],  # models to pre-warm automatically; defaults to the previously active one
+    "workers": 4,  # shards read in parallel
+    "min_free_ram_mb": 8192,  # RAM left over after the weights are cached
+}
+RECOVERY_CHECK_INTERVAL = 5
+RECOVERY_JOURNAL_LINES = 200
+RECOVERY_DEFAULTS = {
+    "enabled": False,
+    "max_restarts": 3,  # restarts of one model within `window` before falling back
+    "window": 1800,
+    "initial_backoff": 10,
+    "backoff_factor": 2,
+    "max_backoff": 300,
+    "fallback_model": None,  # used when the failed model sets no `fallback` of its own
+}
+# Failures a restart with the same launch settings cannot fix; go straight to the fallback
+RECOVERY_NO_RETRY_CAUSES = {"missing_weights", "cuda_oom", "insufficient_kv_cache", "oom-kill"}
+# Level 1 sleep offloads weights to CPU RAM and drops the KV cache; level 2 discards the
+# weights too, which only makes sense when new weights are loaded afterwards
+SLEEP_LEVEL = 1
+SLEEP_DEFAULTS = {
+    "idle": False,  # the idle policy puts the model to sleep instead of stopping it
+    "switch": False,  # default for /switch `sleep_previous` in multi-instance mode
+    "timeout": 120,  # for one /sleep or /wake_up call to vLLM
+}
+IDLE_CHECK_INTERVAL = 30
+IDLE_DEFAULTS = {
+    "enabled": False,
+    "timeout": 1800,  # seconds without requests before the active model is stopped
+    "auto_load": True,  # start it again on the next proxied request
+}
+VLLM_BUSY_METRICS = ("vllm:num_requests_running", "vllm:num_requests_waiting")
+VLLM_COMPLETED_METRIC = "vllm:request_success_total"
+PROXY_HOP_HEADERS = {
+    "connection",
+    "keep-alive",
+    "proxy-authenticate",
+    "proxy-authorization",
+    "te",
+    "trailer",
+    "transfer-encoding",
+    "upgrade",
+    "host",
+    "content-length",
+}
+RECONCILE_INTERVAL = 5
+STARTUP_RETRY_INTERVAL = 1  # first retry of a failed startup reconciliation, doubling up to RECONCILE_INTERVAL
+STATUS_MAX_AGE = 10
+EVENT_QUEUE_SIZE = 100
+EVENT_HEARTBEAT_INTERVAL = 15
 SERVICE_LOG_DEFAULT_LINES = 120
 SERVICE_LOG_MAX_LINES = 500
+JOURNAL_LINE_LIMIT = 1024 * 1024
 SHUTDOWN_DELAY = 10
+OPERATION_HISTORY_SIZE = 100
+HISTORY_PATH = BASE_DIR / "history.db"
+WARMUP_PROMPTS_PATH = BASE_DIR / "warmup_prompts.json"
+SCHEDULE_PATH = BASE_DIR / "schedule.json"
+SCHEDULE_CHECK_INTERVAL = 30
+SCHEDULE_DEFAULTS = {
+    "enabled": True,
+    "timezone": None,  # IANA name for the cron expressions; the host's local time by default
+    "prewarm_ahead": 900,  # seconds before a slot to read its model's weights into the page cache
+    "on_busy": "defer",  # defer | skip a switch while the current model has requests in flight
+    "defer_max": 1800,  # switch anyway once a deferred slot has waited this long
+    "rules": [],  # [{name, cron, model, variant}]
+}
+# minute, hour, day of month, month, day of week (0 and 7 are Sunday)
+CRON_FIELD_RANGES = ((0, 59), (0, 23), (1, 31), (1, 12), (0, 7))
+CRON_SEARCH_DAYS = 366
+WARMUP_DEFAULTS = {
+    "prompts": [],  # strings (completions) or {messages: [...]} (chat), replayed after every start
+    "recorded": 0,  # also replay this many recent system prompts seen by the proxy
+    "max_tokens": 1,
+    "concurrency": 4,
+    "timeout": 120,  # for the whole warm-up; the model is declared running either way
+}
+WARMUP_PHASE_FRACTION = 0.995
+WARMUP_USER_MESSAGE = {"role": "user", "content": "Hi"}
+HISTORY_FLUSH_INTERVAL = 2
+HISTORY_BATCH_SIZE = 500
+HISTORY_PENDING_LIMIT = 10 * HISTORY_BATCH_SIZE  # events kept in memory before the database is open
+HISTORY_RETENTION_DAYS = 90
+HISTORY_QUERY_LIMIT = 1000
+GPU_SAMPLE_INTERVAL = 2
+GPU_HISTORY_RETENTION = 3600  # seconds
+GPU_SAMPLER_RESTART_DELAY = 30
+METRICS_PROXY_VLLM = True
+METRICS_PROXY_TTL = 5
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+OPERATION_BUCKETS = (1, 5, 15, 30, 60, 120, 300, 600, 900, 1800)
+KNOWN_STATES = ("running", "stopped", "starting", "stopping", "sleeping", "error")
+# Journal lines vLLM prints while loading, in order, with the share of the load they mark
+LOAD_PHASE_PATTERNS = (
+    (re.compile(r"vLLM API server version|Initializing a V\d+ LLM engine|Initializing an LLM engine"), "initializing", 0.05),
+    (re.compile(r"Starting to load model|Loading safetensors checkpoint shards"), "loading_weights", 0.1),
+    (re.compile(r"Loading weights took|Model loading took"), "weights_loaded", 0.6),
+    (re.compile(r"GPU KV cache size|# GPU blocks|# cuda blocks|Maximum concurrency for"), "kv_cache_allocated", 0.7),
+    (re.compile(r"Capturing CUDA graph|Capturing cudagraphs"), "capturing_cuda_graphs", 0.75),
+    (re.compile(r"Graph capturing finished"), "cuda_graphs_captured", 0.95),
+    (re.compile(r"Application startup complete|Uvicorn running on"), "serving", 0.99),
+)
+# Journal lines that mean a load can never succeed, so waiting for health is pointless
+FATAL_LOG_PATTERNS = (
+    (re.compile(r"CUDA out of memory|torch\.OutOfMemoryError|CUDA error: out of memory"), "cuda_oom",
+     "CUDA ran out of memory while loading the model"),
+    (re.compile(r"No available memory for the cache blocks|larger than the maximum number of tokens that can be stored in KV cache"),
+     "insufficient_kv_cache", "Not enough GPU memory left for the KV cache"),
+    (re.compile(r"[Aa]ddress already in use"), "port_in_use", "The vLLM port is already in use"),
+    (re.compile(r"is not a local folder and is not a valid model identifier|does not appear to have a file named|No such file or directory: .*(safetensors|config\.json)"),
+     "missing_weights", "Model weights or config files were not found"),
+    (re.compile(r"NCCL error|ncclSystemError|ncclInternalError|ncclUnhandledCudaError"), "nccl_error",
+     "NCCL failed between tensor-parallel workers"),
+    (re.compile(r"Engine core initialization failed"), "engine_init_failed", "vLLM engine failed to initialize"),
+)
+GPU_METRICS = (
+    "utilization_percent",
+    "memory_used_mb",
+    "memory_total_mb",
+    "temperature_c",
+    "power_w",
+    "sm_clock_mhz",
+    "fan_speed_percent",
+)
 
 
 class SwitchRequest(BaseModel):
     model: str
+    variant: Optional[str] = None
+    sleep_previous: Optional[bool] = None
+
+
+class FleetSwitchRequest(SwitchRequest):
+    host: Optional[str] = None
+
+
+class BenchmarkRequest(BaseModel):
+    concurrency: Optional[list[int]] = None
+    requests_per_level: Optional[int] = None
+    prompt_tokens: Optional[dict] = None
+    output_tokens: Optional[dict] = None
+    seed: Optional[int] = None
 
 
 def utc_now_iso() -> str:
     return datetime.now(timezone.utc).isoformat()
 
 
+def format_sse(event: str, data: dict, event_id: Optional[str] = None) -> str:
+    prefix = f"id: {event_id}\n" if event_id else ""
+    return f"{prefix}event: {event}\ndata: {json.dumps(data)}\n\n"
+
+
+class EventBroker:
+    """Fans out manager events from one producer to any number of stream subscribers.
+
+    Each subscriber gets a bounded queue; when a client falls behind its oldest events
+    are dropped so a slow reader never blocks the producer or other subscribers.
+    """
+
+    def __init__(self):
+        self._subscribers: set[asyncio.Queue] = set()
+
+    @property
+    def subscriber_count(self) -> int:
+        return len(self._subscribers)
+
+    def subscribe(self) -> asyncio.Queue:
+        queue: asyncio.Queue = asyncio.Queue(maxsize=EVENT_QUEUE_SIZE)
+        self._subscribers.add(queue)
+        return queue
+
+    def unsubscribe(self, queue: asyncio.Queue):
+        self._subscribers.discard(queue)
+
+    def publish(self, event: str, data: dict):
+        if not self._subscribers:
+            return
+        message = format_sse(event, data)
+        for queue in self._subscribers:
+            if queue.full():
+                try:
+                    queue.get_nowait()
+                except asyncio.QueueEmpty:
+                    pass
+            queue.put_nowait(message)
+
+
+class EventHistory:
+    """Append-only SQLite log of state transitions, operations and service events.
+
+    `record()` only appends to an in-memory batch, so callers on the event loop never
+    touch the disk; `flush_loop()` writes the batch from a worker thread every
+    HISTORY_FLUSH_INTERVAL seconds, or sooner once HISTORY_BATCH_SIZE events are waiting.
+    """
+
+    def __init__(self, path: Path):
+        self.path = path
+        self._pending: list[tuple] = []
+        self._wakeup = asyncio.Event()
+        self._conn: Optional[sqlite3.Connection] = None
+        self._lock = threading.Lock()
+        self.disabled = False
+
+    def record(self, kind: str, model: Optional[str] = None, state: Optional[str] = None, **data):
+        if self.disabled:
+            return
+        self._pending.append((time.time(), kind, model, state, json.dumps(data) if data else None))
+        if self._conn is None and len(self._pending) > HISTORY_PENDING_LIMIT:
+            # Nothing drains the batch until open(); keep only the newest events
+            del self._pending[0]
+        if len(self._pending) >= HISTORY_BATCH_SIZE:
+            self._wakeup.set()
+
+    def disable(self):
+        """Stop collecting events for good, after the database could not be opened."""
+        self.disabled = True
+        self._pending.clear()
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+    def open(self):
+        with self._lock:
+            self._conn = sqlite3.connect(self.path, check_same_thread=False)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.executescript(
+                """
+                CREATE TABLE IF NOT EXISTS events (
+                    id INTEGER PRIMARY KEY,
+                    ts REAL NOT NULL,
+                    kind TEXT NOT NULL,
+                    model TEXT,
+                    state TEXT,
+                    data TEXT
+                );
+                CREATE INDEX IF NOT EXISTS events_ts ON events (ts);
+                CREATE INDEX IF NOT EXISTS events_model_ts ON events (model, ts);
+                CREATE INDEX IF NOT EXISTS events_kind_ts ON events (kind, ts);
+                """
+            )
+            cutoff = time.time() - HISTORY_RETENTION_DAYS * 86400
+            self._conn.execute("DELETE FROM events WHERE ts < ?", (cutoff,))
+            self._conn.commit()
+
+    def flush(self):
+        """Write the pending batch in one transaction; runs in a worker thread."""
+        batch, self._pending = self._pending, []
+        if not batch or self._conn is None:
+            self._pending = batch + self._pending
+            return
+        with self._lock:
+            self._conn.executemany("INSERT INTO events (ts, kind, model, state, data) VALUES (?, ?, ?, ?, ?)", batch)
+            self._conn.commit()
+
+    async def flush_loop(self):
+        while True:
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), HISTORY_FLUSH_INTERVAL)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+            try:
+                await asyncio.to_thread(self.flush)
+            except sqlite3.Error as e:
+                logger.warning(f"Failed to write event history: {e}")
+
+    def close(self):
+        if self._conn is None:
+            return
+        self.flush()
+        with self._lock:
+            self._conn.close()
+            self._conn = None
+
+    def query(
+        self,
+        since: float,
+        until: float,
+        model: Optional[str] = None,
+        kind: Optional[str] = None,
+        limit: int = HISTORY_QUERY_LIMIT,
+    ) -> list[dict]:
+        """Events in [since, until], newest first."""
+        sql = "SELECT ts, kind, model, state, data FROM events WHERE ts >= ? AND ts <= ?"
+        params: list = [since, until]
+        if model is not None:
+            sql += " AND model = ?"
+            params.append(model)
+        if kind is not None:
+            sql += " AND kind = ?"
+            params.append(kind)
+        sql += " ORDER BY ts DESC LIMIT ?"
+        params.append(limit)
+        with self._lock:
+            rows = self._conn.execute(sql, params).fetchall() if self._conn else []
+        return [
+            {
+                "ts": ts,
+                "time": datetime.fromtimestamp(ts, timezone.utc).isoformat(),
+                "kind": kind,
+                "model": model,
+                "state": state,
+                **(json.loads(data) if data else {}),
+            }
+            for ts, kind, model, state, data in rows
+        ]
+
+    def availability(self, since: float, until: float) -> dict:
+        """Per-model uptime over [since, until], replayed from recorded state transitions.
+
+        A model counts as in service while it is the selected model and starting, running
+        or in error; availability is the running share of that time. Gaps where the
+        manager itself was down are left out.
+        """
+        with self._lock:
+            if self._conn is None:
+                return {}
+            before = self._conn.execute(
+                "SELECT ts, kind, model, state, data FROM events WHERE ts < ? AND kind IN ('state', 'manager') "
+                "ORDER BY ts DESC LIMIT 1",
+                (since,),
+            ).fetchone()
+            rows = self._conn.execute(
+                "SELECT ts, kind, model, state, data FROM events WHERE ts >= ? AND ts <= ? "
+                "AND kind IN ('state', 'manager', 'load') ORDER BY ts",
+                (since, until),
+            ).fetchall()
+
+        models: dict[str, dict] = {}
+
+        def stats(model_id: str) -> dict:
+            return models.setdefault(model_id, {
+                "running_s": 0.0,
+                "in_service_s": 0.0,
+                "starts": 0,
+                "failures": 0,
+                "load_durations_s": [],
+            })
+
+        current = (before[2], before[3]) if before and before[1] == "state" else (None, None)
+        last_ts = since
+        for ts, kind, model_id, state, data in rows:
+            current_model, current_state = current
+            if current_model and current_state in ("starting", "running", "error"):
+                entry = stats(current_model)
+                entry["in_service_s"] += ts - last_ts
+                if current_state == "running":
+                    entry["running_s"] += ts - last_ts
+            last_ts = ts
+            if kind == "manager":
+                current = (None, None)
+            elif kind == "load" and model_id:
+                stats(model_id)["load_durations_s"].append(json.loads(data)["duration_s"])
+            elif kind == "state":
+                if model_id and state == "starting" and current_state != "starting":
+                    stats(model_id)["starts"] += 1
+                if model_id and state == "error" and current_state != "error":
+                    stats(model_id)["failures"] += 1
+                current = (model_id, state)
+        current_model, current_state = current
+        if current_model and current_state in ("starting", "running", "error"):
+            entry = stats(current_model)
+            entry["in_service_s"] += until - last_ts
+            if current_state == "running":
+                entry["running_s"] += until - last_ts
+
+        for entry in models.values():
+            durations = entry.pop("load_durations_s")
+            entry["loads"] = len(durations)
+            entry["mean_load_s"] = round(sum(durations) / len(durations), 1) if durations else None
+            entry["max_load_s"] = round(max(durations), 1) if durations else None
+            entry["availability"] = (
+                round(entry["running_s"] / entry["in_service_s"], 4) if entry["in_service_s"] else None
+            )
+            entry["running_s"] = round(entry["running_s"], 1)
+            entry["in_service_s"] = round(entry["in_service_s"], 1)
+        return models
+
+
+def _escape_label_value(value) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_labels(labels: tuple) -> str:
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{key}="{_escape_label_value(value)}"' for key, value in labels) + "}"
+
+
+class Counter:
+    """Prometheus counter keyed by label values."""
+
+    kind = "counter"
+
+    def __init__(self, name: str, documentation: str):
+        self.name = name
+        self.documentation = documentation
+        self._values: dict[tuple, float] = {}
+
+    def inc(self, amount: float = 1.0, **labels):
+        key = tuple(sorted(labels.items()))
+        self._values[key] = self._values.get(key, 0.0) + amount
+
+    def render(self) -> list[str]:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.kind}"]
+        for labels, value in self._values.items():
+            lines.append(f"{self.name}{_format_labels(labels)} {value:g}")
+        return lines
+
+
+class Gauge(Counter):
+    """Prometheus gauge keyed by label values."""
+
+    kind = "gauge"
+
+    def set(self, value: float, **labels):
+        self._values[tuple(sorted(labels.items()))] = value
+
+    def clear(self):
+        self._values.clear()
+
+
+class Histogram:
+    """Prometheus histogram with fixed buckets, keyed by label values."""
+
+    def __init__(self, name: str, documentation: str, buckets: tuple):
+        self.name = name
+        self.documentation = documentation
+        self.buckets = buckets
+        self._values: dict[tuple, list] = {}
+
+    def observe(self, value: float, **labels):
+        key = tuple(sorted(labels.items()))
+        series = self._values.setdefault(key, [[0] * len(self.buckets), 0.0, 0])
+        for i, bound in enumerate(self.buckets):
+            if value <= bound:
+                series[0][i] += 1
+        series[1] += value
+        series[2] += 1
+
+    def render(self) -> list[str]:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} histogram"]
+        for labels, (bucket_counts, total, count) in self._values.items():
+            for bound, bucket_count in zip(self.buckets, bucket_counts):
+                lines.append(f"{self.name}_bucket{_format_labels(labels + (('le', f'{bound:g}'),))} {bucket_count}")
+            lines.append(f"{self.name}_bucket{_format_labels(labels + (('le', '+Inf'),))} {count}")
+            lines.append(f"{self.name}_sum{_format_labels(labels)} {total:g}")
+            lines.append(f"{self.name}_count{_format_labels(labels)} {count}")
+        return lines
+
+
+STATE_TRANSITIONS = Counter("vllm_manager_state_transitions_total", "Manager state transitions by target state")
+RECONCILES = Counter("vllm_manager_reconciles_total", "Runtime reconciliations by inferred state")
+OPERATION_DURATION = Histogram(
+    "vllm_manager_operation_duration_seconds",
+    "Duration of start/stop/restart/switch operations",
+    OPERATION_BUCKETS,
+)
+MODEL_LOAD_DURATION = Histogram(
+    "vllm_manager_model_load_duration_seconds",
+    "Time from systemd start until vLLM reports healthy, by model",
+    OPERATION_BUCKETS,
+)
+MODEL_WARMUP_DURATION = Histogram(
+    "vllm_manager_model_warmup_duration_seconds",
+    "Time spent replaying warm-up prompts after a model became healthy, by model",
+    OPERATION_BUCKETS,
+)
+HEALTH_PROBE_DURATION = Histogram(
+    "vllm_manager_health_probe_duration_seconds",
+    "Latency of vLLM /health probes",
+    LATENCY_BUCKETS,
+)
+SUBPROCESS_DURATION = Histogram(
+    "vllm_manager_subprocess_duration_seconds",
+    "Latency of subprocess calls made by the manager",
+    LATENCY_BUCKETS,
+)
+PREWARM_BYTES = Counter("vllm_manager_prewarm_bytes_total", "Weight bytes read into the page cache, by model")
+MANAGER_STATE = Gauge("vllm_manager_state", "1 for the manager's current state, 0 otherwise")
+MODEL_INFO = Gauge("vllm_manager_model_info", "Currently selected model")
+PROXY_REQUESTS = Counter("vllm_manager_proxy_requests_total", "Proxied inference requests by outcome")
+PROXY_QUEUE_WAIT = Histogram(
+    "vllm_manager_proxy_queue_wait_seconds",
+    "Time proxied requests spent waiting for a model to become ready",
+    OPERATION_BUCKETS,
+)
+PROXY_IN_FLIGHT = Gauge("vllm_manager_proxy_in_flight", "Proxied requests currently streaming")
+PROXY_QUEUED = Gauge("vllm_manager_proxy_queued", "Proxied requests waiting for a model")
+EVENT_SUBSCRIBERS = Gauge("vllm_manager_event_subscribers", "Open /events streams")
+GPU_GAUGES = {
+    metric: Gauge(f"vllm_manager_gpu_{metric}", f"Latest GPU {metric.replace('_', ' ')}")
+    for metric in GPU_METRICS
+}
+
+
+def run_subprocess(cmd: list[str], **kwargs) -> subprocess.CompletedProcess:
+    args = cmd[1:] if cmd[0] == "sudo" else cmd
+    command = f"{args[0]} {args[1]}" if args[0] == "systemctl" else args[0]
+    started = time.perf_counter()
+    try:
+        return subprocess.run(cmd, **kwargs)
+    finally:
+        SUBPROCESS_DURATION.observe(time.perf_counter() - started, command=command)
+
+
+def record_operation(operation: str, started: float, succeeded: bool):
+    OPERATION_DURATION.observe(
+        time.monotonic() - started,
+        operation=operation,
+        result="success" if succeeded else "error",
+    )
+
+
 class AppState:
     def __init__(self):
         self.state: str = "stopped"
         self.current_model: Optional[str] = None
+        self.current_variant: Optional[str] = None
         self.error_message: Optional[str] = None
         self.last_state_change_at: str = utc_now_iso()
         self.last_reconciled_at: Optional[str] = None
@@ -56,16 +641,92 @@ class AppState:
         self.last_systemd_exec_main_status: Optional[str] = None
         self.last_inferred_state: Optional[str] = None
         self.last_inference_reason: Optional[str] = None
+        self.last_diagnostics: Optional[dict] = None
+        self.last_gpu_stats: Optional[dict] = None
+        self.last_snapshot_monotonic: Optional[float] = None
+        self.load_started_monotonic: Optional[float] = None
+        self.load_phase: Optional[str] = None
+        self.load_phase_fraction: float = 0.0
+        self.expected_load_s: Optional[float] = None
+        self.load_progress_event = asyncio.Event()
+        self.load_failure: Optional[dict] = None
+        self.last_load_log_monotonic: Optional[float] = None
+        self.error_detail: Optional[dict] = None
+        self.ready_event = asyncio.Event()
+        self.last_activity_monotonic: Optional[float] = None
+        self.idle_unloaded_model: Optional[str] = None
+        self.last_warmup: Optional[dict] = None
+        # State restored from state.json at startup, until reconciliation confirms or replaces it
+        self.restored_state: Optional[str] = None
+        # Cleared while startup works out the real state; proxied requests wait for it
+        self.startup_settled = asyncio.Event()
+        self.startup_settled.set()
         self._state_lock = asyncio.Lock()
+        self._pending_last_known: Optional[dict] = None
+        self._persist_task: Optional[asyncio.Task] = None
 
-    async def set_state(self, state: str, model: Optional[str] = None, error: Optional[str] = None):
+    def restore(self, last_known: dict):
+        """Seed the state from state.json so /status can answer before the first reconciliation."""
+        self.state = last_known.get("state") or "stopped"
+        self.error_message = last_known.get("error")
+        self.last_state_change_at = last_known.get("at") or self.last_state_change_at
+        self.restored_state = self.state
+
+    async def set_state(
+        self,
+        state: str,
+        model: Optional[str] = None,
+        error: Optional[str] = None,
+        detail: Optional[dict] = None,
+    ):
         async with self._state_lock:
             self.state = state
             if model is not None:
                 self.current_model = model
             self.error_message = error
+            self.error_detail = detail
+            if state == "running":
+                if not self.ready_event.is_set():
+                    self.last_activity_monotonic = time.monotonic()
+                    self.idle_unloaded_model = None
+                self.ready_event.set()
+            else:
+                self.ready_event.clear()
             self.last_state_change_at = utc_now_iso()
+            self.restored_state = None
             logger.info(f"State transition: {state}, model={self.current_model}, error={error}")
+            self._pending_last_known = {"state": state, "error": error, "at": self.last_state_change_at}
+            if self._persist_task is None or self._persist_task.done():
+                self._persist_task = asyncio.create_task(self._persist_last_known())
+            STATE_TRANSITIONS.inc(state=state)
+            event_history.record(
+                "state",
+                self.current_model,
+                state,
+                error=error,
+                code=(detail or {}).get("code"),
+            )
+            event_broker.publish("state", {
+                "state": self.state,
+                "model": self.current_model,
+                "error": self.error_message,
+                "error_detail": self.error_detail,
+                "last_state_change_at": self.last_state_change_at,
+            })
+
+    async def _persist_last_known(self):
+        """Write `last_known` to state.json from a worker thread; transitions made meanwhile coalesce."""
+        while self._pending_last_known is not None:
+            last_known, self._pending_last_known = self._pending_last_known, None
+            try:
+                await asyncio.to_thread(update_state, last_known=last_known)
+            except OSError as e:
+                logger.warning(f"Could not persist state {last_known['state']}: {e}")
+
+    async def wait_persisted(self):
+        """Return once the latest state transition is on disk."""
+        if self._persist_task is not None:
+            await self._persist_task
 
     async def update_runtime_checks(
         self,
@@ -86,8 +747,75 @@ class AppState:
             self.last_inferred_state = inferred_state
             self.last_inference_reason = inference_reason
 
+    def store_snapshot(self, diagnostics: dict, gpu_stats: Optional[dict]):
+        self.last_diagnostics = diagnostics
+        self.last_gpu_stats = gpu_stats
+        self.last_snapshot_monotonic = time.monotonic()
+
+    def begin_load(self, expected_load_s: Optional[float]):
+        self.load_started_monotonic = time.monotonic()
+        self.load_phase = "starting"
+        self.load_phase_fraction = 0.0
+        self.expected_load_s = expected_load_s
+        self.load_failure = None
+        # Stall detection is armed by the first journal line the load watcher sees
+        self.last_load_log_monotonic = None
+
+    def fail_load(self, code: str, message: str, line: Optional[str] = None):
+        if self.load_failure is None:
+            self.load_failure = {"code": code, "message": message, "line": line}
+            self.load_progress_event.set()
+
+    def set_load_phase(self, phase: str, fraction: float):
+        if fraction <= self.load_phase_fraction:
+            return
+        self.load_phase = phase
+        self.load_phase_fraction = fraction
+        self.load_progress_event.set()
+        logger.info(f"Load phase: {phase}")
+        event_broker.publish("progress", self.load_progress())
+
+    def end_load(self):
+        self.load_started_monotonic = None
+        self.load_phase = None
+        self.load_phase_fraction = 0.0
+        self.expected_load_s = None
+        self.last_load_log_monotonic = None
+
+    def load_progress(self) -> Optional[dict]:
+        if self.load_started_monotonic is None:
+            return None
+        elapsed = time.monotonic() - self.load_started_monotonic
+        fraction = self.load_phase_fraction
+        eta = None
+        if self.expected_load_s:
+            eta = max(0.0, self.expected_load_s - elapsed)
+            fraction = max(fraction, min(0.99, elapsed / self.expected_load_s))
+        return {
+            "phase": self.load_phase,
+            "fraction": round(fraction, 3),
+            "elapsed_s": round(elapsed, 1),
+            "expected_s": self.expected_load_s,
+            "eta_s": None if eta is None else round(eta, 1),
+        }
+
+    def snapshot_age(self) -> Optional[float]:
+        if self.last_snapshot_monotonic is None:
+            return None
+        return time.monotonic() - self.last_snapshot_monotonic
+
 
 app_state = AppState()
+event_broker = EventBroker()
+event_history = EventHistory(HISTORY_PATH)
+background_tasks: list[asyncio.Task] = []
+_refresh_task: Optional[asyncio.Task] = None
+_http_client: Optional[httpx.AsyncClient] = None
+_proxy_client: Optional[httpx.AsyncClient] = None
+_model_path_index: tuple[Optional[dict], dict[str, str]] = (None, {})
+_vllm_metrics_cache: tuple[Optional[float], str] = (None, "")
+_vllm_metrics_lock = asyncio.Lock()
+reconcile_wakeup = asyncio.Event()
 app = FastAPI(title="vLLM Manager", version="1.0.0")
 app.add_middleware(
     CORSMiddleware,
@@ -97,29 +825,375 @@ app.add_middleware(
 )
 
 
+def get_http_client() -> httpx.AsyncClient:
+    """Shared keep-alive client for all requests to vLLM endpoints."""
+    global _http_client
+    if _http_client is None or _http_client.is_closed:
+        _http_client = httpx.AsyncClient(
+            timeout=HEALTH_REQUEST_TIMEOUT,
+            limits=httpx.Limits(
+                max_connections=HTTP_MAX_CONNECTIONS,
+                max_keepalive_connections=HTTP_MAX_KEEPALIVE,
+            ),
+        )
+    return _http_client
+
+
+def get_proxy_client() -> httpx.AsyncClient:
+    """Keep-alive pool for proxied inference traffic, sized separately from the probe client."""
+    global _proxy_client
+    if _proxy_client is None or _proxy_client.is_closed:
+        _proxy_client = httpx.AsyncClient(
+            timeout=httpx.Timeout(None, connect=PROXY_CONNECT_TIMEOUT),
+            limits=httpx.Limits(
+                max_connections=PROXY_MAX_CONNECTIONS,
+                max_keepalive_connections=PROXY_MAX_CONNECTIONS,
+            ),
+        )
+    return _proxy_client
+
+
+async def close_http_client():
+    global _http_client, _proxy_client
+    if _http_client is not None:
+        await _http_client.aclose()
+        _http_client = None
+    if _proxy_client is not None:
+        await _proxy_client.aclose()
+        _proxy_client = None
+
+
+class ConfigError(Exception):
+    pass
+
+
+# Top-level config.yaml sections that hold a mapping of settings
+CONFIG_SECTIONS = (
+    "readiness", "proxy", "preflight", "prewarm", "benchmark", "warmup",
+    "sleep", "idle", "recovery", "fleet", "schedule", "instances",
+)
+# Settings inside those sections that hold a list
+CONFIG_LISTS = (("instances", "keep_warm"), ("prewarm", "models"), ("schedule", "rules"), ("fleet", "hosts"))
+
+
+def validate_config(config) -> list[str]:
+    """Return every problem found in a parsed config.yaml; an empty list means it is usable."""
+    if not isinstance(config, dict):
+        return ["config must be a mapping"]
+    models = config.get("models") or {}
+    if not isinstance(models, dict):
+        return ["'models' must be a mapping of model id to settings"]
+
+    errors = [
+        f"'{section}' must be a mapping"
+        for section in CONFIG_SECTIONS
+        if config.get(section) is not None and not isinstance(config[section], dict)
+    ]
+    errors.extend(
+        f"{section}.{key} must be a list"
+        for section, key in CONFIG_LISTS
+        if isinstance(config.get(section), dict)
+        and config[section].get(key) is not None
+        and not isinstance(config[section][key], list)
+    )
+    errors.extend(
+        f"model '{model_id}' warmup must be a mapping"
+        for model_id, model_config in models.items()
+        if isinstance(model_config, dict)
+        and model_config.get("warmup") is not None
+        and not isinstance(model_config["warmup"], dict)
+    )
+    if errors:
+        # The checks below read these sections as mappings and lists
+        return errors
+
+    ports: dict[int, str] = {}
+    for model_id, model_config in models.items():
+        if not isinstance(model_config, dict):
+            errors.append(f"model '{model_id}' must be a mapping")
+            continue
+        script = model_config.get("script")
+        if script and model_config.get("model"):
+            errors.append(f"model '{model_id}' sets both script and model; use one")
+        elif script:
+            valid, error = validate_model_files(script)
+            if not valid:
+                errors.append(f"model '{model_id}': {error}")
+            if model_config.get("variants"):
+                errors.append(f"model '{model_id}' has variants but no launch profile")
+        elif model_config.get("model"):
+            errors.extend(f"model '{model_id}': {error}" for error in validate_launch_profile(model_config))
+        else:
+            errors.append(f"model '{model_id}' needs a script or a model to serve")
+        port = model_config.get("port")
+        if port is not None:
+            if not isinstance(port, int):
+                errors.append(f"model '{model_id}' port must be an integer")
+            elif port in ports:
+                errors.append(f"models '{ports[port]}' and '{model_id}' both use port {port}")
+            else:
+                ports[port] = model_id
+
+    instances = config.get("instances") or {}
+    if instances.get("enabled"):
+        router_port = instances.get("router_port", 8000)
+        if router_port in ports:
+            errors.append(f"model '{ports[router_port]}' uses the router port {router_port}")
+        for model_id in models:
+            if not isinstance(models[model_id], dict) or models[model_id].get("port") is None:
+                errors.append(f"model '{model_id}' needs a port in multi-instance mode")
+        for model_id in instances.get("keep_warm", []):
+            if model_id not in models:
+                errors.append(f"instances.keep_warm lists unknown model '{model_id}'")
+
+    for model_id in (config.get("prewarm") or {}).get("models", []):
+        if model_id not in models:
+            errors.append(f"prewarm.models lists unknown model '{model_id}'")
+
+    recovery = config.get("recovery") or {}
+    for key in recovery:
+        if key not in RECOVERY_DEFAULTS:
+            errors.append(f"unknown recovery setting '{key}'")
+    fallbacks = {"recovery.fallback_model": recovery.get("fallback_model")}
+    fallbacks.update(
+        (f"model '{model_id}' fallback", model_config.get("fallback"))
+        for model_id, model_config in models.items()
+        if isinstance(model_config, dict)
+    )
+    for owner, fallback in fallbacks.items():
+        if fallback is not None and fallback not in models:
+            errors.append(f"{owner} names unknown model '{fallback}'")
+
+    preflight = config.get("preflight") or {}
+    if preflight.get("mode", "warn") not in ("reject", "warn", "off"):
+        errors.append("preflight.mode must be reject, warn or off")
+
+    for key, value in (config.get("idle") or {}).items():
+        if key not in IDLE_DEFAULTS:
+            errors.append(f"unknown idle setting '{key}'")
+        elif key == "timeout" and (not isinstance(value, (int, float)) or value <= 0):
+            errors.append("idle.timeout must be a positive number of seconds")
+
+    benchmark_section = config.get("benchmark") or {}
+    try:
+        benchmark.benchmark_settings({key: value for key, value in benchmark_section.items() if key != "after_switch"})
+    except ValueError as e:
+        errors.append(f"benchmark: {e}")
+
+    warmups = {"warmup": config.get("warmup")}
+    warmups.update(
+        (f"model '{model_id}' warmup", model_config.get("warmup"))
+        for model_id, model_config in models.items()
+        if isinstance(model_config, dict)
+    )
+    for owner, warmup in warmups.items():
+        for key, value in (warmup or {}).items():
+            if key not in WARMUP_DEFAULTS:
+                errors.append(f"{owner} has unknown setting '{key}'")
+            elif key == "prompts" and not (
+                isinstance(value, list)
+                and all(
+                    isinstance(prompt, str) or (isinstance(prompt, dict) and isinstance(prompt.get("messages"), list))
+                    for prompt in value
+                )
+            ):
+                errors.append(f"{owner} prompts must be strings or {{messages: [...]}} entries")
+
+    for key, value in (config.get("sleep") or {}).items():
+        if key not in SLEEP_DEFAULTS:
+            errors.append(f"unknown sleep setting '{key}'")
+        elif key == "timeout" and (not isinstance(value, (int, float)) or value <= 0):
+            errors.append("sleep.timeout must be a positive number of seconds")
+
+    schedule = config.get("schedule") or {}
+    for key in schedule:
+        if key not in SCHEDULE_DEFAULTS:
+            errors.append(f"unknown schedule setting '{key}'")
+    if schedule.get("timezone"):
+        try:
+            ZoneInfo(schedule["timezone"])
+        except (ValueError, KeyError, OSError):
+            errors.append(f"schedule.timezone '{schedule['timezone']}' is not a known time zone")
+    if schedule.get("on_busy", "defer") not in ("defer", "skip"):
+        errors.append("schedule.on_busy must be 'defer' or 'skip'")
+    for position, rule in enumerate(schedule.get("rules") or [], start=1):
+        if not isinstance(rule, dict) or not rule.get("cron") or not rule.get("model"):
+            errors.append(f"schedule rule {position} needs a cron expression and a model")
+            continue
+        try:
+            parse_cron(rule["cron"])
+        except ValueError as e:
+            errors.append(f"schedule rule {position} cron '{rule['cron']}': {e}")
+        if rule["model"] not in models:
+            errors.append(f"schedule rule {position} names unknown model '{rule['model']}'")
+        elif rule.get("variant") and rule["variant"] not in (models[rule["model"]].get("variants") or {}):
+            errors.append(f"schedule rule {position}: model '{rule['model']}' has no variant '{rule['variant']}'")
+
+    fleet = config.get("fleet") or {}
+    for key in fleet:
+        if key not in FLEET_DEFAULTS:
+            errors.append(f"unknown fleet setting '{key}'")
+    if "timeout" in fleet and (not isinstance(fleet["timeout"], (int, float)) or fleet["timeout"] <= 0):
+        errors.append("fleet.timeout must be a positive number of seconds")
+    host_names = set()
+    for host in fleet.get("hosts") or []:
+        if not isinstance(host, dict) or not host.get("name") or not str(host.get("url", "")).startswith(("http://", "https://")):
+            errors.append("fleet hosts need a name and an http(s) url")
+            continue
+        if host["name"] in host_names:
+            errors.append(f"fleet host '{host['name']}' is listed twice")
+        host_names.add(host["name"])
+        if host.get("kind", "manager") not in FLEET_HOST_KINDS:
+            errors.append(f"fleet host '{host['name']}' has unknown kind '{host['kind']}'")
+
+    for key, value in (config.get("readiness") or {}).items():
+        if key not in READINESS_DEFAULTS:
+            errors.append(f"unknown readiness setting '{key}'")
+        elif value is not None and (not isinstance(value, (int, float)) or value < 0):
+            errors.append(f"readiness.{key} must be a non-negative number")
+    return errors
+
+
+class ConfigStore:
+    """config.yaml parsed and validated once, re-read only when the file changes on disk.
+
+    An invalid edit is rejected up front and logged; the last good config keeps being
+    served and the problem is reported in `error` until the file is fixed.
+    """
+
+    def __init__(self, path: Path):
+        self.path = path
+        self.error: Optional[str] = None
+        self._config: Optional[dict] = None
+        self._signature: Optional[tuple] = None
+
+    def get(self) -> dict:
+        try:
+            stat = self.path.stat()
+        except FileNotFoundError:
+            raise HTTPException(status_code=500, detail=f"Config file not found: {self.path}")
+
+        signature = (stat.st_mtime_ns, stat.st_size)
+        if signature != self._signature:
+            self._signature = signature
+            try:
+                self._config = self._parse()
+                self.error = None
+                logger.info(f"Loaded config from {self.path}")
+            except (yaml.YAMLError, ConfigError) as e:
+                self.error = str(e)
+                logger.error(f"Invalid config {self.path}: {e}")
+            except Exception as e:
+                # A validation bug must not leave a config that is neither loaded nor explained
+                self.error = f"could not validate config: {e!r}"
+                logger.exception(f"Could not validate config {self.path}")
+
+        if self._config is None:
+            raise HTTPException(status_code=500, detail=f"Invalid config: {self.error}")
+        return self._config
+
+    def _parse(self) -> dict:
+        with open(self.path) as f:
+            config = yaml.safe_load(f) or {}
+        errors = validate_config(config)
+        if errors:
+            raise ConfigError("; ".join(errors))
+        return config
+
+
+class StateStore:
+    """state.json cached in memory and written atomically via a temp file and rename.
+
+    Writes may come from worker threads, so they are serialized; `update()` is the
+    read-modify-write that does not lose a concurrent writer's changes.
+    """
+
+    def __init__(self, path: Path):
+        self.path = path
+        self._state: Optional[dict] = None
+        self._signature: Optional[tuple] = None
+        self._write_lock = threading.Lock()
+
+    def load(self) -> dict:
+        try:
+            stat = self.path.stat()
+            signature = (stat.st_mtime_ns, stat.st_size)
+        except FileNotFoundError:
+            signature = None
+        if self._state is None or signature != self._signature:
+            state = {}
+            if signature is not None:
+                with open(self.path) as f:
+                    state = json.load(f)
+            self._state, self._signature = state, signature
+        return copy.deepcopy(self._state)
+
+    def save(self, state: dict):
+        with self._write_lock:
+            self._save(state)
+
+    def update(self, **changes):
+        with self._write_lock:
+            state = self.load()
+            state.update(changes)
+            self._save(state)
+
+    def _save(self, state: dict):
+        tmp_path = self.path.with_name(f".{self.path.name}.tmp")
+        with open(tmp_path, "w") as f:
+            json.dump(state, f, indent=2)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, self.path)
+        stat = self.path.stat()
+        self._state = copy.deepcopy(state)
+        self._signature = (stat.st_mtime_ns, stat.st_size)
+
+
+config_store = ConfigStore(CONFIG_PATH)
+state_store = StateStore(STATE_PATH)
+
+
 def load_config() -> dict:
-    if not CONFIG_PATH.exists():
-        raise HTTPException(status_code=500, detail=f"Config file not found: {CONFIG_PATH}")
-    with open(CONFIG_PATH) as f:
-        return yaml.safe_load(f)
+    return config_store.get()
 
 
 def load_state() -> dict:
-    if STATE_PATH.exists():
-        with open(STATE_PATH) as f:
-            return json.load(f)
-    return {}
+    return state_store.load()
 
 
 def save_state(state: dict):
-    with open(STATE_PATH, "w") as f:
-        json.dump(state, f, indent=2)
+    state_store.save(state)
+
+
+def update_state(**changes):
+    state_store.update(**changes)
 
 
-def run_systemctl(action: str) -> tuple[int, str, str]:
-    cmd = ["sudo", "systemctl", action, VLLM_SERVICE]
+def record_load_duration(model_id: str, duration_s: float):
+    history = load_state().get("load_history", {})
+    durations = (history.get(model_id, []) + [round(duration_s, 1)])[-LOAD_HISTORY_SIZE:]
+    history[model_id] = durations
+    update_state(load_history=history)
+
+
+def expected_load_duration(model_id: str, load_history: Optional[dict] = None) -> Optional[float]:
+    """Median of the model's recent load durations, or None before its first successful load."""
+    if load_history is None:
+        load_history = load_state().get("load_history", {})
+    durations = sorted(load_history.get(model_id, []))
+    if not durations:
+        return None
+    middle = len(durations) // 2
+    if len(durations) % 2:
+        return durations[middle]
+    return (durations[middle - 1] + durations[middle]) / 2
+
+
+def run_systemctl(action: str, unit: str = VLLM_SERVICE) -> tuple[int, str, str]:
+    cmd = ["sudo", "systemctl", action, unit]
     logger.info(f"Running: {' '.join(cmd)}")
-    result = subprocess.run(cmd, capture_output=True, text=True)
+    result = run_subprocess(cmd, capture_output=True, text=True)
     return result.returncode, result.stdout, result.stderr
 
 
@@ -127,20 +1201,24 @@ def get_systemd_state() -> str:
     return get_systemd_properties().get("active_state", "unknown")
 
 
-def get_systemd_properties() -> dict:
-    defaults = {
+def default_systemd_properties() -> dict:
+    return {
         "active_state": "unknown",
         "sub_state": "unknown",
         "result": "unknown",
         "exec_main_status": None,
         "exec_main_code": None,
     }
+
+
+def get_systemd_properties(unit: str = VLLM_SERVICE) -> dict:
+    defaults = default_systemd_properties()
     try:
-        result = subprocess.run(
+        result = run_subprocess(
             [
                 "systemctl",
                 "show",
-                VLLM_SERVICE,
+                unit,
                 "--property=ActiveState,SubState,Result,ExecMainStatus,ExecMainCode",
                 "--no-pager",
             ],
@@ -178,7 +1256,7 @@ def get_service_output(lines: int = SERVICE_LOG_DEFAULT_LINES) -> dict:
     safe_lines = max(1, min(lines, SERVICE_LOG_MAX_LINES))
 
     try:
-        status_result = subprocess.run(
+        status_result = run_subprocess(
             ["systemctl", "status", VLLM_SERVICE, "--no-pager", "-n", str(safe_lines)],
             capture_output=True,
             text=True,
@@ -191,7 +1269,7 @@ def get_service_output(lines: int = SERVICE_LOG_DEFAULT_LINES) -> dict:
         status_output = f"Failed to read systemctl status: {e}"
 
     try:
-        journal_result = subprocess.run(
+        journal_result = run_subprocess(
             ["journalctl", "-u", VLLM_SERVICE, "--no-pager", "-n", str(safe_lines)],
             capture_output=True,
             text=True,
@@ -212,13 +1290,67 @@ def get_service_output(lines: int = SERVICE_LOG_DEFAULT_LINES) -> dict:
     }
 
 
-def update_vllm_env(script_path: str):
-    VLLM_ENV_PATH.parent.mkdir(parents=True, exist_ok=True)
+def parse_journal_entry(raw: bytes) -> Optional[dict]:
+    try:
+        entry = json.loads(raw)
+    except ValueError:
+        return None
+    cursor = entry.get("__CURSOR")
+    if not cursor:
+        return None
+
+    message = entry.get("MESSAGE")
+    if isinstance(message, list):
+        # journalctl emits non-UTF-8 messages as a byte array
+        message = bytes(message).decode("utf-8", errors="replace")
+    timestamp = entry.get("__REALTIME_TIMESTAMP")
+    if timestamp and timestamp.isdigit():
+        timestamp = datetime.fromtimestamp(int(timestamp) / 1_000_000, timezone.utc).isoformat()
+
+    return {"cursor": cursor, "timestamp": timestamp, "message": message or ""}
+
+
+async def follow_journal(
+    unit: str = VLLM_SERVICE,
+    cursor: Optional[str] = None,
+    lines: int = SERVICE_LOG_DEFAULT_LINES,
+    follow: bool = True,
+):
+    """Yield journal entries for `unit`, resuming after `cursor` when given."""
+    cmd = ["journalctl", "-u", unit, "--no-pager", "-o", "json", "--output-fields=MESSAGE"]
+    if cursor:
+        cmd.append(f"--after-cursor={cursor}")
+    else:
+        cmd += ["-n", str(lines)]
+    if follow:
+        cmd.append("--follow")
+
+    proc = await asyncio.create_subprocess_exec(
+        *cmd,
+        stdout=asyncio.subprocess.PIPE,
+        stderr=asyncio.subprocess.DEVNULL,
+        limit=JOURNAL_LINE_LIMIT,
+    )
+    try:
+        async for raw in proc.stdout:
+            entry = parse_journal_entry(raw)
+            if entry:
+                yield entry
+    finally:
+        if proc.returncode is None:
+            proc.kill()
+            await proc.wait()
+
+
+def update_vllm_env(script_path: str, env_path: Path = VLLM_ENV_PATH, port: Optional[int] = None):
+    env_path.parent.mkdir(parents=True, exist_ok=True)
     content = f"MODEL_SCRIPT={script_path}\n"
-    logger.info(f"Updating {VLLM_ENV_PATH} with script: {script_path}")
+    if port is not None:
+        content += f"VLLM_PORT={port}\n"
+    logger.info(f"Updating {env_path} with script: {script_path}")
     # Write via sudo since /etc/vllm-manager may require root
-    subprocess.run(
-        ["sudo", "tee", str(VLLM_ENV_PATH)],
+    run_subprocess(
+        ["sudo", "tee", str(env_path)],
         input=content,
         capture_output=True,
         text=True,
@@ -227,175 +1359,1183 @@ def update_vllm_env(script_path: str):
 
 
 def daemon_reload():
-    subprocess.run(["sudo", "systemctl", "daemon-reload"], check=True)
+    run_subprocess(["sudo", "systemctl", "daemon-reload"], check=True)
 
 
-def get_gpu_stats() -> Optional[dict]:
-    try:
-        result = subprocess.run(
-            [
-                "nvidia-smi",
-                "--query-gpu=fan.speed,memory.used,memory.total,temperature.gpu",
-                "--format=csv,noheader,nounits",
-            ],
-            capture_output=True,
-            text=True,
-        )
-        if result.returncode != 0:
-            return None
+def validate_launch_profile(model_config: dict) -> list[str]:
+    errors = []
+    venv = model_config.get("venv")
+    if venv and not (Path(venv) / "bin" / "activate").is_file():
+        errors.append(f"venv {venv} has no bin/activate")
+    for section in ("args", "env"):
+        if not isinstance(model_config.get(section) or {}, dict):
+            errors.append(f"'{section}' must be a mapping")
+    variants = model_config.get("variants") or {}
+    if not isinstance(variants, dict):
+        return errors + ["'variants' must be a mapping of variant name to overrides"]
+    for name, overrides in variants.items():
+        if not isinstance(overrides, dict):
+            errors.append(f"variant '{name}' must be a mapping")
+            continue
+        for key, value in overrides.items():
+            if key not in ("args", "env", "venv"):
+                errors.append(f"variant '{name}' has unknown setting '{key}'")
+            elif key != "venv" and not isinstance(value or {}, dict):
+                errors.append(f"variant '{name}' {key} must be a mapping")
+    return errors
 
-        # Parse first GPU (or aggregate if multiple)
-        lines = result.stdout.strip().split("\n")
-        if not lines or not lines[0]:
-            return None
 
-        # Sum across all GPUs
-        max_fan = 0
-        total_mem_used = 0
-        total_mem_total = 0
-        max_temp = 0
-        gpu_count = 0
-
-        for line in lines:
-            parts = [p.strip() for p in line.split(",")]
-            if len(parts) >= 4:
-                max_fan = max(max_fan, int(parts[0]))
-                total_mem_used += int(parts[1])
-                total_mem_total += int(parts[2])
-                max_temp = max(max_temp, int(parts[3]))
-                gpu_count += 1
-
-        if gpu_count == 0:
-            return None
+def launch_profile(model_config: dict, variant: Optional[str] = None) -> dict:
+    """The model's launch settings with a variant's args, env and venv laid over them."""
 
-        return {
-            "fan_speed_percent": max_fan,
-            "memory_used_mb": total_mem_used,
-            "memory_total_mb": total_mem_total,
-            "temperature_c": max_temp,
-            "gpu_count": gpu_count,
-        }
-    except Exception as e:
-        logger.warning(f"Failed to get GPU stats: {e}")
-        return None
+    def normalized(args: Optional[dict]) -> dict:
+        return {key.replace("_", "-"): value for key, value in (args or {}).items()}
 
+    profile = {
+        "model": model_config["model"],
+        "venv": model_config.get("venv"),
+        "args": normalized(model_config.get("args")),
+        "env": dict(model_config.get("env") or {}),
+    }
+    if variant:
+        overrides = model_config["variants"][variant]
+        profile["args"].update(normalized(overrides.get("args")))
+        profile["env"].update(overrides.get("env") or {})
+        profile["venv"] = overrides.get("venv", profile["venv"])
+    return profile
 
-def validate_model_files(script_path: str) -> tuple[bool, Optional[str]]:
-    script = Path(script_path)
-    if not script.exists():
-        return False, f"Script not found: {script_path}"
-    if not script.is_file():
-        return False, f"Script is not a file: {script_path}"
-    return True, None
 
+def render_launch_command(profile: dict) -> list[str]:
+    """`vllm serve` argv for a launch profile.
 
-async def detect_running_model() -> Optional[str]:
-    """Query vLLM's OpenAI-compatible API to discover the currently loaded model."""
-    try:
-        proc = await asyncio.create_subprocess_exec(
-            "curl", "-s", VLLM_HEALTH_URL.replace("/health", "/v1/models"),
-            stdout=asyncio.subprocess.PIPE,
-            stderr=asyncio.subprocess.PIPE,
-        )
-        stdout, _ = await proc.communicate()
-        if proc.returncode != 0:
-            return None
-        data = json.loads(stdout.decode())
-        models = data.get("data", [])
-        if models:
-            return models[0].get("id")
-    except Exception as e:
-        logger.warning(f"Failed to detect running model from vLLM: {e}")
-    return None
+    `true` renders a bare flag, `false` renders `--no-<flag>`, a list repeats its values
+    after the flag and a mapping is passed as JSON.
+    """
+    command = ["vllm", "serve", str(profile["model"])]
+    for key, value in profile["args"].items():
+        flag = f"--{key}"
+        if value is None:
+            continue
+        if value is True:
+            command.append(flag)
+        elif value is False:
+            command.append(f"--no-{flag[2:]}")
+        elif isinstance(value, dict):
+            command += [flag, json.dumps(value)]
+        elif isinstance(value, list):
+            command += [flag, *(str(item) for item in value)]
+        else:
+            command += [flag, str(value)]
+    return command
 
 
-async def match_vllm_model_to_config(vllm_model_id: str) -> Optional[str]:
-    """Try to match a vLLM model ID to a config model ID."""
-    try:
-        config = load_config()
-        models = config.get("models", {})
-        # Check if any config model ID is a substring of the vLLM model path
-        for model_id in models:
-            if model_id in vllm_model_id.lower().replace("-", "").replace("_", ""):
-                return model_id
-        # Also try matching by checking script contents for the vLLM model path
-        vllm_model_name = vllm_model_id.split("/")[-1].lower()
-        for model_id in models:
-            if model_id.replace("-", "") in vllm_model_name.replace("-", "").replace("_", "").lower():
-                return model_id
-    except Exception as e:
-        logger.warning(f"Failed to match vLLM model to config: {e}")
-    return None
+def render_launch_script(profile: dict) -> str:
+    lines = ["#!/bin/bash", "# Generated by vllm-manager from config.yaml; edits are overwritten"]
+    if profile["venv"]:
+        lines.append(f"source {shlex.quote(str(Path(profile['venv']) / 'bin' / 'activate'))}")
+    for key, value in profile["env"].items():
+        lines.append(f"export {key}={shlex.quote(str(value))}")
+    command = " ".join(shlex.quote(part) for part in render_launch_command(profile))
+    if "port" not in profile["args"]:
+        # VLLM_PORT is set by the manager in multi-instance mode
+        command += ' --port "${VLLM_PORT:-8000}"'
+    lines.append(f"exec {command}")
+    return "\n".join(lines) + "\n"
 
 
-async def check_vllm_health() -> bool:
-    ok, _, _ = await check_vllm_health_details()
-    return ok
+def launch_script(model_id: str, variant: Optional[str] = None) -> str:
+    """Path of the script that starts `model_id`.
 
+    Models with a hand-written `script` use it as-is; launch profiles are rendered into
+    LAUNCH_DIR, one script per model and variant.
+    """
+    models = load_config().get("models", {})
+    if model_id not in models:
+        raise HTTPException(status_code=404, detail=f"Model '{model_id}' not found in config")
+    model_config = models[model_id]
+    if variant and variant not in (model_config.get("variants") or {}):
+        raise HTTPException(status_code=404, detail=f"Model '{model_id}' has no variant '{variant}'")
+    if model_config.get("script"):
+        return model_config["script"]
 
-async def check_vllm_health_details() -> tuple[bool, Optional[int], Optional[str]]:
-    try:
-        proc = await asyncio.create_subprocess_exec(
-            "curl", "-s", "-m", str(HEALTH_REQUEST_TIMEOUT), "-o", "/dev/null", "-w", "%{http_code}", VLLM_HEALTH_URL,
-            stdout=asyncio.subprocess.PIPE,
-            stderr=asyncio.subprocess.PIPE,
-        )
-        stdout, stderr = await proc.communicate()
-        if proc.returncode != 0:
-            err = stderr.decode().strip() or f"curl exited with status {proc.returncode}"
-            return False, None, err
-        raw_code = stdout.decode().strip()
-        code = int(raw_code) if raw_code.isdigit() else None
-        return code == 200, code, None if code == 200 else f"Health returned HTTP {raw_code}"
-    except Exception as e:
-        return False, None, str(e)
+    content = render_launch_script(launch_profile(model_config, variant))
+    script = LAUNCH_DIR / (f"{model_id}@{variant}.sh" if variant else f"{model_id}.sh")
+    if not script.exists() or script.read_text() != content:
+        LAUNCH_DIR.mkdir(parents=True, exist_ok=True)
+        tmp_path = script.with_suffix(".tmp")
+        tmp_path.write_text(content)
+        tmp_path.chmod(0o755)
+        os.replace(tmp_path, script)
+        logger.info(f"Rendered launch script {script}")
+    return str(script)
 
 
-def build_service_failure_message(systemd_props: dict) -> str:
-    result = systemd_props.get("result")
-    exit_status = systemd_props.get("exec_main_status")
-    details = []
-    if result and result != "unknown":
-        details.append(f"result={result}")
-    if exit_status:
-        details.append(f"exec_main_status={exit_status}")
-    suffix = f" ({', '.join(details)})" if details else ""
-    return f"vLLM systemd service is failed{suffix}"
+class ServiceController:
+    """Controls and inspects systemd units on behalf of the manager."""
 
+    name = "base"
 
-def infer_state(systemd_props: dict, manager_state: str, health_ok: bool, health_error: Optional[str]) -> tuple[str, Optional[str]]:
-    active_state = systemd_props.get("active_state")
+    async def get_properties(self, unit: str = VLLM_SERVICE) -> dict:
+        raise NotImplementedError
 
-    if active_state == "active":
-        if health_ok:
-            return "running", None
-        if manager_state == "starting":
-            return "starting", "vLLM process is active but health endpoint is not ready yet"
-        return "error", f"vLLM service is active but health endpoint is unreachable: {health_error or 'unknown error'}"
+    async def start(self, unit: str = VLLM_SERVICE) -> tuple[int, str, str]:
+        raise NotImplementedError
 
-    if active_state == "activating":
-        return "starting", None
+    async def stop(self, unit: str = VLLM_SERVICE) -> tuple[int, str, str]:
+        raise NotImplementedError
 
-    if active_state == "deactivating":
-        return "stopping", None
+    async def daemon_reload(self):
+        raise NotImplementedError
 
-    if active_state == "failed":
-        return "error", build_service_failure_message(systemd_props)
+    async def subscribe(self, unit: str, callback):
+        """Call `callback()` whenever the unit's properties change. Polling-only backends ignore this."""
 
-    if active_state == "inactive":
-        if manager_state == "stopping":
-            return "stopped", None
-        return "stopped", None
+    async def close(self):
+        pass
 
-    return manager_state, "Unable to determine vLLM service state from systemd"
 
+class SubprocessServiceController(ServiceController):
+    """Forks systemctl for every operation, run in worker threads to keep the event loop free."""
 
-async def reconcile_runtime_state(update_app_state: bool = True) -> dict:
-    systemd_props = get_systemd_properties()
-    health_ok, health_http_code, health_error = await check_vllm_health_details()
-    inferred_state, reason = infer_state(systemd_props, app_state.state, health_ok, health_error)
+    name = "subprocess"
 
-    await app_state.update_runtime_checks(
+    async def get_properties(self, unit: str = VLLM_SERVICE) -> dict:
+        return await asyncio.to_thread(get_systemd_properties, unit)
+
+    async def start(self, unit: str = VLLM_SERVICE) -> tuple[int, str, str]:
+        return await asyncio.to_thread(run_systemctl, "start", unit)
+
+    async def stop(self, unit: str = VLLM_SERVICE) -> tuple[int, str, str]:
+        return await asyncio.to_thread(run_systemctl, "stop", unit)
+
+    async def daemon_reload(self):
+        await asyncio.to_thread(daemon_reload)
+
+
+class DbusServiceController(ServiceController):
+    """Talks to systemd over the system bus.
+
+    Property reads and job completion come straight from systemd, and PropertiesChanged
+    signals let the reconciler react to transitions instead of waiting for the next poll.
+    Start/stop/reload fall back to sudo systemctl when polkit denies the D-Bus call.
+    """
+
+    name = "dbus"
+
+    def __init__(self, bus):
+        self._bus = bus
+        self._manager = None
+        self._units: dict = {}
+        self._jobs: dict[str, asyncio.Future] = {}
+        self._finished_jobs: dict[str, str] = {}
+        self._fallback = SubprocessServiceController()
+
+    @classmethod
+    async def connect(cls) -> "DbusServiceController":
+        bus = await MessageBus(bus_type=BusType.SYSTEM).connect()
+        controller = cls(bus)
+        introspection = await bus.introspect(SYSTEMD_BUS_NAME, SYSTEMD_OBJECT_PATH)
+        proxy = bus.get_proxy_object(SYSTEMD_BUS_NAME, SYSTEMD_OBJECT_PATH, introspection)
+        controller._manager = proxy.get_interface("org.freedesktop.systemd1.Manager")
+        controller._manager.on_job_removed(controller._on_job_removed)
+        await controller._manager.call_subscribe()
+        return controller
+
+    def _on_job_removed(self, job_id: int, job_path: str, unit: str, result: str):
+        future = self._jobs.pop(job_path, None)
+        if future is None:
+            # The signal can be dispatched before the caller registers its future
+            self._finished_jobs[job_path] = result
+            if len(self._finished_jobs) > 64:
+                self._finished_jobs.pop(next(iter(self._finished_jobs)))
+        elif not future.done():
+            future.set_result(result)
+
+    async def _unit_properties(self, unit: str):
+        if unit not in self._units:
+            path = await self._manager.call_load_unit(unit)
+            introspection = await self._bus.introspect(SYSTEMD_BUS_NAME, path)
+            proxy = self._bus.get_proxy_object(SYSTEMD_BUS_NAME, path, introspection)
+            self._units[unit] = proxy.get_interface("org.freedesktop.DBus.Properties")
+        return self._units[unit]
+
+    async def get_properties(self, unit: str = VLLM_SERVICE) -> dict:
+        props = default_systemd_properties()
+        try:
+            properties = await self._unit_properties(unit)
+            unit_props = await properties.call_get_all("org.freedesktop.systemd1.Unit")
+            service_props = await properties.call_get_all("org.freedesktop.systemd1.Service")
+        except Exception as e:
+            logger.warning(f"Failed to read systemd properties over D-Bus: {e}")
+            return props
+
+        def value(source: dict, key: str):
+            variant = source.get(key)
+            return None if variant is None else variant.value
+
+        props["active_state"] = value(unit_props, "ActiveState") or "unknown"
+        props["sub_state"] = value(unit_props, "SubState") or "unknown"
+        props["result"] = value(service_props, "Result") or "unknown"
+        exec_main_status = value(service_props, "ExecMainStatus")
+        exec_main_code = value(service_props, "ExecMainCode")
+        props["exec_main_status"] = None if exec_main_status is None else str(exec_main_status)
+        props["exec_main_code"] = None if exec_main_code is None else str(exec_main_code)
+        return props
+
+    async def _run_job(self, method_name: str, action: str, unit: str) -> tuple[int, str, str]:
+        try:
+            job_path = await getattr(self._manager, method_name)(unit, "replace")
+        except DBusError as e:
+            logger.warning(f"D-Bus {action} of {unit} rejected ({e}), falling back to systemctl")
+            return await asyncio.to_thread(run_systemctl, action, unit)
+
+        result = self._finished_jobs.pop(job_path, None)
+        if result is None:
+            future = asyncio.get_running_loop().create_future()
+            self._jobs[job_path] = future
+            try:
+                result = await asyncio.wait_for(future, SYSTEMD_JOB_TIMEOUT)
+            except asyncio.TimeoutError:
+                self._jobs.pop(job_path, None)
+                return 1, "", f"systemd {action} job for {unit} timed out"
+
+        if result == "done":
+            return 0, result, ""
+        return 1, "", f"systemd {action} job for {unit} finished with result={result}"
+
+    async def start(self, unit: str = VLLM_SERVICE) -> tuple[int, str, str]:
+        return await self._run_job("call_start_unit", "start", unit)
+
+    async def stop(self, unit: str = VLLM_SERVICE) -> tuple[int, str, str]:
+        return await self._run_job("call_stop_unit", "stop", unit)
+
+    async def daemon_reload(self):
+        try:
+            await self._manager.call_reload()
+        except DBusError as e:
+            logger.warning(f"D-Bus daemon reload rejected ({e}), falling back to systemctl")
+            await self._fallback.daemon_reload()
+
+    async def subscribe(self, unit: str, callback):
+        properties = await self._unit_properties(unit)
+        properties.on_properties_changed(lambda interface, changed, invalidated: callback())
+
+    async def close(self):
+        self._bus.disconnect()
+
+
+async def create_service_controller() -> ServiceController:
+    if SERVICE_BACKEND in ("auto", "dbus"):
+        if MessageBus is None:
+            if SERVICE_BACKEND == "dbus":
+                logger.warning("SERVICE_BACKEND=dbus but dbus-next is not installed, using systemctl")
+        else:
+            try:
+                return await DbusServiceController.connect()
+            except Exception as e:
+                logger.warning(f"Failed to connect to systemd over D-Bus, using systemctl: {e}")
+    return SubprocessServiceController()
+
+
+service_controller: ServiceController = SubprocessServiceController()
+
+
+NVIDIA_SMI_FIELDS = (
+    "index",
+    "utilization.gpu",
+    "memory.used",
+    "memory.total",
+    "temperature.gpu",
+    "power.draw",
+    "clocks.sm",
+    "fan.speed",
+)
+
+
+class GpuHistory:
+    """Fixed-size ring buffer of per-GPU samples.
+
+    Timestamps and values live in flat `array("d")` buffers (one slot per sample, one
+    row of GPU_METRICS per GPU), so retention costs a fixed amount of memory.
+    """
+
+    def __init__(self, capacity: int):
+        self.capacity = capacity
+        self.latest: list[dict] = []
+        self._timestamps = array("d", [0.0]) * capacity
+        self._values: dict[int, array] = {}
+        self._next = 0
+        self._count = 0
+
+    def record(self, timestamp: float, gpus: list[dict]):
+        width = len(GPU_METRICS)
+        slot = self._next
+        self._timestamps[slot] = timestamp
+        seen = set()
+        for gpu in gpus:
+            index = gpu["index"]
+            seen.add(index)
+            values = self._values.get(index)
+            if values is None:
+                values = self._values[index] = array("d", [math.nan]) * (self.capacity * width)
+            for offset, metric in enumerate(GPU_METRICS):
+                value = gpu.get(metric)
+                values[slot * width + offset] = math.nan if value is None else float(value)
+        for index, values in self._values.items():
+            if index not in seen:
+                values[slot * width:(slot + 1) * width] = array("d", [math.nan]) * width
+
+        self._next = (slot + 1) % self.capacity
+        self._count = min(self._count + 1, self.capacity)
+        self.latest = gpus
+
+    def query(self, since: float = 0, step: float = 0) -> dict:
+        """Return samples newer than `since`, averaged into `step`-second buckets when step > 0."""
+        width = len(GPU_METRICS)
+        first = (self._next - self._count) % self.capacity
+        slots = [
+            slot
+            for slot in ((first + i) % self.capacity for i in range(self._count))
+            if self._timestamps[slot] >= since
+        ]
+
+        if step > 0:
+            buckets: dict[float, list[int]] = {}
+            for slot in slots:
+                bucket = math.floor(self._timestamps[slot] / step) * step
+                buckets.setdefault(bucket, []).append(slot)
+        else:
+            buckets = {self._timestamps[slot]: [slot] for slot in slots}
+
+        gpus = []
+        for index in sorted(self._values):
+            values = self._values[index]
+            series = {metric: [] for metric in GPU_METRICS}
+            for bucket_slots in buckets.values():
+                for offset, metric in enumerate(GPU_METRICS):
+                    samples = [values[slot * width + offset] for slot in bucket_slots]
+                    samples = [sample for sample in samples if not math.isnan(sample)]
+                    series[metric].append(round(sum(samples) / len(samples), 2) if samples else None)
+            gpus.append({"index": index, **series})
+
+        return {
+            "since": since,
+            "step": step,
+            "resolution_s": GPU_SAMPLE_INTERVAL,
+            "timestamps": list(buckets),
+            "gpus": gpus,
+        }
+
+
+def parse_nvidia_smi_value(raw: str) -> Optional[float]:
+    raw = raw.strip()
+    try:
+        return float(raw)
+    except ValueError:
+        # "[N/A]", "[Not Supported]" and friends
+        return None
+
+
+def parse_nvidia_smi_line(line: str) -> Optional[dict]:
+    parts = line.split(",")
+    if len(parts) != len(NVIDIA_SMI_FIELDS):
+        return None
+    values = [parse_nvidia_smi_value(part) for part in parts]
+    if values[0] is None:
+        return None
+    return {"index": int(values[0]), **dict(zip(GPU_METRICS, values[1:]))}
+
+
+class GpuSampler(ABC):
+    """Source of per-GPU samples; `samples()` yields one list of GPU dicts per tick."""
+
+    name = "base"
+
+    def __init__(self, interval: float = GPU_SAMPLE_INTERVAL):
+        self.interval = interval
+
+    @abstractmethod
+    def samples(self) -> AsyncIterator[list[dict]]:
+        """Yield `[{"index": 0, <GPU_METRICS>...}, ...]` every `interval` seconds until failing."""
+
+    def close(self):
+        pass
+
+
+class NvmlGpuSampler(GpuSampler):
+    """Reads GPUs in-process through NVML bindings."""
+
+    name = "nvml"
+
+    def __init__(self, interval: float = GPU_SAMPLE_INTERVAL):
+        super().__init__(interval)
+        pynvml.nvmlInit()
+        self._handles = [pynvml.nvmlDeviceGetHandleByIndex(i) for i in range(pynvml.nvmlDeviceGetCount())]
+
+    @staticmethod
+    def _optional(read, *args):
+        try:
+            return read(*args)
+        except pynvml.NVMLError:
+            return None
+
+    def _read(self) -> list[dict]:
+        gpus = []
+        for index, handle in enumerate(self._handles):
+            memory = pynvml.nvmlDeviceGetMemoryInfo(handle)
+            power_mw = self._optional(pynvml.nvmlDeviceGetPowerUsage, handle)
+            gpus.append({
+                "index": index,
+                "utilization_percent": pynvml.nvmlDeviceGetUtilizationRates(handle).gpu,
+                "memory_used_mb": memory.used // (1024 * 1024),
+                "memory_total_mb": memory.total // (1024 * 1024),
+                "temperature_c": pynvml.nvmlDeviceGetTemperature(handle, pynvml.NVML_TEMPERATURE_GPU),
+                "power_w": None if power_mw is None else round(power_mw / 1000, 1),
+                "sm_clock_mhz": self._optional(pynvml.nvmlDeviceGetClockInfo, handle, pynvml.NVML_CLOCK_SM),
+                "fan_speed_percent": self._optional(pynvml.nvmlDeviceGetFanSpeed, handle),
+            })
+        return gpus
+
+    async def samples(self):
+        while True:
+            yield await asyncio.to_thread(self._read)
+            await asyncio.sleep(self.interval)
+
+    def close(self):
+        pynvml.nvmlShutdown()
+
+
+class NvidiaSmiGpuSampler(GpuSampler):
+    """Reads GPUs from a single long-running `nvidia-smi --loop-ms` process."""
+
+    name = "nvidia-smi"
+
+    async def samples(self):
+        proc = await asyncio.create_subprocess_exec(
+            "nvidia-smi",
+            f"--query-gpu={','.join(NVIDIA_SMI_FIELDS)}",
+            "--format=csv,noheader,nounits",
+            f"--loop-ms={int(self.interval * 1000)}",
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.DEVNULL,
+        )
+        try:
+            async for batch in nvidia_smi_batches(proc.stdout):
+                yield batch
+            raise RuntimeError(f"nvidia-smi exited with status {await proc.wait()}")
+        finally:
+            if proc.returncode is None:
+                proc.kill()
+                await proc.wait()
+
+
+async def nvidia_smi_batches(lines) -> AsyncIterator[list[dict]]:
+    """Group `nvidia-smi --loop-ms` CSV lines (bytes) into one list of GPUs per tick."""
+    gpu_count = None
+    batch: list[dict] = []
+    async for raw in lines:
+        gpu = parse_nvidia_smi_line(raw.decode())
+        if gpu is None:
+            continue
+        if batch and gpu["index"] <= batch[-1]["index"]:
+            # Index wrapped around: the previous tick is complete
+            gpu_count = gpu_count or len(batch)
+            yield batch
+            batch = []
+        batch.append(gpu)
+        if gpu_count and len(batch) == gpu_count:
+            yield batch
+            batch = []
+
+
+def create_gpu_sampler() -> Optional[GpuSampler]:
+    if pynvml is not None:
+        try:
+            return NvmlGpuSampler()
+        except Exception as e:
+            logger.warning(f"NVML unavailable, falling back to nvidia-smi: {e}")
+    if shutil.which("nvidia-smi"):
+        return NvidiaSmiGpuSampler()
+    logger.warning("No GPU sampler available, GPU stats disabled")
+    return None
+
+
+async def gpu_telemetry_loop(sampler: GpuSampler):
+    while True:
+        try:
+            async for gpus in sampler.samples():
+                gpu_history.record(time.time(), gpus)
+                event_broker.publish("gpu", summarize_gpus(gpus))
+        except Exception as e:
+            logger.warning(f"GPU sampler {sampler.name} failed: {e}")
+        await asyncio.sleep(GPU_SAMPLER_RESTART_DELAY)
+
+
+def summarize_gpus(gpus: list[dict]) -> Optional[dict]:
+    if not gpus:
+        return None
+    return {
+        "fan_speed_percent": int(max(gpu["fan_speed_percent"] or 0 for gpu in gpus)),
+        "memory_used_mb": int(sum(gpu["memory_used_mb"] or 0 for gpu in gpus)),
+        "memory_total_mb": int(sum(gpu["memory_total_mb"] or 0 for gpu in gpus)),
+        "temperature_c": int(max(gpu["temperature_c"] or 0 for gpu in gpus)),
+        "gpu_count": len(gpus),
+        "gpus": gpus,
+    }
+
+
+def get_gpu_stats() -> Optional[dict]:
+    return summarize_gpus(gpu_history.latest)
+
+
+gpu_history = GpuHistory(capacity=max(1, int(GPU_HISTORY_RETENTION / GPU_SAMPLE_INTERVAL)))
+gpu_sampler: Optional[GpuSampler] = None
+
+
+def validate_model_files(script_path: str) -> tuple[bool, Optional[str]]:
+    script = Path(script_path)
+    if not script.exists():
+        return False, f"Script not found: {script_path}"
+    if not script.is_file():
+        return False, f"Script is not a file: {script_path}"
+    return True, None
+
+
+def preflight_config() -> dict:
+    settings = dict(PREFLIGHT_DEFAULTS)
+    try:
+        settings.update(load_config().get("preflight") or {})
+    except HTTPException:
+        pass
+    return settings
+
+
+def script_launch_args(script_path: str) -> Optional[dict]:
+    """Model path and `vllm serve` flags from a hand-written start script, if it has a plain serve line."""
+    text = Path(script_path).read_text().replace("\\\n", " ")
+    for line in text.splitlines():
+        try:
+            parts = shlex.split(line, comments=True)
+        except ValueError:
+            continue
+        if "serve" not in parts:
+            continue
+        serve = parts.index("serve")
+        if not any(Path(part).name == "vllm" for part in parts[:serve]):
+            continue
+        rest = parts[serve + 1:]
+        if not rest or rest[0].startswith("-"):
+            return None
+        args: dict = {}
+        key = None
+        for token in rest[1:]:
+            if token.startswith("--"):
+                key, _, value = token[2:].partition("=")
+                args[key] = value or True
+                if value:
+                    key = None
+            elif key:
+                args[key] = token
+                key = None
+        return {"model": rest[0], "args": args, "env": {}}
+    return None
+
+
+def model_launch_settings(model_id: str, variant: Optional[str] = None) -> Optional[dict]:
+    """Model path, `vllm serve` args and env the model is launched with, when they can be known."""
+    model_config = load_config().get("models", {}).get(model_id)
+    if not model_config:
+        return None
+    if model_config.get("model"):
+        profile = launch_profile(model_config, variant)
+        return {"model": str(profile["model"]), "args": profile["args"], "env": profile["env"]}
+    try:
+        return script_launch_args(model_config["script"])
+    except (OSError, ValueError):
+        return None
+
+
+def dtype_bytes(dtype) -> Optional[int]:
+    return DTYPE_BYTES.get(str(dtype).lower()) if dtype else None
+
+
+def model_weight_bytes(model_dir: Path) -> int:
+    index = model_dir / "model.safetensors.index.json"
+    if index.is_file():
+        total = json.loads(index.read_text()).get("metadata", {}).get("total_size")
+        if total:
+            return int(total)
+    shards = list(model_dir.glob("*.safetensors")) or list(model_dir.glob("*.bin"))
+    return sum(shard.stat().st_size for shard in shards)
+
+
+def estimate_model_memory(model_dir: Path, args: dict, overhead_mb: float) -> dict:
+    """Per-GPU memory for a model: its weights split across TP/PP ranks plus KV cache for one max-length sequence."""
+    config = json.loads((model_dir / "config.json").read_text())
+    text_config = config.get("text_config") or config
+    tp = int(args.get("tensor-parallel-size", 1))
+    pp = int(args.get("pipeline-parallel-size", 1))
+    layers = int(text_config["num_hidden_layers"])
+    heads = int(text_config["num_attention_heads"])
+    kv_heads = int(text_config.get("num_key_value_heads") or heads)
+    head_dim = int(text_config.get("head_dim") or text_config["hidden_size"] // heads)
+    max_model_len = int(args.get("max-model-len") or text_config.get("max_position_embeddings") or 0)
+    kv_dtype_bytes = (
+        dtype_bytes(args.get("kv-cache-dtype"))
+        or dtype_bytes(args.get("dtype"))
+        or dtype_bytes(text_config.get("torch_dtype") or config.get("torch_dtype"))
+        or 2
+    )
+
+    weights_mb = model_weight_bytes(model_dir) / (tp * pp) / (1024 * 1024)
+    # KV heads are sharded across TP ranks, but replicated when there are fewer heads than ranks
+    kv_heads_per_gpu = max(1, math.ceil(kv_heads / tp))
+    kv_cache_mb = 2 * math.ceil(layers / pp) * kv_heads_per_gpu * head_dim * kv_dtype_bytes * max_model_len / (1024 * 1024)
+    return {
+        "gpu_count": tp * pp,
+        "tensor_parallel_size": tp,
+        "max_model_len": max_model_len,
+        "weights_mb": round(weights_mb),
+        "kv_cache_mb": round(kv_cache_mb),
+        "overhead_mb": round(overhead_mb),
+        "required_mb": round(weights_mb + kv_cache_mb + overhead_mb),
+    }
+
+
+def preflight_check(
+    model_id: str,
+    variant: Optional[str] = None,
+    gpus: Optional[list[dict]] = None,
+    replacing_current: bool = False,
+) -> dict:
+    """Whether `model_id` fits on its GPUs, with the per-GPU estimate behind the answer.
+
+    `fits` is None when the estimate cannot be made (no local model directory, an
+    unrecognised start script or no GPU reading). `gpus` defaults to the sampler's
+    latest reading. With `replacing_current`, memory held by the running model counts
+    as available because it is stopped first.
+    """
+    result: dict = {"model": model_id, "variant": variant, "fits": None}
+    launch = model_launch_settings(model_id, variant)
+    if launch is None:
+        result["reason"] = "could not determine the model path from its launch command"
+        return result
+    model_dir = Path(launch["model"])
+    if not (model_dir / "config.json").is_file():
+        result["reason"] = f"{model_dir} is not a local model directory"
+        return result
+    try:
+        estimate = estimate_model_memory(model_dir, launch["args"], preflight_config()["overhead_mb"])
+    except (OSError, ValueError, KeyError, TypeError, ZeroDivisionError) as e:
+        result["reason"] = f"could not read {model_dir / 'config.json'}: {e}"
+        return result
+    result.update(estimate)
+
+    gpus = gpu_history.latest if gpus is None else gpus
+    if not gpus:
+        result["reason"] = "no GPU memory reading available"
+        return result
+    visible = launch["env"].get("CUDA_VISIBLE_DEVICES")
+    if visible is not None:
+        indices = [int(index) for index in str(visible).split(",") if index.strip().isdigit()]
+        gpus = [gpu for gpu in gpus if gpu["index"] in indices]
+    candidates = gpus[:estimate["gpu_count"]]
+    if len(candidates) < estimate["gpu_count"]:
+        result["fits"] = False
+        result["reason"] = f"needs {estimate['gpu_count']} GPUs but {len(gpus)} are available"
+        return result
+
+    utilization = float(launch["args"].get("gpu-memory-utilization", 0.9))
+    result["gpus"] = []
+    for gpu in candidates:
+        total = gpu["memory_total_mb"] or 0
+        free = total - (gpu["memory_used_mb"] or 0)
+        budget = utilization * total if replacing_current else min(utilization * total, free)
+        result["gpus"].append({"index": gpu["index"], "free_mb": round(free), "available_mb": round(budget)})
+    tightest = min(result["gpus"], key=lambda gpu: gpu["available_mb"])
+    result["fits"] = estimate["required_mb"] <= tightest["available_mb"]
+    if not result["fits"]:
+        result["reason"] = (
+            f"needs ~{estimate['required_mb']} MiB per GPU (weights {estimate['weights_mb']}, "
+            f"KV cache {estimate['kv_cache_mb']}, overhead {estimate['overhead_mb']}) "
+            f"but GPU {tightest['index']} has {tightest['available_mb']} MiB available"
+        )
+    return result
+
+
+async def run_preflight(model_id: str, variant: Optional[str] = None, replacing_current: bool = False) -> Optional[dict]:
+    """Pre-flight check for /start and /switch; raises 400 in `reject` mode when the model does not fit."""
+    mode = preflight_config()["mode"]
+    if mode == "off":
+        return None
+    result = await asyncio.to_thread(preflight_check, model_id, variant, None, replacing_current)
+    if result["fits"] is False:
+        if mode == "reject":
+            raise HTTPException(status_code=400, detail=f"Pre-flight check failed: {result['reason']}")
+        logger.warning(f"Pre-flight check for {model_id}: {result['reason']}")
+    return result
+
+
+def prewarm_config() -> dict:
+    settings = dict(PREWARM_DEFAULTS)
+    try:
+        settings.update(load_config().get("prewarm") or {})
+    except HTTPException:
+        pass
+    return settings
+
+
+def available_ram_mb() -> Optional[float]:
+    try:
+        for line in Path("/proc/meminfo").read_text().splitlines():
+            if line.startswith("MemAvailable:"):
+                return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    return None
+
+
+def weight_shards(model_dir: Path) -> list[Path]:
+    return sorted(model_dir.glob("*.safetensors")) or sorted(model_dir.glob("*.bin"))
+
+
+def read_into_page_cache(path: Path, job: "PrewarmJob"):
+    """Pull one shard into the page cache: readahead hint first, then a sequential read to make sure."""
+    with open(path, "rb", buffering=0) as f:
+        if hasattr(os, "posix_fadvise"):
+            os.posix_fadvise(f.fileno(), 0, 0, os.POSIX_FADV_WILLNEED)
+        buffer = bytearray(PREWARM_CHUNK_SIZE)
+        done = 0
+        while not job.cancelled and (read := f.readinto(buffer)):
+            done += read
+            # One key per shard, so parallel readers never race on a shared counter
+            job.shard_bytes[path] = done
+    PREWARM_BYTES.inc(done, model=job.model)
+
+
+class PrewarmJob:
+    """Reads a model's weight shards into the page cache so the next load reads from RAM."""
+
+    def __init__(self, model: str, model_dir: Path):
+        self.model = model
+        self.model_dir = model_dir
+        self.status = "running"
+        self.reason: Optional[str] = None
+        self.total_bytes = 0
+        self.shard_bytes: dict[Path, int] = {}
+        self.cancelled = False
+        self.task: Optional[asyncio.Task] = None
+        self.started_monotonic = time.monotonic()
+        self.finished_monotonic: Optional[float] = None
+
+    @property
+    def done_bytes(self) -> int:
+        return sum(self.shard_bytes.values())
+
+    def cancel(self):
+        self.cancelled = True
+        if self.task and not self.task.done():
+            self.task.cancel()
+        if self.status == "running":
+            self.status = "cancelled"
+            self.finished_monotonic = time.monotonic()
+
+    def to_dict(self) -> dict:
+        elapsed = (self.finished_monotonic or time.monotonic()) - self.started_monotonic
+        return {
+            "model": self.model,
+            "status": self.status,
+            "reason": self.reason,
+            "total_bytes": self.total_bytes,
+            "done_bytes": self.done_bytes,
+            "progress": round(self.done_bytes / self.total_bytes, 3) if self.total_bytes else None,
+            "elapsed_s": round(elapsed, 1),
+            "throughput_mb_s": round(self.done_bytes / (1024 * 1024) / elapsed, 1) if elapsed > 0 else None,
+        }
+
+    async def run(self, workers: int, min_free_ram_mb: float):
+        try:
+            shards = await asyncio.to_thread(weight_shards, self.model_dir)
+            self.total_bytes = sum(shard.stat().st_size for shard in shards)
+            ram_mb = available_ram_mb()
+            if not shards:
+                self.status, self.reason = "skipped", f"no weight shards in {self.model_dir}"
+            elif ram_mb is not None and self.total_bytes / (1024 * 1024) > ram_mb - min_free_ram_mb:
+                self.status = "skipped"
+                self.reason = (
+                    f"{self.total_bytes / 2**30:.1f} GiB of weights would leave less than "
+                    f"{min_free_ram_mb} MiB of {ram_mb:.0f} MiB available RAM"
+                )
+            else:
+                logger.info(f"Pre-warming {len(shards)} shards of {self.model} ({self.total_bytes / 2**30:.1f} GiB)")
+                semaphore = asyncio.Semaphore(max(1, workers))
+
+                async def warm(shard: Path):
+                    async with semaphore:
+                        await asyncio.to_thread(read_into_page_cache, shard, self)
+
+                reader = asyncio.gather(*(warm(shard) for shard in shards))
+                while not reader.done():
+                    await asyncio.wait({reader}, timeout=PREWARM_PROGRESS_INTERVAL)
+                    event_broker.publish("prewarm", self.to_dict())
+                await reader
+                self.status = "completed"
+        except asyncio.CancelledError:
+            self.cancelled = True
+            self.status = "cancelled"
+            raise
+        except OSError as e:
+            self.status, self.reason = "failed", str(e)
+        finally:
+            self.finished_monotonic = time.monotonic()
+            event_broker.publish("prewarm", self.to_dict())
+            summary = self.to_dict()
+            logger.info(
+                f"Pre-warm of {self.model} {self.status}: {summary['done_bytes'] / 2**30:.1f} GiB "
+                f"at {summary['throughput_mb_s']} MB/s{f' ({self.reason})' if self.reason else ''}"
+            )
+
+
+prewarm_jobs: dict[str, PrewarmJob] = {}
+
+
+def start_prewarm(model_id: str, variant: Optional[str] = None) -> PrewarmJob:
+    """Start pre-warming `model_id`, or return the job already doing it."""
+    existing = prewarm_jobs.get(model_id)
+    if existing and existing.status == "running":
+        return existing
+    launch = model_launch_settings(model_id, variant)
+    if launch is None or not Path(launch["model"]).is_dir():
+        raise HTTPException(status_code=400, detail=f"Model '{model_id}' has no local weight directory to pre-warm")
+    settings = prewarm_config()
+    job = PrewarmJob(model_id, Path(launch["model"]))
+    prewarm_jobs[model_id] = job
+    job.task = asyncio.create_task(job.run(settings["workers"], settings["min_free_ram_mb"]))
+    return job
+
+
+def prewarm_likely_models():
+    """With `prewarm.auto`, warm the models most likely to be switched to next."""
+    settings = prewarm_config()
+    if not settings["auto"]:
+        return
+    candidates = settings["models"] or [load_state().get("previous_model")]
+    for model_id in candidates:
+        if not model_id or model_id == app_state.current_model:
+            continue
+        try:
+            start_prewarm(model_id)
+        except HTTPException as e:
+            logger.info(f"Not pre-warming {model_id}: {e.detail}")
+
+
+def instances_config() -> dict:
+    """The `instances` section of config.yaml, or {} when multi-instance mode is off."""
+    try:
+        config = load_config()
+    except Exception:
+        return {}
+    instances = config.get("instances") or {}
+    return instances if instances.get("enabled") else {}
+
+
+def multi_instance_enabled() -> bool:
+    return bool(instances_config())
+
+
+def instance_port(model_id: str) -> Optional[int]:
+    try:
+        return load_config().get("models", {}).get(model_id, {}).get("port")
+    except Exception:
+        return None
+
+
+def vllm_unit(model_id: Optional[str]) -> str:
+    if model_id and multi_instance_enabled():
+        return VLLM_INSTANCE_UNIT.format(model=model_id)
+    return VLLM_SERVICE
+
+
+def vllm_base_url(model_id: Optional[str]) -> str:
+    if model_id and multi_instance_enabled():
+        port = instance_port(model_id)
+        if port:
+            return f"http://localhost:{port}"
+    return VLLM_BASE_URL
+
+
+def instance_fits_on_gpus(model_id: str) -> bool:
+    """Whether the model's configured `gpu_memory_mb` fits in currently free GPU memory."""
+    try:
+        required = load_config().get("models", {}).get(model_id, {}).get("gpu_memory_mb")
+    except Exception:
+        return False
+    gpus = gpu_history.latest
+    if not required or not gpus:
+        return False
+    free = sum((gpu["memory_total_mb"] or 0) - (gpu["memory_used_mb"] or 0) for gpu in gpus)
+    return free >= required
+
+
+def instance_is_loaded(model_id: str) -> bool:
+    """Whether a multi-instance unit for `model_id` is already up (its memory is already in use)."""
+    for instance in (app_state.last_diagnostics or {}).get("instances", []):
+        if instance["model"] == model_id:
+            return instance["active_state"] in ("active", "activating")
+    return False
+
+
+async def _pipe(reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+    try:
+        while data := await reader.read(ROUTER_BUFFER_SIZE):
+            writer.write(data)
+            await writer.drain()
+    except ConnectionError:
+        pass
+    finally:
+        writer.close()
+
+
+class PortRouter:
+    """TCP forwarder from the public vLLM port to whichever instance is active.
+
+    Switching is a single assignment: new connections go to the new instance while
+    connections already open keep talking to the old one until they close.
+    """
+
+    def __init__(self, listen_port: int):
+        self.listen_port = listen_port
+        self.target_port: Optional[int] = None
+        self._server: Optional[asyncio.AbstractServer] = None
+
+    async def start(self):
+        self._server = await asyncio.start_server(self._handle, ROUTER_HOST, self.listen_port)
+        logger.info(f"Routing port {self.listen_port} to the active vLLM instance")
+
+    def route_to(self, port: Optional[int]):
+        if port != self.target_port:
+            logger.info(f"Router :{self.listen_port} now forwarding to :{port}")
+        self.target_port = port
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        port = self.target_port
+        if port is None:
+            writer.close()
+            return
+        try:
+            upstream_reader, upstream_writer = await asyncio.open_connection("127.0.0.1", port)
+        except OSError:
+            writer.close()
+            return
+        await asyncio.gather(_pipe(reader, upstream_writer), _pipe(upstream_reader, writer))
+
+    async def close(self):
+        if self._server:
+            self._server.close()
+            await self._server.wait_closed()
+
+
+port_router: Optional[PortRouter] = None
+
+
+async def ensure_port_router() -> Optional[PortRouter]:
+    """Start the router once multi-instance mode is on, also when it was enabled at runtime."""
+    global port_router
+    instances = instances_config()
+    if port_router is None and instances:
+        router = PortRouter(instances.get("router_port", 8000))
+        try:
+            await router.start()
+        except OSError as e:
+            logger.error(f"Cannot listen on router port {router.listen_port}: {e}")
+            return None
+        port_router = router
+    return port_router
+
+
+async def detect_running_model(base_url: str = VLLM_BASE_URL) -> Optional[dict]:
+    """Query vLLM's OpenAI-compatible API for the loaded model's card (`id` and `root` path)."""
+    try:
+        response = await get_http_client().get(f"{base_url}/v1/models", timeout=HEALTH_REQUEST_TIMEOUT)
+        if response.status_code != 200:
+            return None
+        data = response.json()
+        models = data.get("data", [])
+        if models:
+            return models[0]
+    except Exception as e:
+        logger.warning(f"Failed to detect running model from vLLM: {e}")
+    return None
+
+
+def model_path_key(path: str) -> str:
+    """Local model paths compare by their resolved location; Hugging Face IDs as written."""
+    expanded = Path(path).expanduser()
+    return str(expanded.resolve()) if expanded.is_absolute() else path
+
+
+def model_path_index() -> dict[str, str]:
+    """Model paths and served names from every model's launch settings, mapped to the config model ID.
+
+    Built once per loaded config, since the proxy looks requests up in it.
+    """
+    global _model_path_index
+    config = load_config()
+    if _model_path_index[0] is config:
+        return _model_path_index[1]
+    index: dict[str, str] = {}
+    for model_id, model_config in config.get("models", {}).items():
+        for variant in (None, *(model_config.get("variants") or {})):
+            settings = model_launch_settings(model_id, variant)
+            if not settings:
+                continue
+            served_names = settings["args"].get("served-model-name") or []
+            if not isinstance(served_names, list):
+                served_names = [served_names]
+            for name in (settings["model"], *served_names):
+                if isinstance(name, str) and name:
+                    index.setdefault(model_path_key(name), model_id)
+    _model_path_index = (config, index)
+    return index
+
+
+async def match_running_model(card: dict) -> Optional[str]:
+    """Config model ID serving `card`, by its served name or model path."""
+    try:
+        index = await asyncio.to_thread(model_path_index)
+    except Exception as e:
+        logger.warning(f"Failed to index model paths: {e}")
+        return None
+    for name in (card.get("id"), card.get("root")):
+        if name and model_path_key(name) in index:
+            return index[model_path_key(name)]
+    return None
+
+
+async def check_vllm_health() -> bool:
+    ok, _, _ = await check_vllm_health_details()
+    return ok
+
+
+async def check_vllm_health_details(base_url: str = VLLM_BASE_URL) -> tuple[bool, Optional[int], Optional[str]]:
+    started = time.perf_counter()
+    ok = False
+    try:
+        response = await get_http_client().get(f"{base_url}/health", timeout=HEALTH_REQUEST_TIMEOUT)
+        code = response.status_code
+        ok = code == 200
+        return ok, code, None if ok else f"Health returned HTTP {code}"
+    except httpx.HTTPError as e:
+        return False, None, str(e) or e.__class__.__name__
+    except Exception as e:
+        return False, None, str(e)
+    finally:
+        HEALTH_PROBE_DURATION.observe(time.perf_counter() - started, result="ok" if ok else "error")
+
+
+async def check_vllm_sleeping(base_url: str = VLLM_BASE_URL) -> bool:
+    """Whether vLLM reports sleep mode; false when it can't tell (sleep mode not enabled)."""
+    try:
+        response = await get_http_client().get(f"{base_url}/is_sleeping", timeout=HEALTH_REQUEST_TIMEOUT)
+        return response.status_code == 200 and response.json().get("is_sleeping") is True
+    except (httpx.HTTPError, ValueError, AttributeError):
+        return False
+
+
+def build_service_failure_message(systemd_props: dict) -> str:
+    result = systemd_props.get("result")
+    exit_status = systemd_props.get("exec_main_status")
+    details = []
+    if result and result != "unknown":
+        details.append(f"result={result}")
+    if exit_status:
+        details.append(f"exec_main_status={exit_status}")
+    suffix = f" ({', '.join(details)})" if details else ""
+    return f"vLLM systemd service is failed{suffix}"
+
+
+def infer_state(
+    systemd_props: dict,
+    manager_state: str,
+    health_ok: bool,
+    health_error: Optional[str],
+    sleeping: bool = False,
+    warming_up: bool = False,
+) -> tuple[str, Optional[str]]:
+    active_state = systemd_props.get("active_state")
+
+    if active_state == "active":
+        if health_ok:
+            if warming_up:
+                return "starting", "vLLM is healthy, replaying warm-up prompts"
+            if sleeping:
+                if manager_state == "starting":
+                    return "starting", "vLLM is waking up"
+                return "sleeping", None
+            if manager_state == "stopping":
+                return "stopping", "vLLM is still serving while it is stopped or put to sleep"
+            return "running", None
+        if manager_state == "starting":
+            return "starting", "vLLM process is active but health endpoint is not ready yet"
+        return "error", f"vLLM service is active but health endpoint is unreachable: {health_error or 'unknown error'}"
+
+    if active_state == "activating":
+        return "starting", None
+
+    if active_state == "deactivating":
+        return "stopping", None
+
+    if active_state == "failed":
+        return "error", build_service_failure_message(systemd_props)
+
+    if active_state == "inactive":
+        if manager_state == "stopping":
+            return "stopped", None
+        return "stopped", None
+
+    return manager_state, "Unable to determine vLLM service state from systemd"
+
+
+async def get_instance_statuses() -> list[dict]:
+    statuses = []
+    for model_id in load_config().get("models", {}):
+        port = instance_port(model_id)
+        if not port:
+            continue
+        props = await service_controller.get_properties(vllm_unit(model_id))
+        health_ok = sleeping = False
+        if props.get("active_state") == "active":
+            health_ok, _, _ = await check_vllm_health_details(vllm_base_url(model_id))
+            sleeping = health_ok and await check_vllm_sleeping(vllm_base_url(model_id))
+        statuses.append({
+            "model": model_id,
+            "unit": vllm_unit(model_id),
+            "port": port,
+            "active_state": props.get("active_state"),
+            "healthy": health_ok,
+            "sleeping": sleeping,
+            "role": "active" if model_id == app_state.current_model else "standby",
+        })
+    return statuses
+
+
+async def reconcile_runtime_state(update_app_state: bool = True) -> dict:
+    unit = vllm_unit(app_state.current_model)
+    base_url = vllm_base_url(app_state.current_model)
+    systemd_props = await service_controller.get_properties(unit)
+    health_ok, health_http_code, health_error = await check_vllm_health_details(base_url)
+    sleeping = health_ok and await check_vllm_sleeping(base_url)
+    inferred_state, reason = infer_state(
+        systemd_props,
+        app_state.state,
+        health_ok,
+        health_error,
+        sleeping,
+        warming_up=app_state.load_phase == "warming_up",
+    )
+    RECONCILES.inc(inferred_state=inferred_state)
+
+    await app_state.update_runtime_checks(
         systemd_props=systemd_props,
         health_http_code=health_http_code,
         health_error=health_error,
@@ -408,13 +2548,16 @@ async def reconcile_runtime_state(update_app_state: bool = True) -> dict:
             if app_state.state != "error" or app_state.error_message != reason:
                 await app_state.set_state("error", error=reason)
         elif inferred_state != app_state.state:
-            await app_state.set_state(inferred_state)
+            # A load aborted by the readiness checks leaves its unit stopped on purpose;
+            # keep the structured error visible until the next lifecycle command
+            if not (app_state.state == "error" and app_state.error_detail and inferred_state == "stopped"):
+                await app_state.set_state(inferred_state)
         elif app_state.state != "error":
             app_state.error_message = None
 
-    return {
+    diagnostics = {
         "systemd": {
-            "service": VLLM_SERVICE,
+            "service": unit,
             "active_state": systemd_props.get("active_state"),
             "sub_state": systemd_props.get("sub_state"),
             "result": systemd_props.get("result"),
@@ -422,94 +2565,951 @@ async def reconcile_runtime_state(update_app_state: bool = True) -> dict:
             "exec_main_code": systemd_props.get("exec_main_code"),
         },
         "health": {
-            "url": VLLM_HEALTH_URL,
+            "url": f"{base_url}/health",
             "ok": health_ok,
             "http_code": health_http_code,
             "error": health_error,
+            "sleeping": sleeping,
         },
         "inferred_state": inferred_state,
         "inference_reason": reason,
         "checked_at": app_state.last_reconciled_at,
     }
+    if multi_instance_enabled():
+        diagnostics["instances"] = await get_instance_statuses()
+        if port_router and inferred_state == "running" and app_state.current_model:
+            port_router.route_to(instance_port(app_state.current_model))
+    return diagnostics
+
+
+def _without_timestamp(diagnostics: Optional[dict]) -> Optional[dict]:
+    if diagnostics is None:
+        return None
+    return {key: value for key, value in diagnostics.items() if key != "checked_at"}
+
+
+async def _refresh_snapshot():
+    previous = _without_timestamp(app_state.last_diagnostics)
+    diagnostics = await reconcile_runtime_state(update_app_state=True)
+    app_state.store_snapshot(diagnostics, get_gpu_stats())
 
+    if _without_timestamp(diagnostics) != previous:
+        event_broker.publish("checks", diagnostics)
+        record_check_changes(previous, diagnostics)
 
-async def wait_for_vllm_ready():
-    """Poll vLLM health endpoint until ready or timeout."""
-    elapsed = 0
-    while elapsed < HEALTH_POLL_TIMEOUT:
-        systemd_props = get_systemd_properties()
+
+def record_check_changes(previous: Optional[dict], diagnostics: dict):
+    """Log systemd state/result changes and health flips to the event history."""
+    systemd = diagnostics["systemd"]
+    before = (previous or {}).get("systemd", {})
+    if (systemd["active_state"], systemd["result"]) != (before.get("active_state"), before.get("result")):
+        event_history.record(
+            "systemd",
+            app_state.current_model,
+            systemd["active_state"],
+            sub_state=systemd["sub_state"],
+            result=systemd["result"],
+            exec_main_status=systemd["exec_main_status"],
+        )
+    health = diagnostics["health"]
+    if previous is not None and health["ok"] != previous.get("health", {}).get("ok"):
+        event_history.record(
+            "health",
+            app_state.current_model,
+            "ok" if health["ok"] else "failed",
+            http_code=health["http_code"],
+            error=health["error"],
+        )
+
+
+async def refresh_snapshot():
+    """Refresh the cached status snapshot, sharing one refresh between concurrent callers."""
+    global _refresh_task
+    if _refresh_task is None or _refresh_task.done():
+        _refresh_task = asyncio.create_task(_refresh_snapshot())
+    await asyncio.shield(_refresh_task)
+
+
+async def reconciler_loop():
+    """Keep the status snapshot fresh so /status never has to probe inline.
+
+    Runs every RECONCILE_INTERVAL seconds, or immediately when the service controller
+    reports a property change on the vLLM unit.
+    """
+    while True:
+        try:
+            await asyncio.wait_for(reconcile_wakeup.wait(), RECONCILE_INTERVAL)
+        except asyncio.TimeoutError:
+            pass
+        reconcile_wakeup.clear()
+        try:
+            await refresh_snapshot()
+        except Exception as e:
+            logger.warning(f"Background reconciliation failed: {e}")
+
+
+def match_load_phase(message: str) -> Optional[tuple[str, float]]:
+    for pattern, phase, fraction in LOAD_PHASE_PATTERNS:
+        if pattern.search(message):
+            return phase, fraction
+    return None
+
+
+def match_fatal_log(message: str) -> Optional[tuple[str, str]]:
+    for pattern, code, description in FATAL_LOG_PATTERNS:
+        if pattern.search(message):
+            return code, description
+    return None
+
+
+async def watch_load_progress(unit: str):
+    """Follow the unit's journal during a load, advancing the load phase and spotting fatal errors."""
+    try:
+        async for entry in follow_journal(unit=unit, lines=0):
+            message = entry["message"]
+            app_state.last_load_log_monotonic = time.monotonic()
+            fatal = match_fatal_log(message)
+            if fatal:
+                app_state.fail_load(*fatal, line=message)
+                continue
+            matched = match_load_phase(message)
+            if matched:
+                app_state.set_load_phase(*matched)
+    except Exception as e:
+        logger.warning(f"Failed to follow {unit} journal for load progress: {e}")
+    finally:
+        # Without a watcher, silence says nothing about the load; disarm stall detection
+        app_state.last_load_log_monotonic = None
+
+
+def readiness_config() -> dict:
+    settings = dict(READINESS_DEFAULTS)
+    try:
+        settings.update(load_config().get("readiness") or {})
+    except Exception:
+        pass
+    return settings
+
+
+def next_poll_interval(elapsed: float, previous: Optional[float], settings: dict) -> float:
+    """Back off between health polls, tightening again once the load should be nearly done."""
+    initial = settings["initial_interval"]
+    if app_state.load_phase in ("cuda_graphs_captured", "serving"):
+        return initial
+    expected = app_state.expected_load_s
+    if expected is not None and elapsed >= expected * 0.8:
+        return initial
+    interval = initial if previous is None else min(settings["max_interval"], previous * settings["backoff_factor"])
+    if expected is not None:
+        interval = min(interval, max(initial, expected * 0.8 - elapsed))
+    return interval
+
+
+async def wait_for_vllm_ready(
+    unit: str = VLLM_SERVICE,
+    base_url: str = VLLM_BASE_URL,
+) -> tuple[bool, Optional[str], Optional[dict]]:
+    """Poll vLLM health endpoint until ready, failed or timed out.
+
+    Polls back off according to the `readiness` config and tighten near the expected
+    ready time; a new load phase in the journal triggers an immediate re-check and a
+    fatal journal line aborts the wait straight away. Returns (ready, reason, detail).
+    """
+    settings = readiness_config()
+    started = time.monotonic()
+    elapsed = 0.0
+    interval = None
+    while elapsed < settings["timeout"]:
+        if app_state.load_failure:
+            return False, app_state.load_failure["message"], app_state.load_failure
+
+        systemd_props = await service_controller.get_properties(unit)
         if systemd_props.get("active_state") == "failed":
-            return False, build_service_failure_message(systemd_props)
+            message = build_service_failure_message(systemd_props)
+            return False, message, {
+                "code": "service_failed",
+                "message": message,
+                "result": systemd_props.get("result"),
+                "exec_main_status": systemd_props.get("exec_main_status"),
+            }
 
-        health_ok, _, health_error = await check_vllm_health_details()
+        health_ok, _, health_error = await check_vllm_health_details(base_url)
         if health_ok:
-            return True, None
+            return True, None, None
+
+        last_log = app_state.last_load_log_monotonic
+        stall_timeout = settings.get("stall_timeout")
+        if stall_timeout and last_log is not None and time.monotonic() - last_log > stall_timeout:
+            message = f"vLLM produced no log output for {stall_timeout}s while loading"
+            return False, message, {"code": "stalled", "message": message, "phase": app_state.load_phase}
+
+        interval = next_poll_interval(elapsed, interval, settings)
+        app_state.load_progress_event.clear()
+        try:
+            await asyncio.wait_for(app_state.load_progress_event.wait(), interval)
+        except asyncio.TimeoutError:
+            pass
+        elapsed = time.monotonic() - started
+        logger.info(f"Waiting for vLLM to be ready... ({elapsed:.0f}s), health_error={health_error}")
+    message = "vLLM health check timeout"
+    return False, message, {"code": "timeout", "message": message, "phase": app_state.load_phase}
+
+
+def record_active_model(model_id: str, variant: Optional[str]):
+    state = load_state()
+    changes = {"last_model": model_id, "last_variant": variant, "idle_unloaded": None}
+    if state.get("last_model") and state["last_model"] != model_id:
+        changes["previous_model"] = state["last_model"]
+    update_state(**changes)
+
+
+def record_instance_variant(model_id: str, variant: Optional[str]):
+    """Remember which variant each vllm@<model> instance was started with."""
+    variants = load_state().get("instance_variants", {})
+    variants[model_id] = variant
+    update_state(instance_variants=variants)
+
+
+def warmup_settings(model_id: str) -> dict:
+    """Top-level `warmup` defaults overridden by the model's own `warmup` block."""
+    settings = dict(WARMUP_DEFAULTS)
+    try:
+        config = load_config()
+    except HTTPException:
+        return settings
+    settings.update(config.get("warmup") or {})
+    settings.update(config.get("models", {}).get(model_id, {}).get("warmup") or {})
+    return settings
+
+
+class WarmupRecorder:
+    """Leading system prompts of chat requests seen by the proxy, the most recent kept per model.
+
+    Saved to warmup_prompts.json so a start after a manager restart can still replay them.
+    New prompts are written in batches from a worker thread, off the proxy's request path.
+    """
+
+    def __init__(self, path: Path):
+        self.store = StateStore(path)
+        # Per model, the keys of the last `recorded` prompts, oldest first
+        self._seen: dict[str, dict[str, None]] = {}
+        self._pending: list[tuple[str, dict, int]] = []
+        self._flush_task: Optional[asyncio.Task] = None
+
+    def observe(self, model_id: Optional[str], messages) -> None:
+        if not model_id or not isinstance(messages, list):
+            return
+        limit = warmup_settings(model_id)["recorded"]
+        if not limit:
+            return
+        prefix = []
+        for message in messages:
+            if not isinstance(message, dict) or message.get("role") not in ("system", "developer"):
+                break
+            prefix.append(message)
+        if not prefix:
+            return
+        key = hashlib.sha1(json.dumps(prefix, sort_keys=True).encode()).hexdigest()[:16]
+        seen = self._seen.setdefault(model_id, {})
+        if key in seen:
+            return
+        seen[key] = None
+        while len(seen) > limit:
+            seen.pop(next(iter(seen)))
+        self._pending.append((model_id, {"key": key, "messages": prefix, "recorded_at": utc_now_iso()}, limit))
+        if self._flush_task is None or self._flush_task.done():
+            self._flush_task = asyncio.create_task(self.flush())
+
+    async def flush(self):
+        """Write the prompts observed so far; ones seen during a write go out with the next batch."""
+        while self._pending:
+            pending, self._pending = self._pending, []
+            await asyncio.to_thread(self._write, pending)
+
+    def _write(self, pending: list[tuple[str, dict, int]]):
+        try:
+            recorded = self.store.load()
+            for model_id, prompt, limit in pending:
+                prompts = [existing for existing in recorded.get(model_id, []) if existing["key"] != prompt["key"]]
+                prompts.append(prompt)
+                recorded[model_id] = prompts[-limit:]
+            self.store.save(recorded)
+        except (OSError, ValueError) as e:
+            logger.warning(f"Could not record {len(pending)} warm-up prompts: {e}")
+
+    def prompts(self, model_id: str, limit: int) -> list[list[dict]]:
+        if not limit:
+            return []
+        try:
+            recorded = self.store.load().get(model_id, [])
+        except (OSError, ValueError) as e:
+            logger.warning(f"Could not read recorded warm-up prompts: {e}")
+            return []
+        return [prompt["messages"] for prompt in recorded[-limit:]]
+
+
+warmup_recorder = WarmupRecorder(WARMUP_PROMPTS_PATH)
+
+
+def warmup_requests(model_id: str, settings: dict) -> list[tuple[str, dict]]:
+    """(endpoint, body) pairs for the configured prompts followed by the recorded ones."""
+    requests = []
+    for prompt in settings["prompts"]:
+        if isinstance(prompt, str):
+            requests.append(("completions", {"prompt": prompt}))
+        else:
+            requests.append(("chat/completions", {"messages": prompt["messages"]}))
+    for prefix in warmup_recorder.prompts(model_id, settings["recorded"]):
+        requests.append(("chat/completions", {"messages": prefix + [WARMUP_USER_MESSAGE]}))
+    return requests
 
-        await asyncio.sleep(HEALTH_POLL_INTERVAL)
-        elapsed += HEALTH_POLL_INTERVAL
-        logger.info(f"Waiting for vLLM to be ready... ({elapsed}s), health_error={health_error}")
-    return False, "vLLM health check timeout"
 
+async def run_warmup(model_id: str) -> Optional[dict]:
+    """Replay warm-up prompts against a freshly healthy model to fill its prefix cache.
 
-async def start_vllm_async(model_id: str, script_path: str):
+    Failures are logged and reported but never fail the load.
+    """
+    settings = warmup_settings(model_id)
+    requests = warmup_requests(model_id, settings)
+    if not requests:
+        return None
+    app_state.set_load_phase("warming_up", WARMUP_PHASE_FRACTION)
+    base_url = vllm_base_url(model_id)
+    client = get_proxy_client()
+    semaphore = asyncio.Semaphore(max(1, settings["concurrency"]))
+    started = time.monotonic()
+
+    async def replay(endpoint: str, body: dict):
+        async with semaphore:
+            response = await client.post(
+                f"{base_url}/v1/{endpoint}",
+                json={**body, "model": served_model, "max_tokens": settings["max_tokens"]},
+                timeout=settings["timeout"],
+            )
+            response.raise_for_status()
+
+    errors = []
+    try:
+        served_model = await asyncio.wait_for(benchmark.served_model_name(client, base_url), HEALTH_REQUEST_TIMEOUT)
+        outcomes = await asyncio.wait_for(
+            asyncio.gather(*(replay(endpoint, body) for endpoint, body in requests), return_exceptions=True),
+            settings["timeout"],
+        )
+        errors = [str(outcome) or outcome.__class__.__name__ for outcome in outcomes if outcome is not None]
+    except asyncio.TimeoutError:
+        errors = [f"warm-up did not finish within {settings['timeout']}s"]
+    except (httpx.HTTPError, ValueError, KeyError, IndexError) as e:
+        errors = [f"could not read the served model name: {e}"]
+
+    duration = time.monotonic() - started
+    MODEL_WARMUP_DURATION.observe(duration, model=model_id)
+    app_state.last_warmup = {
+        "model": model_id,
+        "prompts": len(requests),
+        "errors": len(errors),
+        "first_error": errors[0] if errors else None,
+        "duration_s": round(duration, 2),
+        "finished_at": utc_now_iso(),
+    }
+    if errors:
+        logger.warning(f"Warm-up of {model_id}: {len(errors)}/{len(requests)} prompts failed, first: {errors[0]}")
+    logger.info(f"Warmed up {model_id} with {len(requests)} prompts in {duration:.1f}s")
+    return app_state.last_warmup
+
+
+async def start_vllm_async(model_id: str, script_path: str, variant: Optional[str] = None):
     """Background task to start vLLM and wait for it to be ready."""
+    started = time.monotonic()
+    unit = vllm_unit(model_id)
+    progress_task = None
     try:
+        app_state.current_variant = variant
         await app_state.set_state("starting", model=model_id)
+        # Follow the journal before starting so early fatal lines are not missed
+        app_state.begin_load(expected_load_duration(model_id))
+        progress_task = asyncio.create_task(watch_load_progress(unit))
 
-        update_vllm_env(script_path)
-        daemon_reload()
+        if unit == VLLM_SERVICE:
+            await asyncio.to_thread(update_vllm_env, script_path)
+        else:
+            env_path = VLLM_ENV_PATH.parent / VLLM_INSTANCE_ENV.format(model=model_id)
+            await asyncio.to_thread(update_vllm_env, script_path, env_path, instance_port(model_id))
+        await service_controller.daemon_reload()
 
-        returncode, stdout, stderr = run_systemctl("start")
+        returncode, stdout, stderr = await service_controller.start(unit)
         if returncode != 0:
             await app_state.set_state("error", error=f"Failed to start vLLM: {stderr}")
             return
+        if unit != VLLM_SERVICE:
+            record_instance_variant(model_id, variant)
 
-        ready, failure_reason = await wait_for_vllm_ready()
+        ready, failure_reason, failure_detail = await wait_for_vllm_ready(unit, vllm_base_url(model_id))
         if ready:
+            load_duration = time.monotonic() - started
+            MODEL_LOAD_DURATION.observe(load_duration, model=model_id)
+            record_load_duration(model_id, load_duration)
+            warmup = await run_warmup(model_id)
+            event_history.record(
+                "load",
+                model_id,
+                duration_s=round(load_duration, 1),
+                warmup_s=warmup["duration_s"] if warmup else None,
+                variant=variant,
+            )
+            if port_router:
+                port_router.route_to(instance_port(model_id))
             await app_state.set_state("running")
-            save_state({"last_model": model_id})
+            record_active_model(model_id, variant)
+            prewarm_likely_models()
         else:
-            await app_state.set_state("error", error=failure_reason or "vLLM failed to become ready")
+            if failure_detail and failure_detail["code"] not in ("service_failed", "timeout"):
+                # The process may still be alive (hung, or stuck retrying); don't leave it holding GPUs
+                await service_controller.stop(unit)
+            await app_state.set_state(
+                "error",
+                error=failure_reason or "vLLM failed to become ready",
+                detail=failure_detail,
+            )
+    except asyncio.CancelledError:
+        logger.info(f"Start of {model_id} cancelled, stopping {unit}")
+        await service_controller.stop(unit)
+        await app_state.set_state("stopped")
+        raise
     except Exception as e:
         await app_state.set_state("error", error=str(e))
+    finally:
+        if progress_task:
+            progress_task.cancel()
+        app_state.end_load()
+        record_operation("start", started, app_state.state == "running")
 
 
 async def stop_vllm_async():
     """Background task to stop vLLM."""
+    started = time.monotonic()
     try:
         await app_state.set_state("stopping")
-        returncode, stdout, stderr = run_systemctl("stop")
+        if port_router:
+            port_router.route_to(None)
+        returncode, stdout, stderr = await service_controller.stop(vllm_unit(app_state.current_model))
         if returncode != 0:
             await app_state.set_state("error", error=f"Failed to stop vLLM: {stderr}")
         else:
             await app_state.set_state("stopped")
     except Exception as e:
         await app_state.set_state("error", error=str(e))
+    finally:
+        record_operation("stop", started, app_state.state == "stopped")
+
+
+def sleep_config() -> dict:
+    settings = dict(SLEEP_DEFAULTS)
+    try:
+        settings.update(load_config().get("sleep") or {})
+    except HTTPException:
+        pass
+    return settings
+
+
+async def request_vllm_sleep(model_id: Optional[str], wake: bool = False):
+    """Ask a model's vLLM to sleep or wake up; raises RuntimeError when it refuses."""
+    base_url = vllm_base_url(model_id)
+    action = "wake up" if wake else "sleep"
+    try:
+        if wake:
+            response = await get_http_client().post(f"{base_url}/wake_up", timeout=sleep_config()["timeout"])
+        else:
+            response = await get_http_client().post(
+                f"{base_url}/sleep", params={"level": SLEEP_LEVEL}, timeout=sleep_config()["timeout"]
+            )
+    except httpx.HTTPError as e:
+        raise RuntimeError(f"vLLM did not {action}: {str(e) or e.__class__.__name__}")
+    if response.status_code == 404:
+        raise RuntimeError(
+            f"vLLM for {model_id} has no sleep mode; start it with --enable-sleep-mode and VLLM_SERVER_DEV_MODE=1"
+        )
+    if response.status_code >= 400:
+        raise RuntimeError(f"vLLM did not {action}: HTTP {response.status_code} {response.text[:200]}")
+
+
+async def sleep_vllm_async():
+    """Offload the active model's weights to CPU RAM and free its GPU memory, keeping the process."""
+    started = time.monotonic()
+    try:
+        await app_state.set_state("stopping")
+        if port_router:
+            port_router.route_to(None)
+        try:
+            await request_vllm_sleep(app_state.current_model)
+        except RuntimeError:
+            # The model is still loaded; put it back in service and fail the operation
+            if port_router:
+                port_router.route_to(instance_port(app_state.current_model))
+            await app_state.set_state("running")
+            raise
+        await app_state.set_state("sleeping")
+        logger.info(f"{app_state.current_model} is asleep after {time.monotonic() - started:.1f}s")
+    finally:
+        record_operation("sleep", started, app_state.state == "sleeping")
+
+
+async def wake_vllm_async():
+    """Reload a sleeping model's weights onto the GPUs; seconds instead of a cold start."""
+    started = time.monotonic()
+    model_id = app_state.current_model
+    try:
+        await app_state.set_state("starting")
+        await request_vllm_sleep(model_id, wake=True)
+        healthy, _, health_error = await check_vllm_health_details(vllm_base_url(model_id))
+        if not healthy:
+            await app_state.set_state("error", error=f"vLLM woke up but is not healthy: {health_error}")
+            return
+        if port_router:
+            port_router.route_to(instance_port(model_id))
+        await app_state.set_state("running")
+        logger.info(f"{model_id} woke up in {time.monotonic() - started:.1f}s")
+    except RuntimeError as e:
+        await app_state.set_state("error", error=str(e))
+    finally:
+        record_operation("wake", started, app_state.state == "running")
+
+
+def wakes_sleeping_model(operation: "Operation") -> bool:
+    """A start or switch to the model that is asleep only needs a wake-up."""
+    return (
+        app_state.state == "sleeping"
+        and operation.model == app_state.current_model
+        and operation.variant == app_state.current_variant
+    )
+
+
+async def release_previous_instance(model_id: str, sleep: bool):
+    """Free the GPUs held by a model switched away from: sleep it if asked, else stop it."""
+    if sleep:
+        if await check_vllm_sleeping(vllm_base_url(model_id)):
+            return
+        try:
+            await request_vllm_sleep(model_id)
+            logger.info(f"Put previous instance {model_id} to sleep")
+            return
+        except RuntimeError as e:
+            logger.warning(f"{e}; stopping {model_id} instead")
+    await stop_standby_instance(model_id)
+
+
+async def stop_standby_instance(model_id: str):
+    """Stop a non-active instance without touching the manager state."""
+    returncode, _, stderr = await service_controller.stop(vllm_unit(model_id))
+    if returncode != 0:
+        logger.warning(f"Failed to stop standby instance {model_id}: {stderr}")
+
+
+async def ensure_standby_instances():
+    """Start configured `keep_warm` models that are not running yet, as long as they fit."""
+    config = load_config()
+    models = config.get("models", {})
+    for model_id in instances_config().get("keep_warm", []):
+        if model_id == app_state.current_model or model_id not in models:
+            continue
+        props = await service_controller.get_properties(vllm_unit(model_id))
+        if props.get("active_state") in ("active", "activating"):
+            continue
+        if not instance_fits_on_gpus(model_id):
+            logger.info(f"Not enough free GPU memory to keep {model_id} warm")
+            continue
+        logger.info(f"Starting standby instance for {model_id}")
+        env_path = VLLM_ENV_PATH.parent / VLLM_INSTANCE_ENV.format(model=model_id)
+        await asyncio.to_thread(update_vllm_env, launch_script(model_id), env_path, instance_port(model_id))
+        await service_controller.daemon_reload()
+        returncode, _, stderr = await service_controller.start(vllm_unit(model_id))
+        if returncode != 0:
+            logger.warning(f"Failed to start standby instance {model_id}: {stderr}")
+        else:
+            record_instance_variant(model_id, None)
+
+
+async def switch_instance_async(
+    model_id: str,
+    script_path: str,
+    variant: Optional[str] = None,
+    sleep_previous: bool = False,
+):
+    """Multi-instance switch: flip the router to a warm instance, or load the target cold.
+
+    A cold target is started next to the current model when its `gpu_memory_mb` fits,
+    so the old model keeps serving until the new one is healthy. A sleeping target is
+    woken up. With `sleep_previous`, the model switched away from is put to sleep
+    instead of being stopped, so switching back only takes a wake-up.
+    """
+    started = time.monotonic()
+    previous = app_state.current_model
+    await ensure_port_router()
+    props = await service_controller.get_properties(vllm_unit(model_id))
+    warm = False
+    active = props.get("active_state") in ("active", "activating")
+    same_variant = load_state().get("instance_variants", {}).get(model_id) == variant
+    if active and same_variant:
+        warm, _, _ = await check_vllm_health_details(vllm_base_url(model_id))
+        if warm and await check_vllm_sleeping(vllm_base_url(model_id)):
+            logger.info(f"Waking up sleeping instance {model_id}")
+            try:
+                await request_vllm_sleep(model_id, wake=True)
+            except RuntimeError as e:
+                logger.warning(f"{e}; restarting {model_id} instead")
+                warm = same_variant = False
+
+    if warm:
+        logger.info(f"Switching to warm instance {model_id}")
+        if port_router:
+            port_router.route_to(instance_port(model_id))
+        app_state.current_variant = variant
+        await app_state.set_state("running", model=model_id)
+        record_active_model(model_id, variant)
+        prewarm_likely_models()
+    else:
+        if active and not same_variant:
+            logger.info(f"Restarting {model_id} with variant {variant or 'default'}")
+            if model_id == previous and port_router:
+                port_router.route_to(None)
+            await stop_standby_instance(model_id)
+        if previous and previous != model_id and not instance_fits_on_gpus(model_id):
+            if port_router:
+                port_router.route_to(None)
+            await release_previous_instance(previous, sleep_previous)
+        await start_vllm_async(model_id, script_path, variant)
+
+    if previous and previous != model_id and app_state.current_model == model_id and app_state.state == "running":
+        instances = instances_config()
+        if not (instances.get("keep_previous_warm") or previous in instances.get("keep_warm", [])):
+            await release_previous_instance(previous, sleep_previous)
+        await ensure_standby_instances()
+    record_operation("switch", started, app_state.state == "running")
+
+
+class Operation:
+    """A lifecycle command (start/stop/restart/switch/sleep/wake) queued for the operation worker."""
+
+    def __init__(
+        self,
+        kind: str,
+        model: Optional[str] = None,
+        script_path: Optional[str] = None,
+        variant: Optional[str] = None,
+        sleep_previous: bool = False,
+    ):
+        self.id = uuid.uuid4().hex[:12]
+        self.kind = kind
+        self.model = model
+        self.script_path = script_path
+        self.variant = variant
+        self.sleep_previous = sleep_previous
+        self.status = "queued"
+        self.error: Optional[str] = None
+        self.superseded_by: Optional[str] = None
+        self.created_at = utc_now_iso()
+        self.started_at: Optional[str] = None
+        self.finished_at: Optional[str] = None
+
+    @property
+    def done(self) -> bool:
+        return self.status not in ("queued", "running")
+
+    def finish(self, status: str, error: Optional[str] = None):
+        self.status = status
+        self.error = error
+        self.finished_at = utc_now_iso()
+        event_history.record(
+            "operation",
+            self.model,
+            status,
+            operation=self.kind,
+            id=self.id,
+            variant=self.variant,
+            error=error,
+        )
+
+    def to_dict(self) -> dict:
+        return {
+            "id": self.id,
+            "kind": self.kind,
+            "model": self.model,
+            "variant": self.variant,
+            "status": self.status,
+            "error": self.error,
+            "superseded_by": self.superseded_by,
+            "created_at": self.created_at,
+            "started_at": self.started_at,
+            "finished_at": self.finished_at,
+        }
+
+
+class OperationQueue:
+    """Runs lifecycle commands one at a time on a single worker.
+
+    Only the latest not-yet-started command is kept (three queued switches collapse to
+    the last target), a repeat of the running or queued command returns the existing
+    operation, and a stop or a switch elsewhere cancels an in-flight load.
+    """
+
+    def __init__(self):
+        self.current: Optional[Operation] = None
+        self._pending: Optional[Operation] = None
+        self._operations: dict[str, Operation] = {}
+        self._current_task: Optional[asyncio.Task] = None
+        self._wakeup = asyncio.Event()
+
+    def get(self, operation_id: str) -> Optional[Operation]:
+        return self._operations.get(operation_id)
+
+    @property
+    def pending(self) -> Optional[Operation]:
+        return self._pending
+
+    @property
+    def idle(self) -> bool:
+        return self.current is None and self._pending is None
+
+    def recent(self) -> list[Operation]:
+        return list(reversed(self._operations.values()))
+
+    def submit(
+        self,
+        kind: str,
+        model: Optional[str] = None,
+        script_path: Optional[str] = None,
+        variant: Optional[str] = None,
+        sleep_previous: bool = False,
+    ) -> Operation:
+        for existing in (self._pending, self.current):
+            if (
+                existing
+                and not existing.done
+                and existing.kind == kind
+                and existing.model == model
+                and existing.variant == variant
+            ):
+                return existing
+
+        operation = Operation(kind, model, script_path, variant, sleep_previous)
+        if self._pending:
+            self._pending.superseded_by = operation.id
+            self._pending.finish("superseded")
+        self._pending = operation
+
+        current = self.current
+        if (
+            current
+            and current.kind in ("start", "restart", "switch")
+            and current.superseded_by is None
+            and app_state.state == "starting"
+            and (kind == "stop" or (kind == "switch" and (model, variant) != (current.model, current.variant)))
+        ):
+            logger.info(f"Cancelling {current.kind} of {current.model} in favour of {kind} {model or ''}".rstrip())
+            current.superseded_by = operation.id
+            self._current_task.cancel()
+
+        self._remember(operation)
+        self._wakeup.set()
+        return operation
+
+    def cancel(self, operation_id: str) -> Optional[Operation]:
+        operation = self._operations.get(operation_id)
+        if operation is None or operation.done:
+            return operation
+        if operation is self._pending:
+            self._pending = None
+            operation.finish("cancelled")
+        elif operation is self.current and self._current_task:
+            self._current_task.cancel()
+        return operation
+
+    def _remember(self, operation: Operation):
+        self._operations[operation.id] = operation
+        while len(self._operations) > OPERATION_HISTORY_SIZE:
+            self._operations.pop(next(iter(self._operations)))
+
+    async def run(self):
+        while True:
+            await self._wakeup.wait()
+            self._wakeup.clear()
+            while self._pending:
+                operation, self._pending = self._pending, None
+                operation.status = "running"
+                operation.started_at = utc_now_iso()
+                self.current = operation
+                self._current_task = asyncio.create_task(execute_operation(operation))
+                try:
+                    await asyncio.wait({self._current_task})
+                except asyncio.CancelledError:
+                    self._current_task.cancel()
+                    raise
+                if self._current_task.cancelled():
+                    operation.finish("superseded" if operation.superseded_by else "cancelled")
+                elif self._current_task.exception():
+                    operation.finish("failed", str(self._current_task.exception()))
+                elif operation_succeeded(operation):
+                    operation.finish("succeeded")
+                else:
+                    operation.finish("failed", app_state.error_message)
+                self.current = None
+                self._current_task = None
+                if operation.kind == "switch" and operation.status == "succeeded":
+                    start_post_switch_benchmark()
+
+
+def start_post_switch_benchmark():
+    """Run `benchmark.after_switch`; a benchmark that cannot start must not take the queue down with it."""
+    try:
+        if benchmark_config().get("after_switch"):
+            start_benchmark()
+    except HTTPException as e:
+        logger.warning(f"Post-switch benchmark not started: {e.detail}")
+    except Exception as e:
+        logger.error(f"Post-switch benchmark failed to start: {e}")
+
+
+def operation_succeeded(operation: Operation) -> bool:
+    if operation.kind == "stop":
+        return app_state.state == "stopped"
+    if operation.kind == "sleep":
+        return app_state.state == "sleeping"
+    return (
+        app_state.state == "running"
+        and app_state.current_model == operation.model
+        and app_state.current_variant == operation.variant
+    )
+
+
+async def execute_operation(operation: Operation):
+    started = time.monotonic()
+    if benchmark_job and benchmark_job.status == "running":
+        logger.info(f"Cancelling benchmark {benchmark_job.id} for {operation.kind}")
+        benchmark_job.task.cancel()
+    if operation.kind in ("start", "wake") and wakes_sleeping_model(operation):
+        await wake_vllm_async()
+    elif operation.kind == "start":
+        await start_vllm_async(operation.model, operation.script_path, operation.variant)
+    elif operation.kind == "stop":
+        await stop_vllm_async()
+    elif operation.kind == "sleep":
+        await sleep_vllm_async()
+    elif operation.kind == "restart":
+        await stop_vllm_async()
+        if app_state.state == "stopped":
+            await start_vllm_async(operation.model, operation.script_path, operation.variant)
+        record_operation("restart", started, app_state.state == "running")
+    elif operation.kind == "switch":
+        if multi_instance_enabled():
+            await switch_instance_async(
+                operation.model, operation.script_path, operation.variant, operation.sleep_previous
+            )
+            return
+        if wakes_sleeping_model(operation):
+            await wake_vllm_async()
+            record_operation("switch", started, app_state.state == "running")
+            return
+        if app_state.state in ("running", "starting", "sleeping"):
+            await stop_vllm_async()
+        if app_state.state in ("stopped", "error"):
+            await start_vllm_async(operation.model, operation.script_path, operation.variant)
+        record_operation("switch", started, app_state.state == "running")
+
+
+operation_queue = OperationQueue()
 
 
 @app.on_event("startup")
 async def startup_event():
-    """Auto-start vLLM with the last-selected model on backend startup."""
+    """Serve the last known state right away; reconcile and auto-start in the background."""
     logger.info("vLLM Manager starting up...")
+    try:
+        await asyncio.to_thread(event_history.open)
+        background_tasks.append(asyncio.create_task(event_history.flush_loop()))
+    except sqlite3.Error as e:
+        logger.error(f"Event history disabled, cannot open {event_history.path}: {e}")
+        event_history.disable()
+    event_history.record("manager", state="started")
 
     state = load_state()
     app_state.current_model = state.get("last_model")
+    app_state.current_variant = state.get("last_variant")
+    app_state.idle_unloaded_model = state.get("idle_unloaded")
+    app_state.restore(state.get("last_known") or {})
+    app_state.startup_settled.clear()
 
-    diagnostics = await reconcile_runtime_state(update_app_state=True)
-    inferred_state = diagnostics["inferred_state"]
-    if inferred_state in ("running", "starting", "stopping", "error"):
+    background_tasks.append(asyncio.create_task(operation_queue.run()))
+    startup_task = asyncio.create_task(finish_startup(state))
+    startup_task.add_done_callback(lambda _: app_state.startup_settled.set())
+    background_tasks.append(startup_task)
+
+
+async def finish_startup(state: dict):
+    """The slow half of startup: connect to systemd, reconcile, then auto-start the last model."""
+    global service_controller, gpu_sampler
+    started = time.monotonic()
+    # Parse and validate config.yaml now so problems show up in the log at boot
+    config_error = None
+    try:
+        load_config()
+    except HTTPException as e:
+        config_error = e.detail
+        logger.error(f"Config problem at startup: {e.detail}")
+
+    service_controller = await create_service_controller()
+    logger.info(f"Using {service_controller.name} service controller")
+    units = [VLLM_SERVICE]
+    instances = instances_config()
+    if instances:
+        units = [vllm_unit(model_id) for model_id in load_config().get("models", {})]
+        await ensure_port_router()
+    for unit in units:
+        try:
+            await service_controller.subscribe(unit, reconcile_wakeup.set)
+        except Exception as e:
+            logger.warning(f"Failed to subscribe to {unit} property changes: {e}")
+
+    gpu_sampler = create_gpu_sampler()
+    if gpu_sampler:
+        logger.info(f"Sampling GPUs with {gpu_sampler.name} every {GPU_SAMPLE_INTERVAL}s")
+        background_tasks.append(asyncio.create_task(gpu_telemetry_loop(gpu_sampler)))
+
+    # Until one reconciliation succeeds the restored state stays stale, so keep trying
+    delay = STARTUP_RETRY_INTERVAL
+    while True:
+        try:
+            await refresh_snapshot()
+            break
+        except Exception as e:
+            logger.warning(f"Startup reconciliation failed, retrying in {delay}s: {e}")
+        await asyncio.sleep(delay)
+        delay = min(delay * 2, RECONCILE_INTERVAL)
+    background_tasks.append(asyncio.create_task(reconciler_loop()))
+    background_tasks.append(asyncio.create_task(idle_monitor_loop()))
+    background_tasks.append(asyncio.create_task(recovery_loop()))
+    background_tasks.append(asyncio.create_task(schedule_loop()))
+    if app_state.restored_state is not None:
+        # Reconciliation agreed with the restored state; announce it as current
+        await app_state.set_state(app_state.state, error=app_state.error_message, detail=app_state.error_detail)
+    logger.info(f"Startup reconciliation finished in {time.monotonic() - started:.2f}s, state={app_state.state}")
+
+    inferred_state = app_state.last_diagnostics["inferred_state"]
+    if inferred_state in ("running", "starting", "stopping", "sleeping", "error"):
         logger.info(f"Startup reconciliation detected state={inferred_state}")
 
         if inferred_state == "running" and not app_state.current_model:
-            vllm_model = await detect_running_model()
-            if vllm_model:
-                logger.info(f"Detected running vLLM model: {vllm_model}")
-                model_id = await match_vllm_model_to_config(vllm_model)
+            card = await detect_running_model()
+            if card:
+                logger.info(f"Detected running vLLM model: {card.get('id')} ({card.get('root')})")
+                model_id = await match_running_model(card)
                 if model_id:
                     app_state.current_model = model_id
-                    save_state({"last_model": model_id})
+                    update_state(last_model=model_id)
                 else:
-                    app_state.current_model = vllm_model.split("/")[-1]
+                    app_state.current_model = str(card.get("id")).split("/")[-1]
+        return
+
+    if config_error:
+        logger.error("Not auto-starting without a usable config.yaml")
         return
 
     # Load last model and auto-start
@@ -531,69 +3531,299 @@ async def startup_event():
         logger.error(f"Last model '{model_id}' not in config, staying stopped")
         return
 
-    script_path = models[model_id]["script"]
-    asyncio.create_task(start_vllm_async(model_id, script_path))
+    idle = idle_config()
+    if app_state.idle_unloaded_model and idle["enabled"] and idle["auto_load"]:
+        logger.info(f"{model_id} was unloaded for being idle, loading it on the first request instead")
+        return
 
+    variant = state.get("last_variant") if model_id == state.get("last_model") else None
+    try:
+        script_path = launch_script(model_id, variant)
+    except HTTPException as e:
+        logger.error(f"Cannot auto-start {model_id}: {e.detail}")
+        return
+    operation_queue.submit("start", model_id, script_path, variant)
 
-@app.get("/status")
-async def get_status():
-    diagnostics = await reconcile_runtime_state(update_app_state=True)
-    gpu = get_gpu_stats()
+
+@app.on_event("shutdown")
+async def shutdown_event():
+    for task in background_tasks:
+        task.cancel()
+    await asyncio.gather(*background_tasks, return_exceptions=True)
+    background_tasks.clear()
+    for job in prewarm_jobs.values():
+        job.cancel()
+    await close_http_client()
+    await service_controller.close()
+    await warmup_recorder.flush()
+    await app_state.wait_persisted()
+    if port_router:
+        await port_router.close()
+    if gpu_sampler:
+        gpu_sampler.close()
+    event_history.record("manager", state="stopped")
+    await asyncio.to_thread(event_history.close)
+
+
+def build_status_response() -> dict:
+    age = app_state.snapshot_age()
+    gpu = app_state.last_gpu_stats
     response = {
         "state": app_state.state,
         "model": app_state.current_model,
+        "variant": app_state.current_variant,
         "last_state_change_at": app_state.last_state_change_at,
-        "checks": diagnostics,
+        "snapshot_age_s": None if age is None else round(age, 3),
+        "checks": app_state.last_diagnostics,
     }
+    if app_state.restored_state is not None:
+        # Last known state from before the manager restarted, not yet checked against systemd
+        response["stale"] = True
     if app_state.error_message:
         response["error"] = app_state.error_message
+    if app_state.error_detail:
+        response["error_detail"] = app_state.error_detail
+    if config_store.error:
+        response["config_error"] = config_store.error
+    progress = app_state.load_progress()
+    if progress:
+        response["progress"] = progress
+    if proxy_stats.queued or proxy_stats.in_flight:
+        response["proxy"] = proxy_stats.to_dict()
+    idle = idle_config()
+    if idle["enabled"]:
+        idle_s = idle_seconds() if app_state.state == "running" else None
+        response["idle"] = {
+            "idle_s": round(idle_s, 1) if idle_s is not None else None,
+            "timeout_s": idle["timeout"],
+            "unloaded_model": app_state.idle_unloaded_model,
+        }
+    if app_state.last_warmup:
+        response["warmup"] = app_state.last_warmup
     if gpu:
         response["gpu"] = gpu
     return response
 
 
+@app.get("/status")
+async def get_status(fresh: bool = False, max_age: float = STATUS_MAX_AGE):
+    age = app_state.snapshot_age()
+    # Before the startup reconciliation finishes there is no snapshot; answer with the restored state
+    if fresh or (age is not None and age > max_age):
+        await refresh_snapshot()
+    return build_status_response()
+
+
+@app.get("/events")
+async def stream_events(request: Request):
+    """Server-Sent Events stream of state transitions, check changes and GPU samples."""
+
+    async def event_stream():
+        queue = event_broker.subscribe()
+        try:
+            yield format_sse("status", build_status_response())
+            while not await request.is_disconnected():
+                try:
+                    message = await asyncio.wait_for(queue.get(), EVENT_HEARTBEAT_INTERVAL)
+                except asyncio.TimeoutError:
+                    yield ": keep-alive\n\n"
+                    continue
+                yield message
+        finally:
+            event_broker.unsubscribe(queue)
+
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+async def fetch_vllm_metrics() -> str:
+    """vLLM's own /metrics text, cached so scrapes hit vLLM at most once per METRICS_PROXY_TTL."""
+    global _vllm_metrics_cache
+    async with _vllm_metrics_lock:
+        fetched_at, text = _vllm_metrics_cache
+        if fetched_at is not None and time.monotonic() - fetched_at < METRICS_PROXY_TTL:
+            return text
+        try:
+            metrics_url = f"{vllm_base_url(app_state.current_model)}/metrics"
+            response = await get_http_client().get(metrics_url, timeout=HEALTH_REQUEST_TIMEOUT)
+            text = response.text if response.status_code == 200 else ""
+        except httpx.HTTPError:
+            text = ""
+        _vllm_metrics_cache = (time.monotonic(), text)
+        return text
+
+
+def render_manager_metrics() -> str:
+    MANAGER_STATE.clear()
+    for state in sorted(set(KNOWN_STATES) | {app_state.state}):
+        MANAGER_STATE.set(1 if state == app_state.state else 0, state=state)
+    MODEL_INFO.clear()
+    if app_state.current_model:
+        MODEL_INFO.set(1, model=app_state.current_model)
+    EVENT_SUBSCRIBERS.set(event_broker.subscriber_count)
+    PROXY_IN_FLIGHT.set(proxy_stats.in_flight)
+    PROXY_QUEUED.set(proxy_stats.queued)
+    for gauge in GPU_GAUGES.values():
+        gauge.clear()
+    for gpu in gpu_history.latest:
+        for metric, gauge in GPU_GAUGES.items():
+            if gpu.get(metric) is not None:
+                gauge.set(gpu[metric], gpu=gpu["index"])
+
+    lines = []
+    for metric in (
+        MANAGER_STATE,
+        MODEL_INFO,
+        STATE_TRANSITIONS,
+        RECONCILES,
+        OPERATION_DURATION,
+        MODEL_LOAD_DURATION,
+        MODEL_WARMUP_DURATION,
+        HEALTH_PROBE_DURATION,
+        SUBPROCESS_DURATION,
+        PREWARM_BYTES,
+        PROXY_REQUESTS,
+        PROXY_QUEUE_WAIT,
+        PROXY_IN_FLIGHT,
+        PROXY_QUEUED,
+        EVENT_SUBSCRIBERS,
+        *GPU_GAUGES.values(),
+    ):
+        lines.extend(metric.render())
+    return "\n".join(lines) + "\n"
+
+
+@app.get("/metrics", response_class=PlainTextResponse)
+async def get_metrics(vllm: bool = METRICS_PROXY_VLLM):
+    """Prometheus exposition of manager metrics, followed by vLLM's own metrics when available."""
+    body = render_manager_metrics()
+    if vllm and app_state.state == "running":
+        body += await fetch_vllm_metrics()
+    return PlainTextResponse(body, media_type="text/plain; version=0.0.4")
+
+
+@app.get("/gpu/history")
+async def get_gpu_history(since: Optional[float] = None, step: float = 0):
+    """Per-GPU samples since a unix timestamp (default: last 5 minutes), bucketed by `step` seconds."""
+    if since is None:
+        since = time.time() - 300
+    return gpu_history.query(since=since, step=max(0.0, step))
+
+
 @app.get("/service/status")
 async def get_service_status(lines: int = SERVICE_LOG_DEFAULT_LINES):
     diagnostics = await reconcile_runtime_state(update_app_state=False)
-    service_output = get_service_output(lines=lines)
+    service_output = await asyncio.to_thread(get_service_output, lines)
     service_output["checks"] = diagnostics
     return service_output
 
 
+@app.get("/service/logs/stream")
+async def stream_service_logs(
+    request: Request,
+    cursor: Optional[str] = None,
+    lines: int = SERVICE_LOG_DEFAULT_LINES,
+    follow: bool = True,
+):
+    """Server-Sent Events stream of vllm.service journal lines.
+
+    Every event id is the journal cursor of its line, so clients resume with `?cursor=`
+    (or the standard Last-Event-ID header) and only receive lines written since.
+    """
+    cursor = cursor or request.headers.get("last-event-id")
+    safe_lines = max(1, min(lines, SERVICE_LOG_MAX_LINES))
+
+    async def log_stream():
+        entries = follow_journal(cursor=cursor, lines=safe_lines, follow=follow)
+        try:
+            async for entry in entries:
+                yield format_sse("log", entry, event_id=entry["cursor"])
+        finally:
+            await entries.aclose()
+
+    return StreamingResponse(
+        log_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
 @app.get("/models")
 async def get_models():
     config = load_config()
     models = config.get("models", {})
+    load_history = load_state().get("load_history", {})
     return {
         "models": [
             {
                 "id": model_id,
-                "script": model_config["script"],
+                "script": model_config.get("script"),
+                "command": render_launch_command(launch_profile(model_config)) if model_config.get("model") else None,
+                "variants": list(model_config.get("variants") or {}),
                 "active": model_id == app_state.current_model,
+                "active_variant": app_state.current_variant if model_id == app_state.current_model else None,
+                "expected_load_s": expected_load_duration(model_id, load_history),
             }
             for model_id, model_config in models.items()
         ]
     }
 
 
+@app.get("/models/{model_id}/preflight")
+async def get_model_preflight(model_id: str, variant: Optional[str] = None):
+    """Estimated per-GPU memory for a model against current free GPU memory."""
+    models = load_config().get("models", {})
+    if model_id not in models:
+        raise HTTPException(status_code=404, detail=f"Model '{model_id}' not found in config")
+    if variant and variant not in (models[model_id].get("variants") or {}):
+        raise HTTPException(status_code=404, detail=f"Model '{model_id}' has no variant '{variant}'")
+    replacing_current = not multi_instance_enabled() and app_state.state in ("running", "starting", "sleeping")
+    return await asyncio.to_thread(preflight_check, model_id, variant, None, replacing_current)
+
+
+@app.post("/models/{model_id}/prewarm")
+async def prewarm_model(model_id: str, variant: Optional[str] = None):
+    """Read a model's weights into the page cache ahead of a switch."""
+    if model_id not in load_config().get("models", {}):
+        raise HTTPException(status_code=404, detail=f"Model '{model_id}' not found in config")
+    return start_prewarm(model_id, variant).to_dict()
+
+
+@app.get("/models/{model_id}/prewarm")
+async def get_prewarm_status(model_id: str):
+    job = prewarm_jobs.get(model_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"Model '{model_id}' has not been pre-warmed")
+    return job.to_dict()
+
+
 @app.post("/stop")
 async def stop_service():
     if app_state.state in ("stopped", "stopping"):
         return {"status": app_state.state, "previous_model": app_state.current_model}
 
     previous_model = app_state.current_model
-    asyncio.create_task(stop_vllm_async())
+    operation = operation_queue.submit("stop")
+    if app_state.idle_unloaded_model:
+        app_state.idle_unloaded_model = None
+        update_state(idle_unloaded=None)
 
-    return {"status": "stopping", "previous_model": previous_model}
+    return {"status": "stopping", "previous_model": previous_model, "operation_id": operation.id}
 
 
 @app.post("/start")
 async def start_service():
     if app_state.state in ("running", "starting"):
         return {"status": app_state.state, "model": app_state.current_model}
+    if app_state.state == "sleeping":
+        return await wake_service()
 
     state = load_state()
     model_id = state.get("last_model")
+    variant = state.get("last_variant")
 
     if not model_id:
         config = load_config()
@@ -601,16 +3831,26 @@ async def start_service():
         if not models:
             raise HTTPException(status_code=400, detail="No models configured")
         model_id = next(iter(models.keys()))
+        variant = None
 
     config = load_config()
     models = config.get("models", {})
     if model_id not in models:
         raise HTTPException(status_code=400, detail=f"Model '{model_id}' not found in config")
+    if variant not in (models[model_id].get("variants") or {}):
+        variant = None
 
-    script_path = models[model_id]["script"]
-    asyncio.create_task(start_vllm_async(model_id, script_path))
+    script_path = launch_script(model_id, variant)
+    preflight = await run_preflight(model_id, variant)
+    operation = operation_queue.submit("start", model_id, script_path, variant)
 
-    return {"status": "starting", "model": model_id}
+    return {
+        "status": "starting",
+        "model": model_id,
+        "variant": variant,
+        "operation_id": operation.id,
+        "preflight": preflight,
+    }
 
 
 @app.post("/restart")
@@ -619,9 +3859,11 @@ async def restart_service():
         return {"status": "starting", "model": app_state.current_model}
 
     model_id = app_state.current_model
+    variant = app_state.current_variant
     if not model_id:
         state = load_state()
         model_id = state.get("last_model")
+        variant = state.get("last_variant")
 
     if not model_id:
         raise HTTPException(status_code=400, detail="No model to restart")
@@ -631,18 +3873,12 @@ async def restart_service():
     if model_id not in models:
         raise HTTPException(status_code=400, detail=f"Model '{model_id}' not found in config")
 
-    script_path = models[model_id]["script"]
+    if variant not in (models[model_id].get("variants") or {}):
+        variant = None
 
-    async def restart_async():
-        await stop_vllm_async()
-        # Wait for stop to complete
-        while app_state.state == "stopping":
-            await asyncio.sleep(0.5)
-        if app_state.state == "stopped":
-            await start_vllm_async(model_id, script_path)
-
-    asyncio.create_task(restart_async())
-    return {"status": "restarting", "model": model_id}
+    script_path = launch_script(model_id, variant)
+    operation = operation_queue.submit("restart", model_id, script_path, variant)
+    return {"status": "restarting", "model": model_id, "variant": variant, "operation_id": operation.id}
 
 
 @app.post("/switch")
@@ -653,33 +3889,1008 @@ async def switch_model(request: SwitchRequest):
     if request.model not in models:
         raise HTTPException(status_code=404, detail=f"Model '{request.model}' not found in config")
 
-    script_path = models[request.model]["script"]
+    script_path = launch_script(request.model, request.variant)
 
     # Validate model files before switching
     valid, error = validate_model_files(script_path)
     if not valid:
         raise HTTPException(status_code=400, detail=f"Model validation failed: {error}")
 
-    previous_model = app_state.current_model
+    sleep_previous = request.sleep_previous
+    if sleep_previous is None:
+        sleep_previous = sleep_config()["switch"] and multi_instance_enabled()
+    elif sleep_previous and not multi_instance_enabled():
+        raise HTTPException(status_code=400, detail="sleep_previous needs instances.enabled, one vLLM per model")
 
-    if app_state.state in ("running", "starting"):
-        # Need to stop first, then start with new model
-        async def switch_async():
-            await stop_vllm_async()
-            while app_state.state == "stopping":
-                await asyncio.sleep(0.5)
-            if app_state.state in ("stopped", "error"):
-                await start_vllm_async(request.model, script_path)
+    preflight = None
+    if not instance_is_loaded(request.model):
+        replacing_current = not multi_instance_enabled() and app_state.state in ("running", "starting", "sleeping")
+        preflight = await run_preflight(request.model, request.variant, replacing_current)
 
-        asyncio.create_task(switch_async())
-    else:
-        # Can start directly
-        asyncio.create_task(start_vllm_async(request.model, script_path))
+    previous_model = app_state.current_model
+    operation = operation_queue.submit("switch", request.model, script_path, request.variant, sleep_previous)
 
     return {
         "status": "switching",
         "previous_model": previous_model,
         "new_model": request.model,
+        "variant": request.variant,
+        "sleep_previous": sleep_previous,
+        "operation_id": operation.id,
+        "preflight": preflight,
+    }
+
+
+@app.post("/sleep")
+async def sleep_service():
+    """Offload the running model to CPU RAM, freeing the GPUs but keeping the process for a fast /wake."""
+    if app_state.state == "sleeping":
+        return {"status": "sleeping", "model": app_state.current_model}
+    if app_state.state != "running":
+        raise HTTPException(status_code=409, detail=f"Only a running model can sleep (state={app_state.state})")
+    operation = operation_queue.submit("sleep", app_state.current_model, None, app_state.current_variant)
+    return {"status": "sleeping", "model": app_state.current_model, "operation_id": operation.id}
+
+
+@app.post("/wake")
+async def wake_service():
+    """Bring a sleeping model back onto the GPUs."""
+    if app_state.state in ("running", "starting"):
+        return {"status": app_state.state, "model": app_state.current_model}
+    if app_state.state != "sleeping":
+        raise HTTPException(status_code=409, detail=f"No model is sleeping (state={app_state.state})")
+    operation = operation_queue.submit("wake", app_state.current_model, None, app_state.current_variant)
+    return {"status": "waking", "model": app_state.current_model, "operation_id": operation.id}
+
+
+def benchmark_config() -> dict:
+    try:
+        return dict(load_config().get("benchmark") or {})
+    except HTTPException:
+        return {}
+
+
+class BenchmarkJob:
+    """A benchmark sweep running against the active model."""
+
+    def __init__(self, model: str, variant: Optional[str], settings: dict):
+        self.id = uuid.uuid4().hex[:12]
+        self.model = model
+        self.variant = variant
+        self.settings = settings
+        self.status = "running"
+        self.error: Optional[str] = None
+        self.levels: list[dict] = []
+        self.task: Optional[asyncio.Task] = None
+        self.created_at = utc_now_iso()
+        self.finished_at: Optional[str] = None
+
+    def to_dict(self) -> dict:
+        return {
+            "id": self.id,
+            "model": self.model,
+            "variant": self.variant,
+            "status": self.status,
+            "error": self.error,
+            "settings": self.settings,
+            "levels": self.levels,
+            "created_at": self.created_at,
+            "finished_at": self.finished_at,
+        }
+
+    async def run(self, base_url: str):
+        try:
+            result = await benchmark.run_benchmark(base_url, self.settings, progress=self.levels.append)
+            launch = model_launch_settings(self.model, self.variant)
+            result.update(
+                id=self.id,
+                model=self.model,
+                variant=self.variant,
+                launch_args=launch["args"] if launch else None,
+            )
+            await asyncio.to_thread(benchmark_results.append, result)
+            self.status = "completed"
+        except asyncio.CancelledError:
+            self.status = "cancelled"
+            raise
+        except Exception as e:
+            self.status = "failed"
+            self.error = str(e)
+            logger.warning(f"Benchmark {self.id} failed: {e}")
+        finally:
+            self.finished_at = utc_now_iso()
+            event_broker.publish("benchmark", self.to_dict())
+
+
+benchmark_results = benchmark.ResultsStore()
+benchmark_job: Optional[BenchmarkJob] = None
+
+
+def start_benchmark(overrides: Optional[dict] = None) -> BenchmarkJob:
+    global benchmark_job
+    if app_state.state != "running" or not app_state.current_model:
+        raise HTTPException(status_code=409, detail=f"No model is running (state={app_state.state})")
+    if benchmark_job and benchmark_job.status == "running":
+        raise HTTPException(status_code=409, detail=f"Benchmark {benchmark_job.id} is already running")
+    defaults = {key: value for key, value in benchmark_config().items() if key != "after_switch"}
+    try:
+        settings = benchmark.benchmark_settings({**defaults, **(overrides or {})})
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    benchmark_job = BenchmarkJob(app_state.current_model, app_state.current_variant, settings)
+    benchmark_job.task = asyncio.create_task(benchmark_job.run(vllm_base_url(app_state.current_model)))
+    logger.info(f"Started benchmark {benchmark_job.id} against {app_state.current_model}")
+    return benchmark_job
+
+
+@app.post("/benchmark")
+async def create_benchmark(request: Optional[BenchmarkRequest] = None):
+    overrides = {}
+    if request:
+        overrides = {key: getattr(request, key) for key in benchmark.DEFAULTS if getattr(request, key, None) is not None}
+    return start_benchmark(overrides).to_dict()
+
+
+@app.get("/benchmark")
+async def get_benchmark():
+    if benchmark_job is None:
+        raise HTTPException(status_code=404, detail="No benchmark has been run")
+    return benchmark_job.to_dict()
+
+
+@app.get("/benchmark/results")
+async def get_benchmark_results(model: Optional[str] = None, variant: Optional[str] = None, limit: int = 20):
+    results = await asyncio.to_thread(benchmark_results.query, model, variant, limit)
+    return {"results": results}
+
+
+@app.get("/history")
+async def get_history(
+    model: Optional[str] = None,
+    kind: Optional[str] = None,
+    since: Optional[float] = None,
+    until: Optional[float] = None,
+    limit: int = 200,
+):
+    """Recorded events, newest first. `since`/`until` are unix timestamps (default: last 24h)."""
+    until = until if until is not None else time.time()
+    since = since if since is not None else until - 86400
+    limit = max(1, min(limit, HISTORY_QUERY_LIMIT))
+    events = await asyncio.to_thread(event_history.query, since, until, model, kind, limit)
+    return {"since": since, "until": until, "events": events}
+
+
+@app.get("/history/availability")
+async def get_availability(since: Optional[float] = None, until: Optional[float] = None):
+    """Per-model uptime, availability, starts, failures and load times over a window (default: last 24h)."""
+    until = until if until is not None else time.time()
+    since = since if since is not None else until - 86400
+    models = await asyncio.to_thread(event_history.availability, since, until)
+    return {"since": since, "until": until, "models": models}
+
+
+@app.get("/operations")
+async def list_operations():
+    return {"operations": [operation.to_dict() for operation in operation_queue.recent()]}
+
+
+@app.get("/operations/{operation_id}")
+async def get_operation(operation_id: str):
+    operation = operation_queue.get(operation_id)
+    if operation is None:
+        raise HTTPException(status_code=404, detail=f"Operation '{operation_id}' not found")
+    return operation.to_dict()
+
+
+@app.delete("/operations/{operation_id}")
+async def cancel_operation(operation_id: str):
+    operation = operation_queue.cancel(operation_id)
+    if operation is None:
+        raise HTTPException(status_code=404, detail=f"Operation '{operation_id}' not found")
+    return operation.to_dict()
+
+
+class ProxyStats:
+    def __init__(self):
+        self.queued = 0
+        self.in_flight = 0
+        self.last_request_monotonic: Optional[float] = None
+
+    def to_dict(self) -> dict:
+        return {"queued": self.queued, "in_flight": self.in_flight}
+
+
+proxy_stats = ProxyStats()
+
+
+def proxy_config() -> dict:
+    settings = dict(PROXY_DEFAULTS)
+    try:
+        settings.update(load_config().get("proxy") or {})
+    except HTTPException:
+        pass
+    return settings
+
+
+def resolve_proxy_target(requested_model: Optional[str]) -> Optional[str]:
+    """Pick the config model that should serve a request naming `requested_model`.
+
+    In multi-instance mode a request for a healthy, awake standby goes straight to it; anything
+    else is served by the active model.
+    """
+    if not isinstance(requested_model, str) or not requested_model or not multi_instance_enabled():
+        return app_state.current_model
+    models = load_config().get("models", {})
+    model_id = requested_model if requested_model in models else model_path_index().get(model_path_key(requested_model))
+    if model_id and model_id != app_state.current_model:
+        for instance in (app_state.last_diagnostics or {}).get("instances", []):
+            if instance["model"] == model_id and instance["healthy"] and not instance.get("sleeping"):
+                return model_id
+    return app_state.current_model
+
+
+def require_model_coming_up(requested_model: Optional[str] = None):
+    """Load an idle-unloaded model on demand, or refuse when nothing is being brought up."""
+    load_on_demand(requested_model)
+    if app_state.state not in ("starting", "stopping") and operation_queue.idle:
+        PROXY_REQUESTS.inc(outcome="unavailable")
+        raise HTTPException(status_code=503, detail=f"No model is being served (state={app_state.state})")
+
+
+async def wait_for_model_ready(settings: dict, requested_model: Optional[str] = None):
+    """Hold a proxied request while a lifecycle operation brings a model up.
+
+    Right after the manager restarts, the state restored from state.json is not trusted
+    yet, so requests are held until startup has reconciled it and auto-started a model.
+    """
+    if app_state.ready_event.is_set():
+        return
+    settling = not app_state.startup_settled.is_set()
+    if not settling:
+        require_model_coming_up(requested_model)
+    if proxy_stats.queued >= settings["queue_size"]:
+        PROXY_REQUESTS.inc(outcome="queue_full")
+        raise HTTPException(status_code=503, detail="Proxy queue is full")
+
+    proxy_stats.queued += 1
+    started = time.monotonic()
+    try:
+        if settling:
+            await asyncio.wait_for(app_state.startup_settled.wait(), settings["queue_timeout"])
+            if not app_state.ready_event.is_set():
+                require_model_coming_up(requested_model)
+        remaining = settings["queue_timeout"] - (time.monotonic() - started)
+        await asyncio.wait_for(app_state.ready_event.wait(), max(remaining, 0))
+    except asyncio.TimeoutError:
+        PROXY_REQUESTS.inc(outcome="queue_timeout")
+        raise HTTPException(status_code=503, detail="Timed out waiting for the model to become ready")
+    finally:
+        proxy_stats.queued -= 1
+        PROXY_QUEUE_WAIT.observe(time.monotonic() - started)
+
+
+def _finish_proxied_request():
+    proxy_stats.in_flight -= 1
+    proxy_stats.last_request_monotonic = time.monotonic()
+
+
+async def relay_upstream(upstream: httpx.Response):
+    """Stream a vLLM response body; the request stops counting as in flight however the stream ends."""
+    try:
+        async for chunk in upstream.aiter_raw():
+            yield chunk
+    finally:
+        _finish_proxied_request()
+        await upstream.aclose()
+
+
+@app.api_route("/v1/{path:path}", methods=["GET", "POST", "PUT", "PATCH", "DELETE"])
+async def proxy_openai(path: str, request: Request):
+    """OpenAI-compatible pass-through to vLLM that holds requests while a model is starting."""
+    settings = proxy_config()
+    if not settings["enabled"]:
+        raise HTTPException(status_code=404, detail="Proxy is disabled")
+
+    body = await request.body()
+    requested_model = None
+    payload = None
+    if body and request.headers.get("content-type", "").startswith("application/json"):
+        try:
+            payload = json.loads(body)
+            if isinstance(payload, dict):
+                requested_model = payload.get("model")
+        except ValueError:
+            pass
+
+    proxy_stats.last_request_monotonic = time.monotonic()
+    target = resolve_proxy_target(requested_model)
+    if target == app_state.current_model:
+        await wait_for_model_ready(settings, requested_model)
+        target = app_state.current_model
+
+    if path == "chat/completions" and isinstance(payload, dict):
+        warmup_recorder.observe(target, payload.get("messages"))
+
+    url = f"{vllm_base_url(target)}/v1/{path}"
+    if request.url.query:
+        url += f"?{request.url.query}"
+    headers = [(key, value) for key, value in request.headers.items() if key.lower() not in PROXY_HOP_HEADERS]
+
+    client = get_proxy_client()
+    upstream_request = client.build_request(request.method, url, headers=headers, content=body)
+    proxy_stats.in_flight += 1
+    try:
+        upstream = await client.send(upstream_request, stream=True)
+    except BaseException as e:
+        _finish_proxied_request()
+        if isinstance(e, httpx.HTTPError):
+            PROXY_REQUESTS.inc(outcome="backend_error")
+            raise HTTPException(status_code=502, detail=f"vLLM backend unreachable: {e}")
+        raise
+
+    PROXY_REQUESTS.inc(outcome=str(upstream.status_code))
+    response_headers = {
+        key: value for key, value in upstream.headers.items() if key.lower() not in PROXY_HOP_HEADERS
+    }
+    return StreamingResponse(
+        relay_upstream(upstream),
+        status_code=upstream.status_code,
+        headers=response_headers,
+    )
+
+
+def idle_config() -> dict:
+    settings = dict(IDLE_DEFAULTS)
+    try:
+        settings.update(load_config().get("idle") or {})
+    except HTTPException:
+        pass
+    return settings
+
+
+def parse_vllm_activity(metrics_text: str) -> tuple[bool, Optional[float]]:
+    """(requests running or waiting, completed request count) from vLLM's /metrics text."""
+    busy = False
+    completed = None
+    for line in metrics_text.splitlines():
+        if line.startswith("#"):
+            continue
+        name = line.split("{", 1)[0].split(" ", 1)[0]
+        if name not in VLLM_BUSY_METRICS and name != VLLM_COMPLETED_METRIC:
+            continue
+        try:
+            value = float(line.rsplit(" ", 1)[1])
+        except (IndexError, ValueError):
+            continue
+        if name == VLLM_COMPLETED_METRIC:
+            completed = (completed or 0.0) + value
+        elif value > 0:
+            busy = True
+    return busy, completed
+
+
+def idle_seconds() -> Optional[float]:
+    last = max(app_state.last_activity_monotonic or 0.0, proxy_stats.last_request_monotonic or 0.0)
+    if not last:
+        return None
+    return time.monotonic() - last
+
+
+def load_on_demand(requested_model: Optional[str] = None) -> Optional[Operation]:
+    """Start the model the idle policy unloaded, now that a request wants it.
+
+    A request naming another configured model loads that one instead.
+    """
+    settings = idle_config()
+    model_id = app_state.idle_unloaded_model
+    if not (settings["enabled"] and settings["auto_load"] and model_id):
+        return None
+    if app_state.state not in ("stopped", "stopping", "sleeping") or operation_queue.pending:
+        return None
+    models = load_config().get("models", {})
+    variant = app_state.current_variant
+    if requested_model in models and requested_model != model_id:
+        model_id, variant = requested_model, None
+    if model_id not in models:
+        return None
+    logger.info(f"Loading {model_id} on demand for an incoming request")
+    if app_state.state == "sleeping" and model_id == app_state.current_model:
+        return operation_queue.submit("wake", model_id, None, variant)
+    if app_state.state == "sleeping":
+        return operation_queue.submit("switch", model_id, launch_script(model_id, variant), variant)
+    return operation_queue.submit("start", model_id, launch_script(model_id, variant), variant)
+
+
+async def idle_monitor_loop():
+    """Stop the active model once it has served nothing for `idle.timeout` seconds.
+
+    Activity is a proxied request or a change in vLLM's own request counters, so
+    clients that talk to vLLM directly keep the model loaded too.
+    """
+    completed = None
+    while True:
+        await asyncio.sleep(IDLE_CHECK_INTERVAL)
+        try:
+            settings = idle_config()
+            if not settings["enabled"] or app_state.state != "running" or not operation_queue.idle:
+                continue
+            busy, total = parse_vllm_activity(await fetch_vllm_metrics())
+            if busy or total != completed or proxy_stats.in_flight or proxy_stats.queued:
+                completed = total
+                app_state.last_activity_monotonic = time.monotonic()
+                continue
+            idle_s = idle_seconds()
+            if idle_s is None or idle_s < settings["timeout"]:
+                continue
+            model_id = app_state.current_model
+            app_state.idle_unloaded_model = model_id
+            update_state(idle_unloaded=model_id)
+            if sleep_config()["idle"]:
+                logger.info(f"{model_id} idle for {idle_s:.0f}s, putting it to sleep")
+                operation_queue.submit("sleep", model_id, None, app_state.current_variant)
+            else:
+                logger.info(f"{model_id} idle for {idle_s:.0f}s, unloading")
+                operation_queue.submit("stop")
+        except Exception as e:
+            logger.warning(f"Idle check failed: {e}")
+
+
+def recovery_config() -> dict:
+    settings = dict(RECOVERY_DEFAULTS)
+    try:
+        settings.update(load_config().get("recovery") or {})
+    except HTTPException:
+        pass
+    return settings
+
+
+async def failure_cause(model_id: str) -> str:
+    """Best explanation for the current error: the load's journal code, the journal's last fatal line, or systemd."""
+    if app_state.error_detail and app_state.error_detail.get("code") not in (None, "service_failed"):
+        return app_state.error_detail["code"]
+    cause = None
+    try:
+        async for entry in follow_journal(vllm_unit(model_id), lines=RECOVERY_JOURNAL_LINES, follow=False):
+            fatal = match_fatal_log(entry["message"] or "")
+            if fatal:
+                cause = fatal[0]
+    except OSError as e:
+        logger.warning(f"Could not read the journal for {model_id}: {e}")
+    if cause:
+        return cause
+    if app_state.last_systemd_result not in (None, "unknown", "success"):
+        return app_state.last_systemd_result
+    if app_state.last_systemd_active_state == "active":
+        return "unhealthy"
+    return "unknown"
+
+
+class RecoveryPolicy:
+    """Restarts a failed model with exponential backoff, then switches to its fallback.
+
+    Each model may be restarted `max_restarts` times within `window` seconds. Causes a
+    restart cannot fix (missing weights, out of memory) skip straight to the fallback,
+    which is the model's own `fallback` or `recovery.fallback_model`.
+    """
+
+    def __init__(self):
+        self.restarts: dict[str, list[float]] = {}
+
+    def recent_restarts(self, model_id: str, window: float) -> list[float]:
+        now = time.monotonic()
+        self.restarts[model_id] = [t for t in self.restarts.get(model_id, []) if now - t < window]
+        return self.restarts[model_id]
+
+    def fallback_for(self, model_id: str, settings: dict) -> Optional[str]:
+        models = load_config().get("models", {})
+        fallback = models.get(model_id, {}).get("fallback") or settings["fallback_model"]
+        if not fallback or fallback == model_id or fallback not in models:
+            return None
+        # Don't bounce back to a model that just used up its own budget
+        if len(self.recent_restarts(fallback, settings["window"])) >= settings["max_restarts"]:
+            return None
+        return fallback
+
+    async def handle_failure(self, settings: dict):
+        model_id = app_state.current_model
+        variant = app_state.current_variant
+        failed_at = app_state.last_state_change_at
+        cause = await failure_cause(model_id)
+        attempts = self.recent_restarts(model_id, settings["window"])
+
+        if cause not in RECOVERY_NO_RETRY_CAUSES and len(attempts) < settings["max_restarts"]:
+            delay = min(
+                settings["max_backoff"],
+                settings["initial_backoff"] * settings["backoff_factor"] ** len(attempts),
+            )
+            logger.warning(
+                f"{model_id} failed ({cause}); restart {len(attempts) + 1}/{settings['max_restarts']} in {delay:.0f}s"
+            )
+            event_history.record(
+                "recovery", model_id, "restart", cause=cause, attempt=len(attempts) + 1, delay_s=delay
+            )
+            await asyncio.sleep(delay)
+            if app_state.last_state_change_at != failed_at or not operation_queue.idle:
+                logger.info(f"Recovery of {model_id} skipped, state changed while backing off")
+                return
+            attempts.append(time.monotonic())
+            operation_queue.submit("restart", model_id, launch_script(model_id, variant), variant)
+            return
+
+        fallback = self.fallback_for(model_id, settings)
+        if fallback is None:
+            logger.error(f"{model_id} failed ({cause}) and has no usable fallback; leaving it in error")
+            event_history.record("recovery", model_id, "gave_up", cause=cause, restarts=len(attempts))
+            return
+        logger.warning(f"{model_id} failed ({cause}) after {len(attempts)} restarts; falling back to {fallback}")
+        event_history.record("recovery", model_id, "fallback", cause=cause, restarts=len(attempts), fallback=fallback)
+        operation_queue.submit("switch", fallback, launch_script(fallback))
+
+
+recovery_policy = RecoveryPolicy()
+
+
+async def recovery_loop():
+    """Watch for a model that has failed on its own and hand it to the recovery policy."""
+    handled_failure = None
+    while True:
+        await asyncio.sleep(RECOVERY_CHECK_INTERVAL)
+        try:
+            settings = recovery_config()
+            if not settings["enabled"] or app_state.state != "error" or not app_state.current_model:
+                continue
+            if not operation_queue.idle or app_state.last_state_change_at == handled_failure:
+                continue
+            if app_state.last_systemd_active_state in ("activating", "deactivating"):
+                continue
+            handled_failure = app_state.last_state_change_at
+            await recovery_policy.handle_failure(settings)
+        except Exception as e:
+            logger.warning(f"Recovery check failed: {e}")
+
+
+def fleet_config() -> dict:
+    settings = dict(FLEET_DEFAULTS)
+    settings.update(load_config().get("fleet") or {})
+    settings["hosts"] = [
+        {"name": host["name"], "url": host["url"].rstrip("/"), "kind": host.get("kind", "manager")}
+        for host in settings["hosts"] or []
+    ]
+    return settings
+
+
+async def fleet_request(host: dict, method: str, path: str, timeout: float, **kwargs):
+    """One call to a fleet host, bounded by `timeout` end to end."""
+    response = await asyncio.wait_for(
+        get_http_client().request(method, host["url"] + path, timeout=timeout, **kwargs),
+        timeout,
+    )
+    response.raise_for_status()
+    return response.json()
+
+
+async def fleet_fan_out(fetch, hosts: list[dict], timeout: float) -> list[dict]:
+    """Run `fetch(host)` on every host concurrently; failures and timeouts become per-host errors."""
+
+    async def one(host: dict) -> dict:
+        started = time.perf_counter()
+        entry = {"host": host["name"], "url": host["url"], "kind": host["kind"], "ok": False}
+        try:
+            entry["data"] = await fetch(host)
+            entry["ok"] = True
+        except asyncio.TimeoutError:
+            entry["error"] = f"no response within {timeout}s"
+        except httpx.HTTPStatusError as e:
+            entry["error"] = f"HTTP {e.response.status_code}"
+        except (httpx.HTTPError, ValueError, KeyError, IndexError) as e:
+            entry["error"] = str(e) or e.__class__.__name__
+        entry["latency_ms"] = round((time.perf_counter() - started) * 1000, 1)
+        return entry
+
+    return await asyncio.gather(*(one(host) for host in hosts))
+
+
+async def fleet_host_status(host: dict, timeout: float) -> dict:
+    if host["kind"] == "manager":
+        return await fleet_request(host, "GET", "/status", timeout)
+    # A bare vLLM endpoint only tells us whether it is serving and what
+    served = await fleet_request(host, "GET", "/v1/models", timeout)
+    return {"state": "running", "model": served["data"][0]["id"], "variant": None}
+
+
+async def fleet_host_models(host: dict, timeout: float) -> list[dict]:
+    if host["kind"] == "manager":
+        return (await fleet_request(host, "GET", "/models", timeout))["models"]
+    served = await fleet_request(host, "GET", "/v1/models", timeout)
+    return [{"id": model["id"], "variants": [], "active": True, "active_variant": None} for model in served["data"]]
+
+
+@app.get("/fleet/status")
+async def get_fleet_status():
+    """Status and GPU data of every fleet host, fetched concurrently with a per-host timeout."""
+    settings = fleet_config()
+    hosts = await fleet_fan_out(lambda host: fleet_host_status(host, settings["timeout"]), settings["hosts"], settings["timeout"])
+    summary = {"hosts": len(hosts), "reachable": 0, "running": 0, "gpu_count": 0, "memory_used_mb": 0, "memory_total_mb": 0}
+    for entry in hosts:
+        status = entry.pop("data", None)
+        if not entry["ok"]:
+            continue
+        summary["reachable"] += 1
+        summary["running"] += status.get("state") == "running"
+        gpu = status.get("gpu") or {}
+        for key in ("gpu_count", "memory_used_mb", "memory_total_mb"):
+            summary[key] += gpu.get(key) or 0
+        entry["status"] = status
+    return {"summary": summary, "hosts": hosts}
+
+
+@app.get("/fleet/models")
+async def get_fleet_models():
+    """Every model known to the fleet, with the hosts that can run it and where it is active."""
+    settings = fleet_config()
+    hosts = await fleet_fan_out(lambda host: fleet_host_models(host, settings["timeout"]), settings["hosts"], settings["timeout"])
+    models: dict[str, dict] = {}
+    for entry in hosts:
+        for model in entry.pop("data", None) or []:
+            merged = models.setdefault(model["id"], {"id": model["id"], "hosts": []})
+            merged["hosts"].append({
+                "host": entry["host"],
+                "variants": model.get("variants") or [],
+                "active": model.get("active", False),
+                "active_variant": model.get("active_variant"),
+            })
+    return {"models": list(models.values()), "hosts": hosts}
+
+
+def fleet_placement_score(status: dict, preflight: Optional[dict]) -> tuple:
+    """Higher is better: fits in GPU memory, then not evicting a served model, then most free memory."""
+    gpu = status.get("gpu") or {}
+    free_mb = (gpu.get("memory_total_mb") or 0) - (gpu.get("memory_used_mb") or 0)
+    fits = (preflight or {}).get("fits")
+    return (fits is not False, fits is True, status.get("state") not in ("running", "starting"), free_mb)
+
+
+@app.post("/fleet/switch")
+async def fleet_switch(request: FleetSwitchRequest):
+    """Switch a fleet host to a model, on `host` or on whichever configured host has room for it."""
+    settings = fleet_config()
+    managers = [host for host in settings["hosts"] if host["kind"] == "manager"]
+    if request.host:
+        managers = [host for host in managers if host["name"] == request.host]
+        if not managers:
+            raise HTTPException(status_code=404, detail=f"No manager host '{request.host}' in the fleet")
+    timeout = settings["timeout"]
+
+    async def candidate(host: dict) -> dict:
+        status, models = await asyncio.gather(fleet_host_status(host, timeout), fleet_host_models(host, timeout))
+        model = next((model for model in models if model["id"] == request.model), None)
+        if model is None:
+            return {"status": status, "configured": False}
+        params = {"variant": request.variant} if request.variant else {}
+        preflight = await fleet_request(host, "GET", f"/models/{request.model}/preflight", timeout, params=params)
+        return {"status": status, "configured": True, "model": model, "preflight": preflight}
+
+    results = await fleet_fan_out(candidate, managers, timeout * 2)
+    candidates = [entry for entry in results if entry["ok"] and entry["data"]["configured"]]
+    for entry in candidates:
+        data = entry["data"]
+        if (
+            data["model"].get("active")
+            and data["status"].get("state") == "running"
+            and data["model"].get("active_variant") == request.variant
+        ):
+            return {"status": "already_running", "host": entry["host"], "model": request.model, "variant": request.variant}
+
+    candidates.sort(key=lambda entry: fleet_placement_score(entry["data"]["status"], entry["data"]["preflight"]), reverse=True)
+    if not candidates or candidates[0]["data"]["preflight"].get("fits") is False:
+        placement = [
+            {
+                "host": entry["host"],
+                "error": entry.get("error")
+                or (None if entry["data"]["configured"] else f"model '{request.model}' not configured")
+                or entry["data"]["preflight"].get("reason"),
+            }
+            for entry in results
+        ]
+        raise HTTPException(status_code=409, detail={"message": f"No fleet host can run '{request.model}'", "hosts": placement})
+
+    target = next(host for host in managers if host["name"] == candidates[0]["host"])
+    body = {"model": request.model, "variant": request.variant, "sleep_previous": request.sleep_previous}
+    try:
+        response = await get_http_client().post(f"{target['url']}/switch", json=body, timeout=timeout)
+    except httpx.HTTPError as e:
+        raise HTTPException(status_code=502, detail=f"Switch on '{target['name']}' failed: {e}")
+    if response.status_code >= 400:
+        try:
+            detail = response.json().get("detail", response.text)
+        except ValueError:
+            detail = response.text
+        raise HTTPException(status_code=response.status_code, detail=detail)
+    logger.info(f"Fleet switch: {request.model} placed on {target['name']}")
+    return {**response.json(), "host": target["name"]}
+
+
+def parse_cron_field(text: str, low: int, high: int) -> set[int]:
+    values = set()
+    for part in text.split(","):
+        spec, _, step = part.partition("/")
+        step = int(step) if step else 1
+        if spec == "*":
+            start, end = low, high
+        elif "-" in spec:
+            start, end = (int(bound) for bound in spec.split("-", 1))
+        else:
+            start = int(spec)
+            # "5/15" runs from 5 every 15 until the end of the range
+            end = high if step != 1 else start
+        if step < 1 or not low <= start <= end <= high:
+            raise ValueError(f"'{part}' is outside {low}-{high}")
+        values.update(range(start, end + 1, step))
+    return values
+
+
+def parse_cron(expression: str) -> dict:
+    """A standard five-field cron expression: minute hour day-of-month month day-of-week."""
+    fields = expression.split()
+    if len(fields) != 5:
+        raise ValueError("expected 5 fields: minute hour day-of-month month day-of-week")
+    minute, hour, dom, month, dow = (
+        parse_cron_field(field, low, high) for field, (low, high) in zip(fields, CRON_FIELD_RANGES)
+    )
+    if 7 in dow:
+        dow = (dow - {7}) | {0}
+    return {
+        "minute": sorted(minute),
+        "hour": sorted(hour),
+        "dom": dom,
+        "month": month,
+        "dow": dow,
+        "dom_any": fields[2] == "*",
+        "dow_any": fields[4] == "*",
+    }
+
+
+def cron_day_matches(cron: dict, day) -> bool:
+    if day.month not in cron["month"]:
+        return False
+    dom = day.day in cron["dom"]
+    dow = day.isoweekday() % 7 in cron["dow"]
+    if cron["dom_any"] or cron["dow_any"]:
+        return dom and dow
+    # Like cron, a restricted day of month and day of week match either
+    return dom or dow
+
+
+def cron_next(cron: dict, after: datetime) -> Optional[datetime]:
+    """The first matching minute strictly after `after`."""
+    start = after.replace(second=0, microsecond=0) + timedelta(minutes=1)
+    for offset in range(CRON_SEARCH_DAYS + 1):
+        day = start.date() + timedelta(days=offset)
+        if not cron_day_matches(cron, day):
+            continue
+        for hour in cron["hour"]:
+            for minute in cron["minute"]:
+                candidate = datetime(day.year, day.month, day.day, hour, minute, tzinfo=after.tzinfo)
+                if candidate >= start:
+                    return candidate
+    return None
+
+
+def cron_prev(cron: dict, at: datetime) -> Optional[datetime]:
+    """The latest matching minute at or before `at`."""
+    end = at.replace(second=0, microsecond=0)
+    for offset in range(CRON_SEARCH_DAYS + 1):
+        day = end.date() - timedelta(days=offset)
+        if not cron_day_matches(cron, day):
+            continue
+        for hour in reversed(cron["hour"]):
+            for minute in reversed(cron["minute"]):
+                candidate = datetime(day.year, day.month, day.day, hour, minute, tzinfo=at.tzinfo)
+                if candidate <= end:
+                    return candidate
+    return None
+
+
+def schedule_config() -> dict:
+    settings = dict(SCHEDULE_DEFAULTS)
+    try:
+        settings.update(load_config().get("schedule") or {})
+    except HTTPException:
+        pass
+    return settings
+
+
+def local_zone() -> tzinfo:
+    """The host's time zone with its DST rules, from TZ or /etc/localtime; UTC if neither is readable.
+
+    `datetime.now().astimezone()` is no substitute: it only carries today's UTC offset.
+    """
+    name = os.environ.get("TZ", "").lstrip(":")
+    if name:
+        try:
+            return ZoneInfo(name)
+        except (ValueError, KeyError, OSError):
+            pass
+    try:
+        with open("/etc/localtime", "rb") as f:
+            return ZoneInfo.from_file(f, key="localtime")
+    except (OSError, ValueError):
+        return timezone.utc
+
+
+def schedule_now(settings: dict) -> datetime:
+    """Now in the schedule's zone; cron slots are built as wall-clock times in the same zone."""
+    return datetime.now(ZoneInfo(settings["timezone"]) if settings["timezone"] else local_zone())
+
+
+def schedule_slot_key(name: str, slot: datetime) -> str:
+    """Identifies a rule's slot by its instant, so the key holds however the zone spells its offset."""
+    return f"{name}@{slot.astimezone(timezone.utc).isoformat()}"
+
+
+def schedule_plan(settings: dict, now: datetime) -> dict:
+    """Every rule with its last and next slot, the rule whose slot is current, and the next one to start."""
+    rules = []
+    current = upcoming = None
+    for position, rule in enumerate(settings["rules"] or [], start=1):
+        cron = parse_cron(rule["cron"])
+        entry = {
+            "name": rule.get("name") or f"rule-{position}",
+            "cron": rule["cron"],
+            "model": rule["model"],
+            "variant": rule.get("variant"),
+            "last_slot": cron_prev(cron, now),
+            "next_slot": cron_next(cron, now),
+        }
+        rules.append(entry)
+        if entry["last_slot"] and (current is None or entry["last_slot"] > current["last_slot"]):
+            current = entry
+        if entry["next_slot"] and (upcoming is None or entry["next_slot"] < upcoming["next_slot"]):
+            upcoming = entry
+    return {"rules": rules, "current": current, "upcoming": upcoming}
+
+
+async def current_model_busy() -> bool:
+    if proxy_stats.in_flight or proxy_stats.queued:
+        return True
+    if app_state.state != "running":
+        return False
+    busy, _ = parse_vllm_activity(await fetch_vllm_metrics())
+    return busy
+
+
+class Scheduler:
+    """Applies `schedule.rules`, switching to each rule's model when its slot starts.
+
+    Each slot is applied once, so a manual /switch holds until the next slot. Progress is
+    kept in schedule.json next to state.json, so a restart neither repeats nor loses a slot.
+    """
+
+    def __init__(self, path: Path):
+        self.store = StateStore(path)
+        self.prewarmed: set[str] = set()
+
+    def load(self) -> dict:
+        return self.store.load()
+
+    def finish(self, slot: dict, slot_key: str, outcome: str):
+        logger.info(f"Schedule slot {slot_key}: {outcome} ({slot['model']})")
+        event_history.record("schedule", slot["model"], outcome, rule=slot["name"], variant=slot["variant"])
+        self.store.save({
+            "applied": slot_key,
+            "deferred": None,
+            "last": {
+                "rule": slot["name"],
+                "model": slot["model"],
+                "variant": slot["variant"],
+                "slot": slot["last_slot"].isoformat(),
+                "outcome": outcome,
+                "at": utc_now_iso(),
+            },
+        })
+
+    def prewarm_upcoming(self, upcoming: Optional[dict], now: datetime, settings: dict):
+        if not upcoming or upcoming["model"] == app_state.current_model:
+            return
+        # Subtracting datetimes that share a zone ignores a DST change between them; timestamps don't
+        if upcoming["next_slot"].timestamp() - now.timestamp() > settings["prewarm_ahead"]:
+            return
+        key = schedule_slot_key(upcoming["name"], upcoming["next_slot"])
+        if key in self.prewarmed:
+            return
+        self.prewarmed.add(key)
+        try:
+            start_prewarm(upcoming["model"], upcoming["variant"])
+            logger.info(f"Pre-warming {upcoming['model']} for its slot at {upcoming['next_slot'].isoformat()}")
+        except HTTPException as e:
+            logger.info(f"Not pre-warming {upcoming['model']} for the schedule: {e.detail}")
+
+    async def tick(self, settings: dict):
+        now = schedule_now(settings)
+        plan = schedule_plan(settings, now)
+        self.prewarm_upcoming(plan["upcoming"], now, settings)
+        slot = plan["current"]
+        if slot is None:
+            return
+        slot_key = schedule_slot_key(slot["name"], slot["last_slot"])
+        state = self.load()
+        if state.get("applied") == slot_key or not operation_queue.idle:
+            return
+
+        target = (slot["model"], slot["variant"])
+        if (app_state.current_model, app_state.current_variant) == target and app_state.state != "stopped":
+            self.finish(slot, slot_key, "already_active")
+            return
+        if app_state.state == "stopped":
+            # Stopped by /stop or the idle policy; don't bring the GPUs back up behind the user's back
+            self.finish(slot, slot_key, "skipped_stopped")
+            return
+        if app_state.state == "sleeping" and app_state.idle_unloaded_model:
+            # Put to sleep by the idle policy (sleep.idle); nobody is using the GPUs either
+            self.finish(slot, slot_key, "skipped_sleeping")
+            return
+        if await current_model_busy():
+            if settings["on_busy"] == "skip":
+                self.finish(slot, slot_key, "skipped_busy")
+                return
+            deferred = state.get("deferred") or {}
+            if deferred.get("slot") != slot_key:
+                logger.info(f"Deferring schedule slot {slot_key}, {app_state.current_model} is serving requests")
+                deferred = {"slot": slot_key, "since": time.time()}
+                self.store.save({**state, "deferred": deferred})
+            if time.time() - deferred["since"] < settings["defer_max"]:
+                return
+            logger.info(f"Schedule slot {slot_key} deferred for {settings['defer_max']}s, switching anyway")
+
+        operation_queue.submit("switch", slot["model"], launch_script(slot["model"], slot["variant"]), slot["variant"])
+        self.finish(slot, slot_key, "switched")
+
+
+scheduler = Scheduler(SCHEDULE_PATH)
+
+
+async def schedule_loop():
+    while True:
+        await asyncio.sleep(SCHEDULE_CHECK_INTERVAL)
+        try:
+            settings = schedule_config()
+            if settings["enabled"] and settings["rules"]:
+                await scheduler.tick(settings)
+        except Exception as e:
+            logger.warning(f"Schedule check failed: {e}")
+
+
+@app.get("/schedule")
+async def get_schedule():
+    """Configured rotation rules, their last and next slots, and what the scheduler last did."""
+    settings = schedule_config()
+    now = schedule_now(settings)
+    plan = schedule_plan(settings, now)
+    state = scheduler.load()
+    deferred = state.get("deferred")
+
+    def iso(value: Optional[datetime]) -> Optional[str]:
+        return value.isoformat() if value else None
+
+    return {
+        "enabled": bool(settings["enabled"] and settings["rules"]),
+        "timezone": settings["timezone"] or str(now.tzinfo),
+        "now": now.isoformat(),
+        "current_rule": plan["current"]["name"] if plan["current"] else None,
+        "upcoming": {
+            "rule": plan["upcoming"]["name"],
+            "model": plan["upcoming"]["model"],
+            "at": iso(plan["upcoming"]["next_slot"]),
+        } if plan["upcoming"] else None,
+        "rules": [
+            {**rule, "last_slot": iso(rule["last_slot"]), "next_slot": iso(rule["next_slot"])}
+            for rule in plan["rules"]
+        ],
+        "last": state.get("last"),
+        "deferred": {
+            "slot": deferred["slot"],
+            "since": datetime.fromtimestamp(deferred["since"], timezone.utc).isoformat(),
+        } if deferred else None,
     }
 
 
@@ -689,7 +4900,7 @@ async def shutdown_server():
         logger.info(f"Server shutdown scheduled in {SHUTDOWN_DELAY} seconds")
         await asyncio.sleep(SHUTDOWN_DELAY)
         logger.info("Executing shutdown...")
-        subprocess.run(["sudo", "shutdown", "now"])
+        run_subprocess(["sudo", "shutdown", "now"])
 
     asyncio.create_task(delayed_shutdown())
     return {
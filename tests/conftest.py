@@ -0,0 +1,219 @@
+import asyncio
+import json
+import sys
+import time
+from pathlib import Path
+from typing import Optional
+
+import httpx
+import pytest
+from fastapi import FastAPI, Request, Response
+from fastapi.responses import StreamingResponse
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import main  # noqa: E402
+
+
+class FakeController(main.ServiceController):
+    """systemd stand-in that flips the unit's active state on start and stop.
+
+    `delay` slows every property read down, like a busy D-Bus or a forked systemctl.
+    """
+
+    name = "fake"
+
+    def __init__(self, active_state: str = "inactive", delay: float = 0):
+        self.properties = main.default_systemd_properties()
+        self.properties.update(active_state=active_state, sub_state="running" if active_state == "active" else "dead")
+        self.delay = delay
+        self.calls: list[tuple[str, str]] = []
+
+    async def get_properties(self, unit: str = main.VLLM_SERVICE) -> dict:
+        await asyncio.sleep(self.delay)
+        return dict(self.properties)
+
+    async def start(self, unit: str = main.VLLM_SERVICE) -> tuple[int, str, str]:
+        self.calls.append(("start", unit))
+        self.properties.update(active_state="active", sub_state="running", result="success")
+        return 0, "", ""
+
+    async def stop(self, unit: str = main.VLLM_SERVICE) -> tuple[int, str, str]:
+        self.calls.append(("stop", unit))
+        self.properties.update(active_state="inactive", sub_state="dead")
+        return 0, "", ""
+
+    async def daemon_reload(self):
+        pass
+
+
+class FakeGpuSampler(main.GpuSampler):
+    """GPU sampler that yields scripted ticks instead of reading hardware, then stops or fails."""
+
+    name = "fake"
+
+    def __init__(self, ticks: list[list[dict]], interval: float = 0, error: Optional[Exception] = None):
+        super().__init__(interval)
+        self.ticks = ticks
+        self.error = error
+        self.runs = 0
+
+    async def samples(self):
+        self.runs += 1
+        for gpus in self.ticks:
+            yield gpus
+            await asyncio.sleep(self.interval)
+        if self.error:
+            raise self.error
+        await asyncio.Event().wait()
+
+
+def fake_gpu(index: int, **values) -> dict:
+    """One GPU reading with every metric set, `values` overriding the defaults."""
+    gpu = {metric: 0.0 for metric in main.GPU_METRICS}
+    gpu.update(index=index, memory_total_mb=81920.0, **values)
+    return gpu
+
+
+class StubVllm:
+    """In-process vLLM serving /health, /v1/models, streamed /v1/completions and the sleep mode endpoints.
+
+    Each completion sleeps `token_delay` before every token and ends with a usage chunk.
+    """
+
+    def __init__(self, served_model: str = "small", root: str = "/models/small"):
+        self.healthy = True
+        self.sleeping = False
+        self.sleep_mode = True
+        self.served_model = served_model
+        self.root = root
+        self.calls: list[str] = []
+        self.token_delay = 0.002
+        self.completions: list[dict] = []
+        self.app = FastAPI()
+
+        @self.app.get("/health")
+        async def health():
+            return Response(status_code=200 if self.healthy else 503)
+
+        @self.app.get("/v1/models")
+        async def models():
+            return {"object": "list", "data": [{"id": self.served_model, "root": self.root}]}
+
+        @self.app.post("/v1/completions")
+        async def completions(request: Request):
+            payload = await request.json()
+            self.completions.append(payload)
+            tokens = payload.get("max_tokens") or 16
+
+            async def stream():
+                for index in range(tokens):
+                    await asyncio.sleep(self.token_delay)
+                    chunk = {"model": self.served_model, "choices": [{"index": 0, "text": f" t{index}"}]}
+                    yield f"data: {json.dumps(chunk)}\n\n"
+                usage = {"prompt_tokens": len(payload.get("prompt", "").split()), "completion_tokens": tokens}
+                yield f"data: {json.dumps({'choices': [], 'usage': usage})}\n\n"
+                yield "data: [DONE]\n\n"
+
+            return StreamingResponse(stream(), media_type="text/event-stream")
+
+        @self.app.get("/is_sleeping")
+        async def is_sleeping():
+            if not self.sleep_mode:
+                return Response(status_code=404)
+            return {"is_sleeping": self.sleeping}
+
+        @self.app.post("/sleep")
+        async def sleep(level: int = 1):
+            if not self.sleep_mode:
+                return Response(status_code=404)
+            self.calls.append(f"sleep:{level}")
+            self.sleeping = True
+            return Response(status_code=200)
+
+        @self.app.post("/wake_up")
+        async def wake_up():
+            if not self.sleep_mode:
+                return Response(status_code=404)
+            self.calls.append("wake_up")
+            self.sleeping = False
+            return Response(status_code=200)
+
+        @self.app.get("/metrics")
+        async def metrics():
+            return Response("vllm:num_requests_running 0\nvllm:num_requests_waiting 0\n", media_type="text/plain")
+
+
+async def wait_until(predicate, timeout: float = 5, interval: float = 0.02):
+    deadline = time.monotonic() + timeout
+    while not predicate():
+        if time.monotonic() > deadline:
+            raise AssertionError("condition not met in time")
+        await asyncio.sleep(interval)
+
+
+@pytest.fixture
+def anyio_backend():
+    return "asyncio"
+
+
+@pytest.fixture
+def manager(tmp_path, monkeypatch):
+    """`main` with its files under tmp_path, fresh runtime state and a fake systemd controller."""
+    script = tmp_path / "start_model.sh"
+    script.write_text("#!/bin/bash\nexec vllm serve /models/small\n")
+    script.chmod(0o755)
+    (tmp_path / "config.yaml").write_text(
+        f"models:\n"
+        f"  small:\n    script: {script}\n"
+        f"  large:\n    script: {script}\n"
+    )
+    controller = FakeController()
+
+    async def create_service_controller():
+        return controller
+
+    monkeypatch.setattr(main, "config_store", main.ConfigStore(tmp_path / "config.yaml"))
+    monkeypatch.setattr(main, "state_store", main.StateStore(tmp_path / "state.json"))
+    monkeypatch.setattr(main, "event_history", main.EventHistory(tmp_path / "history.db"))
+    monkeypatch.setattr(main, "warmup_recorder", main.WarmupRecorder(tmp_path / "warmup_prompts.json"))
+    monkeypatch.setattr(main, "scheduler", main.Scheduler(tmp_path / "schedule.json"))
+    monkeypatch.setattr(main, "app_state", main.AppState())
+    monkeypatch.setattr(main, "operation_queue", main.OperationQueue())
+    monkeypatch.setattr(main, "proxy_stats", main.ProxyStats())
+    monkeypatch.setattr(main, "recovery_policy", main.RecoveryPolicy())
+    monkeypatch.setattr(main, "background_tasks", [])
+    monkeypatch.setattr(main, "reconcile_wakeup", asyncio.Event())
+    monkeypatch.setattr(main, "_vllm_metrics_lock", asyncio.Lock())
+    monkeypatch.setattr(main, "_refresh_task", None)
+    monkeypatch.setattr(main, "_http_client", None)
+    monkeypatch.setattr(main, "_proxy_client", None)
+    monkeypatch.setattr(main, "service_controller", controller)
+    monkeypatch.setattr(main, "create_service_controller", create_service_controller)
+    monkeypatch.setattr(main, "create_gpu_sampler", lambda: None)
+    monkeypatch.setattr(main, "gpu_history", main.GpuHistory(capacity=8))
+    monkeypatch.setattr(main, "port_router", None)
+    monkeypatch.setattr(main, "benchmark_results", main.benchmark.ResultsStore(tmp_path / "benchmark_results.jsonl"))
+    monkeypatch.setattr(main, "benchmark_job", None)
+    return main
+
+
+@pytest.fixture
+def controller(manager) -> FakeController:
+    return manager.service_controller
+
+
+@pytest.fixture
+def stub_vllm(manager, monkeypatch) -> StubVllm:
+    """Route the manager's vLLM probe and proxy clients to an in-process stub."""
+    stub = StubVllm()
+    transport = httpx.ASGITransport(app=stub.app)
+    monkeypatch.setattr(manager, "_http_client", httpx.AsyncClient(transport=transport))
+    monkeypatch.setattr(manager, "_proxy_client", httpx.AsyncClient(transport=transport))
+    return stub
+
+
+@pytest.fixture
+async def client(manager):
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=manager.app), base_url="http://manager") as client:
+        yield client
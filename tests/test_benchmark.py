@@ -0,0 +1,181 @@
+import asyncio
+import functools
+
+import httpx
+import pytest
+from fastapi import Response
+
+import benchmark
+from conftest import wait_until
+
+pytestmark = pytest.mark.anyio
+
+SETTINGS = {
+    "concurrency": [1, 4],
+    "requests_per_level": 8,
+    "prompt_tokens": {"mean": 20, "stddev": 0},
+    "output_tokens": {"mean": 10, "stddev": 0},
+    "seed": 1,
+}
+
+
+@pytest.fixture
+def stub_benchmark(stub_vllm, monkeypatch):
+    """Send every benchmark run, including the manager's, to the stub vLLM."""
+    transport = httpx.ASGITransport(app=stub_vllm.app)
+    monkeypatch.setattr(benchmark, "run_benchmark", functools.partial(benchmark.run_benchmark, transport=transport))
+    return stub_vllm
+
+
+async def test_run_benchmark_times_a_streaming_server(stub_vllm):
+    levels = []
+    result = await benchmark.run_benchmark(
+        "http://stub",
+        benchmark.benchmark_settings(SETTINGS),
+        progress=levels.append,
+        transport=httpx.ASGITransport(app=stub_vllm.app),
+    )
+
+    assert result["served_model"] == "small"
+    assert [level["concurrency"] for level in result["levels"]] == [1, 4]
+    assert levels == result["levels"]
+    assert len(stub_vllm.completions) == 16
+    assert {payload["max_tokens"] for payload in stub_vllm.completions} == {10}
+    assert all(payload["stream"] and payload["model"] == "small" for payload in stub_vllm.completions)
+    for level in result["levels"]:
+        assert (level["requests"], level["errors"]) == (8, 0)
+        for metric in ("ttft_ms", "itl_ms", "latency_ms"):
+            summary = level[metric]
+            assert None not in summary.values(), metric
+            assert 0 <= summary["p50"] <= summary["p95"] <= summary["p99"], metric
+        # the stub waits token_delay before the first token, and before each one after it
+        assert level["ttft_ms"]["p50"] >= stub_vllm.token_delay * 1000
+        assert level["latency_ms"]["p50"] >= 10 * stub_vllm.token_delay * 1000
+        assert level["output_tokens_per_s"] == pytest.approx(8 * 10 / level["duration_s"], rel=0.05)
+
+
+async def test_run_benchmark_counts_failed_requests(stub_vllm):
+    @stub_vllm.app.middleware("http")
+    async def reject_completions(request, call_next):
+        if request.url.path == "/v1/completions":
+            return Response("overloaded", status_code=500)
+        return await call_next(request)
+
+    result = await benchmark.run_benchmark(
+        "http://stub",
+        benchmark.benchmark_settings({**SETTINGS, "concurrency": [2]}),
+        transport=httpx.ASGITransport(app=stub_vllm.app),
+    )
+    level = result["levels"][0]
+    assert (level["errors"], level["output_tokens_per_s"]) == (8, 0)
+    assert "HTTP 500" in level["first_error"]
+    assert level["ttft_ms"]["p50"] is None
+
+
+@pytest.mark.parametrize(
+    "overrides",
+    [
+        {"concurrency": "4"},
+        {"concurrency": [1, "8"]},
+        {"concurrency": [0]},
+        {"concurrency": True},
+        {"requests_per_level": 2.5},
+        {"requests_per_level": 0},
+        {"seed": "x"},
+        {"prompt_tokens": 512},
+        {"prompt_tokens": {"mean": "long"}},
+        {"output_tokens": {"mean": 0}},
+        {"timeout": -1},
+        {"timeout": "soon"},
+        {"warmup": 3},
+    ],
+)
+def test_benchmark_settings_rejects_bad_values(overrides):
+    with pytest.raises(ValueError):
+        benchmark.benchmark_settings(overrides)
+
+
+def test_benchmark_settings_fills_in_defaults():
+    settings = benchmark.benchmark_settings({"concurrency": 2, "output_tokens": {"mean": 64}})
+    assert settings["concurrency"] == [2]
+    assert settings["output_tokens"] == {"mean": 64, "stddev": benchmark.DEFAULTS["output_tokens"]["stddev"]}
+    assert settings["requests_per_level"] == benchmark.DEFAULTS["requests_per_level"]
+
+
+async def test_benchmark_endpoint_stores_results(manager, stub_benchmark, client):
+    manager.app_state.current_model = "small"
+    manager.app_state.state = "running"
+
+    response = await client.post("/benchmark", json=SETTINGS)
+    assert response.status_code == 200, response.text
+    job_id = response.json()["id"]
+    assert (await client.post("/benchmark", json={})).status_code == 409
+
+    await wait_until(lambda: manager.benchmark_job.status != "running")
+    job = (await client.get("/benchmark")).json()
+    assert (job["id"], job["status"], job["error"]) == (job_id, "completed", None)
+
+    results = (await client.get("/benchmark/results", params={"model": "small"})).json()["results"]
+    assert [result["id"] for result in results] == [job_id]
+    assert [level["concurrency"] for level in results[0]["levels"]] == [1, 4]
+    assert manager.benchmark_results.path.exists()
+    assert (await client.get("/benchmark/results", params={"model": "large"})).json()["results"] == []
+
+
+async def test_benchmark_endpoint_rejects_bad_settings(manager, client):
+    manager.app_state.current_model = "small"
+    manager.app_state.state = "running"
+    response = await client.post("/benchmark", json={"concurrency": [0]})
+    assert response.status_code == 400
+    manager.app_state.state = "stopped"
+    assert (await client.post("/benchmark", json={})).status_code == 409
+
+
+@pytest.fixture
+def switching_queue(manager, monkeypatch):
+    """The operation worker with switches that succeed instantly."""
+
+    async def execute_operation(operation):
+        manager.app_state.current_model = operation.model
+        manager.app_state.current_variant = operation.variant
+        manager.app_state.state = "running"
+
+    monkeypatch.setattr(manager, "execute_operation", execute_operation)
+    manager.config_store.path.write_text(
+        manager.config_store.path.read_text()
+        + "benchmark:\n  after_switch: true\n  concurrency: [2]\n  requests_per_level: 4\n"
+        + "  output_tokens: {mean: 4, stddev: 0}\n  prompt_tokens: {mean: 8, stddev: 0}\n"
+    )
+    return manager.operation_queue
+
+
+async def test_a_switch_runs_the_post_switch_benchmark(manager, stub_benchmark, switching_queue):
+    worker = asyncio.create_task(switching_queue.run())
+    try:
+        operation = switching_queue.submit("switch", "large")
+        await wait_until(lambda: operation.done and manager.benchmark_job is not None)
+        assert operation.status == "succeeded"
+        await wait_until(lambda: manager.benchmark_job.status != "running")
+        assert (manager.benchmark_job.model, manager.benchmark_job.status) == ("large", "completed")
+        assert manager.benchmark_job.settings["concurrency"] == [2]
+        assert [result["model"] for result in manager.benchmark_results.query()] == ["large"]
+    finally:
+        worker.cancel()
+
+
+async def test_the_queue_survives_a_post_switch_benchmark_that_cannot_start(manager, switching_queue, monkeypatch):
+    def broken_start_benchmark(overrides=None):
+        raise RuntimeError("benchmark settings vanished")
+
+    monkeypatch.setattr(manager, "start_benchmark", broken_start_benchmark)
+    worker = asyncio.create_task(switching_queue.run())
+    try:
+        first = switching_queue.submit("switch", "large")
+        await wait_until(lambda: first.done)
+        second = switching_queue.submit("switch", "small")
+        await wait_until(lambda: second.done)
+        assert (first.status, second.status) == ("succeeded", "succeeded")
+        assert not worker.done()
+        assert manager.benchmark_job is None
+    finally:
+        worker.cancel()
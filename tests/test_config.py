@@ -0,0 +1,71 @@
+import pytest
+from fastapi import HTTPException
+
+from conftest import wait_until
+
+pytestmark = pytest.mark.anyio
+
+BAD_SECTIONS = [
+    ("idle: [oops]\n", "'idle' must be a mapping"),
+    ("readiness: fast\n", "'readiness' must be a mapping"),
+    ("instances: true\n", "'instances' must be a mapping"),
+    ("recovery: [1]\n", "'recovery' must be a mapping"),
+    ("proxy: on\n", "'proxy' must be a mapping"),
+    ("schedule:\n  rules: daily\n", "schedule.rules must be a list"),
+    ("fleet:\n  hosts: {a: b}\n", "fleet.hosts must be a list"),
+    ("prewarm:\n  models: small\n", "prewarm.models must be a list"),
+]
+
+
+def write_config(manager, extra: str):
+    manager.config_store.path.write_text(manager.config_store.path.read_text() + extra)
+
+
+@pytest.mark.parametrize("extra, error", BAD_SECTIONS)
+def test_wrongly_typed_sections_are_reported(manager, extra, error):
+    write_config(manager, extra)
+    with pytest.raises(HTTPException) as excinfo:
+        manager.load_config()
+    assert error in excinfo.value.detail
+    assert manager.config_store.error and error in manager.config_store.error
+
+
+def test_wrongly_typed_model_warmup_is_reported(manager):
+    path = manager.config_store.path
+    path.write_text(path.read_text().replace("  large:\n", "  large:\n    warmup: [hi]\n"))
+    assert "model 'large' warmup must be a mapping" in manager.validate_config(
+        manager.yaml.safe_load(path.read_text())
+    )
+
+
+def test_a_validation_crash_is_reported_instead_of_none(manager, monkeypatch):
+    def broken(config):
+        raise AttributeError("'list' object has no attribute 'items'")
+
+    monkeypatch.setattr(manager, "validate_config", broken)
+    with pytest.raises(HTTPException) as excinfo:
+        manager.load_config()
+    assert "None" not in excinfo.value.detail
+    assert "has no attribute 'items'" in excinfo.value.detail
+    # and again from the cache, once the file signature has been recorded
+    with pytest.raises(HTTPException) as excinfo:
+        manager.load_config()
+    assert "has no attribute 'items'" in excinfo.value.detail
+
+
+async def test_startup_finishes_with_a_wrongly_typed_section(manager, stub_vllm, client):
+    write_config(manager, "idle: [oops]\n")
+
+    await manager.startup_event()
+    try:
+        loops = {"reconciler_loop", "idle_monitor_loop", "recovery_loop", "schedule_loop"}
+
+        def running() -> set:
+            return {task.get_coro().__name__ for task in manager.background_tasks if not task.done()}
+
+        await wait_until(lambda: loops <= running())
+        response = await client.get("/status")
+        assert response.status_code == 200
+        assert manager.app_state.restored_state is None
+    finally:
+        await manager.shutdown_event()
@@ -0,0 +1,153 @@
+import asyncio
+import time
+from typing import Optional
+
+import httpx
+import pytest
+from fastapi import FastAPI, HTTPException
+
+pytestmark = pytest.mark.anyio
+
+FLEET_TIMEOUT = 0.2
+
+
+class StubManager:
+    """A fleet host answering /status, /models, preflight and /switch like a vLLM manager."""
+
+    def __init__(self, models: dict[str, Optional[bool]], active: Optional[str] = None, free_mb: int = 40000):
+        self.models = models  # model id -> preflight `fits`
+        self.active = active
+        self.free_mb = free_mb
+        self.switches: list[dict] = []
+        self.app = FastAPI()
+
+        @self.app.get("/status")
+        async def status():
+            return {
+                "state": "running" if self.active else "stopped",
+                "model": self.active,
+                "gpu": {"gpu_count": 2, "memory_total_mb": 81920, "memory_used_mb": 81920 - self.free_mb},
+            }
+
+        @self.app.get("/models")
+        async def models():
+            return {
+                "models": [
+                    {"id": model_id, "variants": [], "active": model_id == self.active, "active_variant": None}
+                    for model_id in self.models
+                ]
+            }
+
+        @self.app.get("/models/{model_id}/preflight")
+        async def preflight(model_id: str):
+            fits = self.models[model_id]
+            return {"model": model_id, "fits": fits, "reason": None if fits else f"needs more than {self.free_mb} MiB"}
+
+        @self.app.post("/switch")
+        async def switch(body: dict):
+            if body["model"] not in self.models:
+                raise HTTPException(status_code=404, detail="unknown model")
+            self.switches.append(body)
+            return {"status": "switching", "model": body["model"], "operation_id": "op1"}
+
+
+def silent_host() -> FastAPI:
+    """A host that accepts connections and never answers."""
+    app = FastAPI()
+
+    @app.api_route("/{path:path}", methods=["GET", "POST"])
+    async def hang(path: str):
+        await asyncio.Event().wait()
+
+    return app
+
+
+class FleetTransport(httpx.AsyncBaseTransport):
+    """Dispatches each request to the in-process app registered for its host name."""
+
+    def __init__(self, apps: dict[str, FastAPI]):
+        self.transports = {host: httpx.ASGITransport(app=app) for host, app in apps.items()}
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        transport = self.transports.get(request.url.host)
+        if transport is None:
+            raise httpx.ConnectError(f"no route to {request.url.host}", request=request)
+        return await transport.handle_async_request(request)
+
+
+@pytest.fixture
+def fleet(manager, monkeypatch):
+    """Configure the fleet and route its hosts to in-process apps: fleet({name: app})."""
+
+    def configure(apps: dict[str, FastAPI]):
+        hosts = "".join(f"    - {{name: {name}, url: 'http://{name}:9090/'}}\n" for name in apps)
+        manager.config_store.path.write_text(
+            manager.config_store.path.read_text() + f"fleet:\n  timeout: {FLEET_TIMEOUT}\n  hosts:\n{hosts}"
+        )
+        monkeypatch.setattr(manager, "_http_client", httpx.AsyncClient(transport=FleetTransport(apps)))
+
+    return configure
+
+
+async def test_fleet_status_does_not_wait_for_a_silent_host(fleet, client):
+    fleet({"gpu-a": StubManager({"small": True}, active="small").app, "gpu-b": StubManager({}).app, "gpu-c": silent_host()})
+
+    started = time.perf_counter()
+    body = (await client.get("/fleet/status")).json()
+    assert time.perf_counter() - started < FLEET_TIMEOUT * 3
+
+    hosts = {entry["host"]: entry for entry in body["hosts"]}
+    assert (hosts["gpu-a"]["ok"], hosts["gpu-a"]["status"]["model"]) == (True, "small")
+    assert hosts["gpu-c"]["ok"] is False
+    assert hosts["gpu-c"]["error"] == f"no response within {FLEET_TIMEOUT}s"
+    assert body["summary"] == {
+        "hosts": 3,
+        "reachable": 2,
+        "running": 1,
+        "gpu_count": 4,
+        "memory_used_mb": 2 * (81920 - 40000),
+        "memory_total_mb": 2 * 81920,
+    }
+
+
+async def test_fleet_models_merges_hosts(fleet, client):
+    fleet({
+        "gpu-a": StubManager({"small": True, "large": False}, active="small").app,
+        "gpu-b": StubManager({"large": True}, active="large").app,
+        "gpu-c": silent_host(),
+    })
+
+    body = (await client.get("/fleet/models")).json()
+    models = {model["id"]: model for model in body["models"]}
+    assert [host["host"] for host in models["small"]["hosts"]] == ["gpu-a"]
+    assert {host["host"]: host["active"] for host in models["large"]["hosts"]} == {"gpu-a": False, "gpu-b": True}
+    assert [entry["ok"] for entry in body["hosts"]] == [True, True, False]
+
+
+async def test_fleet_switch_places_the_model_where_it_fits(fleet, client):
+    tight = StubManager({"large": False}, free_mb=70000)
+    roomy = StubManager({"large": True}, active="small", free_mb=10000)
+    fleet({"gpu-a": tight.app, "gpu-b": roomy.app, "gpu-c": silent_host()})
+
+    response = await client.post("/fleet/switch", json={"model": "large"})
+    assert response.status_code == 200, response.text
+    assert response.json()["host"] == "gpu-b"
+    assert [switch["model"] for switch in roomy.switches] == ["large"]
+    assert tight.switches == []
+
+
+async def test_fleet_switch_reports_every_host_when_nothing_fits(fleet, client):
+    fleet({
+        "gpu-a": StubManager({"large": False}, free_mb=20000).app,
+        "gpu-b": StubManager({"small": True}).app,
+        "gpu-c": silent_host(),
+    })
+
+    response = await client.post("/fleet/switch", json={"model": "large"})
+    assert response.status_code == 409
+    reasons = {host["host"]: host["error"] for host in response.json()["detail"]["hosts"]}
+    assert reasons == {
+        "gpu-a": "needs more than 20000 MiB",
+        "gpu-b": "model 'large' not configured",
+        "gpu-c": f"no response within {FLEET_TIMEOUT * 2}s",
+    }
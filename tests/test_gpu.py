@@ -0,0 +1,106 @@
+import asyncio
+import time
+
+import pytest
+
+from conftest import FakeGpuSampler, fake_gpu, wait_until
+
+pytestmark = pytest.mark.anyio
+
+
+def test_ring_buffer_keeps_the_newest_samples_in_order(manager):
+    history = manager.GpuHistory(capacity=4)
+    for second in range(1, 11):
+        history.record(second, [fake_gpu(0, utilization_percent=second * 10)])
+
+    result = history.query()
+    assert result["timestamps"] == [7, 8, 9, 10]
+    assert result["gpus"][0]["utilization_percent"] == [70, 80, 90, 100]
+    assert history.latest[0]["utilization_percent"] == 100
+
+
+def test_missing_gpus_and_metrics_read_as_none(manager):
+    history = manager.GpuHistory(capacity=4)
+    history.record(1, [fake_gpu(0, power_w=None)])
+    history.record(2, [fake_gpu(0, power_w=250), fake_gpu(1, temperature_c=60)])
+    history.record(3, [fake_gpu(0, power_w=260)])
+
+    gpus = {gpu["index"]: gpu for gpu in history.query()["gpus"]}
+    assert gpus[0]["power_w"] == [None, 250, 260]
+    # GPU 1 was missing before it first reported and after it fell off the bus
+    assert gpus[1]["temperature_c"] == [None, 60, None]
+
+
+def test_query_filters_and_downsamples(manager):
+    history = manager.GpuHistory(capacity=16)
+    for second in range(100, 112):
+        gpus = [fake_gpu(0, memory_used_mb=second)]
+        if second < 104:
+            gpus.append(fake_gpu(1, memory_used_mb=1000))
+        history.record(second, gpus)
+
+    result = history.query(since=102, step=4)
+    assert (result["since"], result["step"]) == (102, 4)
+    assert result["timestamps"] == [100, 104, 108]
+    gpus = {gpu["index"]: gpu for gpu in result["gpus"]}
+    # the first bucket only holds the samples from 102 on
+    assert gpus[0]["memory_used_mb"] == [102.5, 105.5, 109.5]
+    assert gpus[1]["memory_used_mb"] == [1000, None, None]
+
+    assert history.query(since=200)["timestamps"] == []
+
+
+async def lines(*rows: str):
+    for row in rows:
+        yield f"{row}\n".encode()
+
+
+async def test_nvidia_smi_lines_are_split_into_one_batch_per_tick(manager):
+    output = lines(
+        "0, 10, 1000, 81920, 40, 100.5, 1400, 30",
+        "1, 20, 2000, 81920, 41, [N/A], 1400, [Not Supported]",
+        "garbage",
+        "0, 11, 1000, 81920, 40, 101.0, 1400, 30",
+        "1, 21, 2000, 81920, 41, 99.0, 1400, 31",
+        "0, 12, 1000, 81920, 40, 102.0, 1400, 30",
+    )
+    batches = [batch async for batch in manager.nvidia_smi_batches(output)]
+    # the last tick is yielded as soon as it is complete; a partial one is held back
+    assert [[gpu["index"] for gpu in batch] for batch in batches] == [[0, 1], [0, 1]]
+    assert [batch[0]["utilization_percent"] for batch in batches] == [10, 11]
+    assert (batches[0][1]["power_w"], batches[0][1]["fan_speed_percent"]) == (None, None)
+
+
+async def test_a_single_gpu_is_a_batch_of_one(manager):
+    output = lines(*(f"0, {value}, 1000, 81920, 40, 100, 1400, 30" for value in (1, 2, 3)))
+    batches = [batch async for batch in manager.nvidia_smi_batches(output)]
+    assert [batch[0]["utilization_percent"] for batch in batches] == [1, 2, 3]
+
+
+def test_gpu_sampler_is_abstract(manager):
+    with pytest.raises(TypeError):
+        manager.GpuSampler()
+
+
+async def test_telemetry_loop_records_a_fake_sampler(manager, client):
+    ticks = [[fake_gpu(0, utilization_percent=value), fake_gpu(1, utilization_percent=value / 2)] for value in (50, 90)]
+    task = asyncio.create_task(manager.gpu_telemetry_loop(FakeGpuSampler(ticks, interval=0.01)))
+    try:
+        await wait_until(lambda: len(manager.gpu_history.query()["timestamps"]) == 2)
+        history = (await client.get("/gpu/history", params={"since": time.time() - 60})).json()
+        assert [gpu["utilization_percent"] for gpu in history["gpus"]] == [[50, 90], [25, 45]]
+        assert manager.get_gpu_stats()["gpu_count"] == 2
+    finally:
+        task.cancel()
+
+
+async def test_telemetry_loop_restarts_a_failed_sampler(manager, monkeypatch):
+    monkeypatch.setattr(manager, "GPU_SAMPLER_RESTART_DELAY", 0.01)
+    sampler = FakeGpuSampler([[fake_gpu(0)]], error=RuntimeError("nvidia-smi exited with status 9"))
+    task = asyncio.create_task(manager.gpu_telemetry_loop(sampler))
+    try:
+        await wait_until(lambda: sampler.runs >= 3)
+        assert not task.done()
+        assert manager.gpu_history.latest == [fake_gpu(0)]
+    finally:
+        task.cancel()
@@ -0,0 +1,42 @@
+import time
+
+import pytest
+
+pytestmark = pytest.mark.anyio
+
+
+def test_events_are_written_in_batches(manager, tmp_path):
+    history = manager.EventHistory(tmp_path / "events.db")
+    history.open()
+    history.record("state", "small", "running", error=None)
+    history.record("operation", "small", "succeeded", operation="start")
+    assert history.query(0, time.time()) == []
+    history.flush()
+    events = history.query(0, time.time())
+    assert [(event["kind"], event["state"]) for event in events] == [("operation", "succeeded"), ("state", "running")]
+    assert events[0]["operation"] == "start"
+    history.close()
+
+
+def test_events_before_open_are_bounded(manager, tmp_path, monkeypatch):
+    monkeypatch.setattr(manager, "HISTORY_PENDING_LIMIT", 10)
+    history = manager.EventHistory(tmp_path / "events.db")
+    for index in range(25):
+        history.record("check", state=str(index))
+    assert [event[3] for event in history._pending] == [str(index) for index in range(15, 25)]
+
+
+async def test_an_unopenable_history_stops_collecting_events(manager, stub_vllm, tmp_path, monkeypatch):
+    unopenable = tmp_path / "history.db"
+    unopenable.mkdir()
+    monkeypatch.setattr(manager, "event_history", manager.EventHistory(unopenable))
+
+    await manager.startup_event()
+    try:
+        assert manager.event_history.disabled
+        for _ in range(100):
+            manager.event_history.record("check", "small", "running")
+        await manager.app_state.set_state("stopped")
+        assert manager.event_history._pending == []
+    finally:
+        await manager.shutdown_event()
@@ -0,0 +1,43 @@
+import pytest
+
+pytestmark = pytest.mark.anyio
+
+
+def enable_instances(manager):
+    path = manager.config_store.path
+    text = path.read_text()
+    text = text.replace("  small:\n", "  small:\n    port: 8001\n").replace("  large:\n", "  large:\n    port: 8002\n")
+    path.write_text(text + "instances:\n  enabled: true\n  router_port: 0\n")
+
+
+async def test_a_warm_switch_starts_the_router_when_instances_are_enabled_at_runtime(
+    manager, controller, stub_vllm
+):
+    assert not manager.multi_instance_enabled()
+    enable_instances(manager)
+    assert manager.multi_instance_enabled()
+    assert manager.port_router is None
+    controller.properties.update(active_state="active", sub_state="running")
+
+    try:
+        await manager.switch_instance_async("large", manager.launch_script("large"))
+        assert (manager.app_state.state, manager.app_state.current_model) == ("running", "large")
+        assert manager.port_router is not None
+        assert manager.port_router.target_port == 8002
+        assert controller.calls == []
+    finally:
+        if manager.port_router:
+            await manager.port_router.close()
+
+
+async def test_a_busy_router_port_does_not_fail_the_switch(manager, controller, stub_vllm, monkeypatch):
+    enable_instances(manager)
+    controller.properties.update(active_state="active", sub_state="running")
+
+    async def port_taken(self):
+        raise OSError(98, "Address already in use")
+
+    monkeypatch.setattr(manager.PortRouter, "start", port_taken)
+    await manager.switch_instance_async("large", manager.launch_script("large"))
+    assert (manager.app_state.state, manager.app_state.current_model) == ("running", "large")
+    assert manager.port_router is None
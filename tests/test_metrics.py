@@ -0,0 +1,23 @@
+import pytest
+
+pytestmark = pytest.mark.anyio
+
+
+def test_every_manager_metric_is_rendered(manager):
+    manager.MODEL_WARMUP_DURATION.observe(1.5, model="rendered")
+    body = manager.render_manager_metrics()
+    metrics = [
+        value for value in vars(manager).values()
+        if isinstance(value, (manager.Counter, manager.Histogram))
+    ]
+    assert metrics
+    for metric in metrics:
+        assert f"# TYPE {metric.name} " in body, metric.name
+    assert 'vllm_manager_model_warmup_duration_seconds_count{model="rendered"} 1' in body
+
+
+async def test_metrics_endpoint_reports_the_warmup_histogram(manager, client):
+    manager.MODEL_WARMUP_DURATION.observe(0.2, model="small")
+    response = await client.get("/metrics", params={"vllm": "false"})
+    assert response.status_code == 200
+    assert "vllm_manager_model_warmup_duration_seconds_bucket" in response.text
@@ -0,0 +1,116 @@
+import asyncio
+from pathlib import Path
+
+import pytest
+
+from conftest import wait_until
+
+pytestmark = pytest.mark.anyio
+
+MODELS = ("small", "medium", "large")
+
+
+@pytest.fixture
+def loading(manager, controller, stub_vllm, tmp_path, monkeypatch):
+    """One launch script per model and loads that hang until the stub turns healthy; returns the scripts launched."""
+    config = "preflight:\n  mode: 'off'\nreadiness:\n  initial_interval: 0.01\n  max_interval: 0.02\nmodels:\n"
+    for model_id in MODELS:
+        script = tmp_path / f"start_{model_id}.sh"
+        script.write_text(f"#!/bin/bash\nexec vllm serve /models/{model_id}\n")
+        config += f"  {model_id}:\n    script: {script}\n"
+    manager.config_store.path.write_text(config)
+
+    env_scripts = []
+    monkeypatch.setattr(manager, "update_vllm_env", lambda script_path, *args: env_scripts.append(script_path))
+
+    async def no_journal(unit):
+        pass
+
+    monkeypatch.setattr(manager, "watch_load_progress", no_journal)
+    stub_vllm.healthy = False
+    return env_scripts
+
+
+@pytest.fixture
+async def worker(manager):
+    task = asyncio.create_task(manager.operation_queue.run())
+    yield manager.operation_queue
+    task.cancel()
+    await asyncio.gather(task, return_exceptions=True)
+
+
+def launched_models(env_scripts) -> list[str]:
+    return [Path(script).stem.removeprefix("start_") for script in env_scripts]
+
+
+async def test_quick_switches_start_only_the_last_target(manager, controller, stub_vllm, loading, worker, client):
+    operation_ids = []
+    for model_id in MODELS:
+        response = await client.post("/switch", json={"model": model_id})
+        assert response.status_code == 200, response.text
+        operation_ids.append(response.json()["operation_id"])
+    stub_vllm.healthy = True
+
+    last = worker.get(operation_ids[-1])
+    await wait_until(lambda: last.done)
+    assert last.status == "succeeded"
+    assert (manager.app_state.state, manager.app_state.current_model) == ("running", "large")
+    # the middle switch never ran; the first was either dropped while queued or cancelled mid-load
+    assert "medium" not in launched_models(loading)
+    assert launched_models(loading)[-1] == "large"
+    first, middle = (worker.get(operation_id) for operation_id in operation_ids[:2])
+    assert (first.status, first.superseded_by) == ("superseded", middle.id)
+    assert (middle.status, middle.superseded_by) == ("superseded", last.id)
+
+
+async def test_a_repeated_start_returns_the_queued_operation(manager, controller, stub_vllm, loading, client):
+    first = (await client.post("/start")).json()
+    second = (await client.post("/start")).json()
+    assert first["operation_id"] == second["operation_id"]
+    assert [operation.id for operation in manager.operation_queue.recent()] == [first["operation_id"]]
+
+    stub_vllm.healthy = True
+    task = asyncio.create_task(manager.operation_queue.run())
+    try:
+        operation = manager.operation_queue.get(first["operation_id"])
+        await wait_until(lambda: operation.done)
+        assert operation.status == "succeeded"
+        assert [call for call, _ in controller.calls] == ["start"]
+    finally:
+        task.cancel()
+        await asyncio.gather(task, return_exceptions=True)
+
+
+async def test_stop_during_a_load_cancels_it_and_stops_the_unit(manager, controller, loading, worker, client):
+    start_id = (await client.post("/start")).json()["operation_id"]
+    await wait_until(lambda: manager.app_state.state == "starting" and controller.calls)
+
+    stop = (await client.post("/stop")).json()
+    assert stop["status"] == "stopping"
+    stop_operation = worker.get(stop["operation_id"])
+    await wait_until(lambda: stop_operation.done)
+
+    start = (await client.get(f"/operations/{start_id}")).json()
+    assert (start["status"], start["superseded_by"]) == ("superseded", stop["operation_id"])
+    assert stop_operation.status == "succeeded"
+    assert controller.calls[:2] == [("start", manager.VLLM_SERVICE), ("stop", manager.VLLM_SERVICE)]
+    assert controller.properties["active_state"] == "inactive"
+    assert manager.app_state.state == "stopped"
+
+
+async def test_deleting_operations_cancels_them(manager, controller, loading, worker, client):
+    start_id = (await client.post("/start")).json()["operation_id"]
+    await wait_until(lambda: manager.app_state.state == "starting")
+    # a restart of the same model queues behind the load instead of cancelling it
+    queued = worker.submit("restart", "small", manager.launch_script("small"))
+
+    response = await client.delete(f"/operations/{queued.id}")
+    assert response.json()["status"] == "cancelled"
+    assert worker.pending is None
+
+    await client.delete(f"/operations/{start_id}")
+    await wait_until(lambda: worker.idle)
+    assert (await client.get(f"/operations/{start_id}")).json()["status"] == "cancelled"
+    assert controller.calls == [("start", manager.VLLM_SERVICE), ("stop", manager.VLLM_SERVICE)]
+    assert manager.app_state.state == "stopped"
+    assert (await client.delete("/operations/nope")).status_code == 404
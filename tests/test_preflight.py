@@ -0,0 +1,122 @@
+import json
+
+import pytest
+from fastapi import HTTPException
+
+pytestmark = pytest.mark.anyio
+
+GIB = 1024 ** 3
+
+
+def make_model_dir(path, layers=32, heads=32, kv_heads=8, hidden=4096, weight_bytes=16 * GIB, dtype="bfloat16"):
+    """A model directory with just the files the estimator reads: config.json and the shard index."""
+    path.mkdir()
+    (path / "config.json").write_text(json.dumps({
+        "num_hidden_layers": layers,
+        "num_attention_heads": heads,
+        "num_key_value_heads": kv_heads,
+        "hidden_size": hidden,
+        "max_position_embeddings": 131072,
+        "torch_dtype": dtype,
+    }))
+    (path / "model.safetensors.index.json").write_text(json.dumps({"metadata": {"total_size": weight_bytes}}))
+    return path
+
+
+def gpu(index, total_mb=24576, used_mb=0):
+    return {"index": index, "memory_total_mb": total_mb, "memory_used_mb": used_mb}
+
+
+def configure(manager, model_dir, args=None, env=None, mode="warn"):
+    model = {"model": str(model_dir), "args": args or {}, "env": env or {}}
+    config = {"preflight": {"mode": mode, "overhead_mb": 1000}, "models": {"fixture": model}}
+    manager.config_store.path.write_text(json.dumps(config))
+
+
+def test_weights_and_kv_cache_are_sharded_across_tensor_parallel_ranks(manager, tmp_path):
+    model_dir = make_model_dir(tmp_path / "llama")
+    single = manager.estimate_model_memory(model_dir, {"max-model-len": 8192}, 1000)
+    sharded = manager.estimate_model_memory(model_dir, {"max-model-len": 8192, "tensor-parallel-size": 2}, 1000)
+
+    # 2 (K and V) * 32 layers * 8 KV heads * 128 head dim * 2 bytes * 8192 tokens
+    assert (single["weights_mb"], single["kv_cache_mb"]) == (16384, 1024)
+    assert (sharded["weights_mb"], sharded["kv_cache_mb"]) == (8192, 512)
+    assert sharded["gpu_count"] == 2
+    assert sharded["required_mb"] == 8192 + 512 + 1000
+
+
+def test_kv_heads_are_replicated_when_there_are_more_ranks_than_heads(manager, tmp_path):
+    model_dir = make_model_dir(tmp_path / "gqa", kv_heads=2)
+    two_ranks = manager.estimate_model_memory(model_dir, {"max-model-len": 8192, "tensor-parallel-size": 2}, 0)
+    eight_ranks = manager.estimate_model_memory(model_dir, {"max-model-len": 8192, "tensor-parallel-size": 8}, 0)
+    # One KV head per GPU is the floor, so the KV cache stops shrinking past 2 ranks
+    assert two_ranks["kv_cache_mb"] == eight_ranks["kv_cache_mb"] == 128
+
+
+def test_kv_cache_dtype_and_max_model_len_come_from_the_launch_args(manager, tmp_path):
+    model_dir = make_model_dir(tmp_path / "llama")
+    estimate = manager.estimate_model_memory(model_dir, {"max-model-len": 4096, "kv-cache-dtype": "fp8"}, 0)
+    assert (estimate["max_model_len"], estimate["kv_cache_mb"]) == (4096, 256)
+
+
+def test_model_fits_on_free_gpus(manager, tmp_path):
+    configure(manager, make_model_dir(tmp_path / "llama"), {"max-model-len": 8192, "tensor-parallel-size": 2})
+    result = manager.preflight_check("fixture", gpus=[gpu(0), gpu(1)])
+    assert result["fits"] is True
+    assert [entry["index"] for entry in result["gpus"]] == [0, 1]
+
+
+def test_model_does_not_fit_next_to_a_loaded_model(manager, tmp_path):
+    configure(manager, make_model_dir(tmp_path / "llama"), {"max-model-len": 8192})
+    result = manager.preflight_check("fixture", gpus=[gpu(0, used_mb=20000)])
+    assert result["fits"] is False
+    assert "GPU 0 has" in result["reason"]
+
+
+def test_memory_of_the_model_being_replaced_counts_as_available(manager, tmp_path):
+    configure(manager, make_model_dir(tmp_path / "llama"), {"max-model-len": 8192})
+    busy = [gpu(0, used_mb=20000)]
+    assert manager.preflight_check("fixture", gpus=busy)["fits"] is False
+    assert manager.preflight_check("fixture", gpus=busy, replacing_current=True)["fits"] is True
+
+
+def test_only_gpus_in_cuda_visible_devices_are_considered(manager, tmp_path):
+    configure(
+        manager,
+        make_model_dir(tmp_path / "llama"),
+        {"max-model-len": 8192, "tensor-parallel-size": 2},
+        {"CUDA_VISIBLE_DEVICES": "2,3"},
+    )
+    gpus = [gpu(0, used_mb=24000), gpu(1, used_mb=24000), gpu(2), gpu(3)]
+    result = manager.preflight_check("fixture", gpus=gpus)
+    assert result["fits"] is True
+    assert [entry["index"] for entry in result["gpus"]] == [2, 3]
+
+    configure(
+        manager,
+        make_model_dir(tmp_path / "llama-one-gpu"),
+        {"max-model-len": 8192, "tensor-parallel-size": 2},
+        {"CUDA_VISIBLE_DEVICES": "3"},
+    )
+    result = manager.preflight_check("fixture", gpus=gpus)
+    assert result["fits"] is False
+    assert "needs 2 GPUs but 1 are available" in result["reason"]
+
+
+def test_no_estimate_without_a_local_model_directory(manager, tmp_path):
+    configure(manager, "meta-llama/Llama-3.1-8B-Instruct")
+    result = manager.preflight_check("fixture", gpus=[gpu(0)])
+    assert result["fits"] is None
+    assert "not a local model directory" in result["reason"]
+
+
+async def test_reject_mode_refuses_a_model_that_does_not_fit(manager, tmp_path, monkeypatch):
+    configure(manager, make_model_dir(tmp_path / "llama"), {"max-model-len": 8192}, mode="reject")
+    history = manager.GpuHistory(capacity=4)
+    history.record(0, [gpu(0, used_mb=20000)])
+    monkeypatch.setattr(manager, "gpu_history", history)
+
+    with pytest.raises(HTTPException) as excinfo:
+        await manager.run_preflight("fixture")
+    assert excinfo.value.status_code == 400
+    assert (await manager.run_preflight("fixture", replacing_current=True))["fits"] is True
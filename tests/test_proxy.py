@@ -0,0 +1,96 @@
+import httpx
+import pytest
+from fastapi.responses import StreamingResponse
+
+pytestmark = pytest.mark.anyio
+
+
+@pytest.fixture
+def proxying(manager, stub_vllm):
+    manager.config_store.path.write_text(manager.config_store.path.read_text() + "proxy:\n  enabled: true\n")
+    manager.app_state.current_model = "small"
+    manager.app_state.ready_event.set()
+    return manager
+
+
+async def test_stream_counts_as_in_flight_until_it_ends(proxying, stub_vllm, client):
+    seen = []
+
+    @stub_vllm.app.post("/v1/chat/completions")
+    async def chat_completions():
+        async def tokens():
+            for token in ("a", "b"):
+                seen.append(proxying.proxy_stats.in_flight)
+                yield f"data: {token}\n\n"
+
+        return StreamingResponse(tokens(), media_type="text/event-stream")
+
+    response = await client.post("/v1/chat/completions", json={"model": "small", "messages": []})
+    assert response.status_code == 200
+    assert response.text == "data: a\n\ndata: b\n\n"
+    assert seen == [1, 1]
+    assert proxying.proxy_stats.in_flight == 0
+
+
+class DyingStream(httpx.AsyncByteStream):
+    """A response body that breaks off after the first token, like a vLLM process getting killed."""
+
+    def __init__(self):
+        self.closed = False
+
+    async def __aiter__(self):
+        yield b"data: a\n\n"
+        raise httpx.ReadError("connection reset by peer")
+
+    async def aclose(self):
+        self.closed = True
+
+
+async def test_backend_dying_mid_stream_does_not_leak_in_flight(proxying, client, monkeypatch):
+    stream = DyingStream()
+    transport = httpx.MockTransport(lambda request: httpx.Response(200, stream=stream))
+    monkeypatch.setattr(proxying, "_proxy_client", httpx.AsyncClient(transport=transport))
+
+    with pytest.raises(httpx.ReadError):
+        await client.post("/v1/completions", json={"model": "small", "prompt": "hi"})
+    assert proxying.proxy_stats.in_flight == 0
+    assert stream.closed
+
+
+async def test_unreachable_backend_does_not_leak_in_flight(proxying, client, monkeypatch):
+    def refuse(request):
+        raise httpx.ConnectError("connection refused")
+
+    monkeypatch.setattr(proxying, "_proxy_client", httpx.AsyncClient(transport=httpx.MockTransport(refuse)))
+    response = await client.post("/v1/completions", json={"model": "small", "prompt": "hi"})
+    assert response.status_code == 502
+    assert proxying.proxy_stats.in_flight == 0
+
+
+def test_requests_route_by_served_name_and_model_path(manager, tmp_path):
+    (tmp_path / "weights").mkdir()
+    (tmp_path / "chat").symlink_to(tmp_path / "weights")
+    manager.config_store.path.write_text(
+        "instances:\n  enabled: true\n"
+        "models:\n"
+        "  coder:\n    model: Qwen/Qwen3-Coder-30B-A3B-Instruct\n    port: 8001\n"
+        "    args:\n      served-model-name: coder-fast\n"
+        f"  chat:\n    model: {tmp_path / 'chat'}\n    port: 8002\n"
+        "  qwen3:\n    model: Qwen/Qwen3-8B\n    port: 8003\n"
+    )
+    manager.app_state.current_model = "qwen3"
+    manager.app_state.last_diagnostics = {
+        "instances": [
+            {"model": "coder", "healthy": True},
+            {"model": "chat", "healthy": True},
+            {"model": "qwen3", "healthy": True},
+        ]
+    }
+
+    assert manager.resolve_proxy_target("coder") == "coder"
+    assert manager.resolve_proxy_target("coder-fast") == "coder"
+    assert manager.resolve_proxy_target("Qwen/Qwen3-Coder-30B-A3B-Instruct") == "coder"
+    assert manager.resolve_proxy_target(str(tmp_path / "weights")) == "chat"
+    # No more substring guessing: unknown names go to the active model
+    assert manager.resolve_proxy_target("my-coder-finetune") == "qwen3"
+    assert manager.resolve_proxy_target(42) == "qwen3"
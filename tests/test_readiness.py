@@ -0,0 +1,67 @@
+import asyncio
+
+import pytest
+
+pytestmark = pytest.mark.anyio
+
+
+def configure_readiness(manager, **settings):
+    lines = "".join(f"  {key}: {value}\n" for key, value in settings.items())
+    manager.config_store.path.write_text(manager.config_store.path.read_text() + "readiness:\n" + lines)
+
+
+async def wait_with_watcher(manager, monkeypatch, journal):
+    """Run wait_for_vllm_ready with the load watcher following `journal` instead of journalctl."""
+    monkeypatch.setattr(manager, "follow_journal", journal)
+    manager.app_state.begin_load(None)
+    watcher = asyncio.create_task(manager.watch_load_progress(manager.VLLM_SERVICE))
+    try:
+        return await manager.wait_for_vllm_ready()
+    finally:
+        watcher.cancel()
+        manager.app_state.end_load()
+
+
+@pytest.fixture
+def loading(manager, controller, stub_vllm):
+    controller.properties.update(active_state="activating", sub_state="start")
+    stub_vllm.healthy = False
+    return manager
+
+
+async def test_silent_journal_aborts_once_the_watcher_has_seen_a_line(loading, monkeypatch):
+    configure_readiness(loading, initial_interval=0.02, max_interval=0.02, timeout=2, stall_timeout=0.2)
+
+    async def journal(**_):
+        yield {"message": "Starting vLLM API server"}
+        await asyncio.Event().wait()
+
+    ready, _, detail = await wait_with_watcher(loading, monkeypatch, journal)
+    assert not ready
+    assert detail["code"] == "stalled"
+
+
+async def test_stall_detection_is_off_by_default(loading, monkeypatch):
+    configure_readiness(loading, initial_interval=0.02, max_interval=0.02, timeout=0.4)
+
+    async def journal(**_):
+        yield {"message": "Starting vLLM API server"}
+        await asyncio.Event().wait()
+
+    ready, _, detail = await wait_with_watcher(loading, monkeypatch, journal)
+    assert not ready
+    assert detail["code"] == "timeout"
+
+
+@pytest.mark.parametrize("lines", [0, 1])
+async def test_stall_detection_is_disarmed_without_a_working_watcher(loading, monkeypatch, lines):
+    configure_readiness(loading, initial_interval=0.02, max_interval=0.02, timeout=0.4, stall_timeout=0.1)
+
+    async def journal(**_):
+        for _ in range(lines):
+            yield {"message": "Starting vLLM API server"}
+        raise RuntimeError("journalctl is not available")
+
+    ready, _, detail = await wait_with_watcher(loading, monkeypatch, journal)
+    assert not ready
+    assert detail["code"] == "timeout"
@@ -0,0 +1,120 @@
+from datetime import datetime, timezone
+from zoneinfo import ZoneInfo
+
+import pytest
+
+pytestmark = pytest.mark.anyio
+
+SETTINGS = {
+    "enabled": True,
+    "timezone": "UTC",
+    "prewarm_ahead": 0,
+    "on_busy": "defer",
+    "defer_max": 1800,
+    "rules": [
+        {"name": "day", "cron": "0 8 * * *", "model": "large"},
+        {"name": "night", "cron": "0 20 * * *", "model": "small"},
+    ],
+}
+
+
+def test_cron_next_and_previous_slot(manager):
+    weekdays = manager.parse_cron("0 8 * * 1-5")
+    saturday = datetime(2026, 10, 17, 12, 0, tzinfo=timezone.utc)
+    assert manager.cron_prev(weekdays, saturday) == datetime(2026, 10, 16, 8, 0, tzinfo=timezone.utc)
+    assert manager.cron_next(weekdays, saturday) == datetime(2026, 10, 19, 8, 0, tzinfo=timezone.utc)
+    assert sorted(manager.parse_cron("5/20 * * * *")["minute"]) == [5, 25, 45]
+    for expression in ("61 * * * *", "* * *", "5-2 * * * *"):
+        with pytest.raises(ValueError):
+            manager.parse_cron(expression)
+
+
+@pytest.fixture
+def scheduled(manager, monkeypatch):
+    submitted = []
+    monkeypatch.setattr(manager.operation_queue, "submit", lambda *args, **kwargs: submitted.append(args))
+    monkeypatch.setattr(manager, "launch_script", lambda model_id, variant=None: f"/launch/{model_id}.sh")
+
+    async def idle_model():
+        return False
+
+    monkeypatch.setattr(manager, "current_model_busy", idle_model)
+    manager.app_state.current_model = "large"
+    manager.app_state.state = "running"
+    return submitted
+
+
+def current_rule(manager) -> dict:
+    now = manager.schedule_now(SETTINGS)
+    return manager.schedule_plan(SETTINGS, now)["current"]
+
+
+async def test_a_new_slot_switches_to_its_model(manager, scheduled):
+    manager.app_state.current_model = "small" if current_rule(manager)["model"] == "large" else "large"
+    await manager.scheduler.tick(SETTINGS)
+    assert [args[1] for args in scheduled] == [current_rule(manager)["model"]]
+    assert manager.scheduler.load()["last"]["outcome"] == "switched"
+
+    await manager.scheduler.tick(SETTINGS)
+    assert len(scheduled) == 1
+
+
+@pytest.mark.parametrize(
+    "state, idle_unloaded, outcome",
+    [("stopped", None, "skipped_stopped"), ("sleeping", "other", "skipped_sleeping")],
+)
+async def test_models_unloaded_for_idleness_are_left_alone(manager, scheduled, state, idle_unloaded, outcome):
+    manager.app_state.current_model = "other"
+    manager.app_state.state = state
+    manager.app_state.idle_unloaded_model = idle_unloaded
+    await manager.scheduler.tick(SETTINGS)
+    assert scheduled == []
+    assert manager.scheduler.load()["last"]["outcome"] == outcome
+
+
+async def test_a_busy_model_defers_the_switch(manager, scheduled, monkeypatch):
+    async def busy_model():
+        return True
+
+    monkeypatch.setattr(manager, "current_model_busy", busy_model)
+    manager.app_state.current_model = "other"
+    await manager.scheduler.tick(SETTINGS)
+    assert scheduled == []
+    assert manager.scheduler.load()["deferred"]["slot"].startswith(current_rule(manager)["name"])
+
+    await manager.scheduler.tick({**SETTINGS, "defer_max": 0})
+    assert len(scheduled) == 1
+    assert manager.scheduler.load()["deferred"] is None
+
+
+def test_slots_keep_their_own_utc_offset_across_a_dst_change(manager, monkeypatch):
+    monkeypatch.setenv("TZ", "Europe/Brussels")
+    zone = manager.local_zone()
+    assert str(zone) == "Europe/Brussels"
+    assert str(manager.schedule_now({"timezone": None}).tzinfo) == "Europe/Brussels"
+
+    # Saturday before summer time ends; Monday 09:00 is already in winter time
+    saturday = datetime(2026, 10, 24, 12, 0, tzinfo=zone)
+    monday_nine = manager.cron_next(manager.parse_cron("0 9 * * 1"), saturday)
+    assert monday_nine.isoformat() == "2026-10-26T09:00:00+01:00"
+
+    # The same slot looked up before and after the change keeps one key
+    saturday_slot = manager.parse_cron("0 9 * * 6")
+    before = manager.cron_prev(saturday_slot, saturday)
+    after = manager.cron_prev(saturday_slot, datetime(2026, 10, 25, 12, 0, tzinfo=zone))
+    assert manager.schedule_slot_key("day", before) == manager.schedule_slot_key("day", after)
+
+
+def test_prewarm_ahead_counts_real_seconds_across_a_dst_change(manager, monkeypatch):
+    prewarmed = []
+    monkeypatch.setattr(manager, "start_prewarm", lambda model_id, variant=None: prewarmed.append(model_id))
+    zone = ZoneInfo("Europe/Brussels")
+    # 01:30 summer time to 03:00 winter time is 1.5 hours on the clock but 2.5 hours of real time
+    now = datetime(2026, 10, 25, 1, 30, tzinfo=zone)
+    upcoming = {"name": "night", "model": "large", "variant": None, "next_slot": datetime(2026, 10, 25, 3, 0, tzinfo=zone)}
+    manager.app_state.current_model = "small"
+
+    manager.scheduler.prewarm_upcoming(upcoming, now, {**SETTINGS, "prewarm_ahead": 2 * 3600})
+    assert prewarmed == []
+    manager.scheduler.prewarm_upcoming(upcoming, now, {**SETTINGS, "prewarm_ahead": 3 * 3600})
+    assert prewarmed == ["large"]
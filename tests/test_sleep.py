@@ -0,0 +1,86 @@
+import asyncio
+
+import pytest
+
+from conftest import wait_until
+
+pytestmark = pytest.mark.anyio
+
+ACTIVE = {"active_state": "active", "sub_state": "running"}
+
+
+@pytest.mark.parametrize(
+    "manager_state, health_ok, sleeping, expected",
+    [
+        ("running", True, True, "sleeping"),
+        ("sleeping", True, True, "sleeping"),
+        ("starting", True, True, "starting"),
+        ("stopping", True, False, "stopping"),
+        ("sleeping", True, False, "running"),
+        ("sleeping", False, False, "error"),
+    ],
+)
+def test_infer_state_understands_sleep(manager, manager_state, health_ok, sleeping, expected):
+    state, _ = manager.infer_state(ACTIVE, manager_state, health_ok, None, sleeping)
+    assert state == expected
+
+
+@pytest.fixture
+async def serving(manager, controller, stub_vllm):
+    """`small` running on the stub with the operation worker going."""
+    controller.properties.update(ACTIVE)
+    manager.update_state(last_model="small")
+    manager.app_state.current_model = "small"
+    await manager.app_state.set_state("running")
+    worker = asyncio.create_task(manager.operation_queue.run())
+    yield manager
+    worker.cancel()
+    await asyncio.gather(worker, return_exceptions=True)
+
+
+async def test_sleep_then_start_wakes_the_same_process(serving, controller, stub_vllm, client):
+    response = await client.post("/sleep")
+    assert response.json()["status"] == "sleeping"
+    await wait_until(lambda: serving.app_state.state == "sleeping")
+    assert stub_vllm.sleeping
+    assert stub_vllm.calls == [f"sleep:{serving.SLEEP_LEVEL}"]
+
+    # The reconciler sees a healthy unit that reports it is asleep
+    await serving.refresh_snapshot()
+    assert serving.app_state.state == "sleeping"
+    assert (await client.get("/status")).json()["state"] == "sleeping"
+
+    response = await client.post("/start")
+    assert response.json()["status"] == "waking"
+    await wait_until(lambda: serving.app_state.state == "running")
+    assert not stub_vllm.sleeping
+    assert stub_vllm.calls[-1] == "wake_up"
+    # Woken, not cold-started: the unit was never stopped or started again
+    assert controller.calls == []
+
+
+async def test_wake_endpoint(serving, stub_vllm, client):
+    assert (await client.post("/wake")).json()["status"] == "running"
+    await client.post("/sleep")
+    await wait_until(lambda: serving.app_state.state == "sleeping")
+
+    response = await client.post("/wake")
+    assert response.json()["status"] == "waking"
+    await wait_until(lambda: serving.app_state.state == "running")
+    assert stub_vllm.calls == [f"sleep:{serving.SLEEP_LEVEL}", "wake_up"]
+
+
+async def test_sleep_without_sleep_mode_keeps_the_model_running(serving, stub_vllm, client):
+    stub_vllm.sleep_mode = False
+    operation_id = (await client.post("/sleep")).json()["operation_id"]
+    await wait_until(lambda: serving.operation_queue.idle)
+    operation = (await client.get(f"/operations/{operation_id}")).json()
+    assert operation["status"] == "failed"
+    assert "--enable-sleep-mode" in operation["error"]
+    assert serving.app_state.state == "running"
+
+
+async def test_sleeping_is_always_exported_as_a_state(serving):
+    body = serving.render_manager_metrics()
+    assert 'vllm_manager_state{state="sleeping"} 0' in body
+    assert 'vllm_manager_state{state="running"} 1' in body
@@ -0,0 +1,126 @@
+import threading
+import time
+
+import pytest
+
+from conftest import wait_until
+
+pytestmark = pytest.mark.anyio
+
+# systemd answering this slowly is what used to hold up the first response
+SLOW_SYSTEMD_S = 2.0
+COLD_START_BUDGET_S = 0.5
+
+
+async def test_status_answers_from_restored_state_before_reconciliation(manager, controller, stub_vllm, client):
+    manager.update_state(
+        last_model="small",
+        last_known={"state": "running", "error": None, "at": "2026-10-01T12:00:00+00:00"},
+    )
+    controller.properties.update(active_state="active", sub_state="running")
+    controller.delay = SLOW_SYSTEMD_S
+
+    started = time.perf_counter()
+    await manager.startup_event()
+    try:
+        response = await client.get("/status")
+        cold_start_s = time.perf_counter() - started
+        body = response.json()
+        assert response.status_code == 200
+        assert (body["state"], body["model"], body["stale"]) == ("running", "small", True)
+        assert cold_start_s < COLD_START_BUDGET_S, f"first /status took {cold_start_s:.3f}s"
+
+        await wait_until(lambda: manager.app_state.restored_state is None, timeout=SLOW_SYSTEMD_S * 3)
+        body = (await client.get("/status")).json()
+        assert (body["state"], body["model"]) == ("running", "small")
+        assert "stale" not in body
+    finally:
+        await manager.shutdown_event()
+
+
+async def test_reconciliation_replaces_a_restored_state_that_no_longer_holds(manager, stub_vllm, client):
+    manager.update_state(
+        last_model="small",
+        last_known={"state": "running", "error": None, "at": "2026-10-01T12:00:00+00:00"},
+    )
+    # vllm.service did not come back after a reboot
+    stub_vllm.healthy = False
+
+    await manager.startup_event()
+    try:
+        await wait_until(lambda: manager.app_state.restored_state is None)
+        body = (await client.get("/status")).json()
+        assert body["state"] != "running"
+        assert "stale" not in body
+    finally:
+        await manager.shutdown_event()
+
+
+async def test_set_state_on_a_fresh_app_state(manager):
+    state = manager.AppState()
+    await state.set_state("starting", model="small")
+    state.restore({"state": "running"})
+    await state.set_state("running")
+    assert (state.state, state.current_model, state.restored_state) == ("running", "small", None)
+    await state.wait_persisted()
+    assert manager.load_state()["last_known"]["state"] == "running"
+
+
+async def test_state_transitions_are_persisted_off_the_event_loop(manager, monkeypatch):
+    manager.update_state(last_model="small")
+    update_state = manager.update_state
+    writers = []
+
+    def recording_update_state(**changes):
+        writers.append((threading.current_thread() is threading.main_thread(), changes["last_known"]["state"]))
+        update_state(**changes)
+
+    monkeypatch.setattr(manager, "update_state", recording_update_state)
+    state = manager.AppState()
+    for step in ("starting", "running", "stopping", "stopped"):
+        await state.set_state(step)
+    await state.wait_persisted()
+
+    assert writers and not any(on_loop for on_loop, _ in writers)
+    # transitions made while a write was in progress coalesce into the newest one
+    assert writers[-1][1] == "stopped" and len(writers) <= 4
+    saved = manager.load_state()
+    assert (saved["last_known"]["state"], saved["last_model"]) == ("stopped", "small")
+
+
+async def test_proxy_holds_requests_until_a_failed_startup_reconciliation_succeeds(
+    manager, controller, stub_vllm, client, monkeypatch
+):
+    manager.config_store.path.write_text(manager.config_store.path.read_text() + "proxy:\n  enabled: true\n")
+    manager.update_state(
+        last_model="small",
+        last_known={"state": "running", "error": None, "at": "2026-10-01T12:00:00+00:00"},
+    )
+    controller.properties.update(active_state="active", sub_state="running")
+    monkeypatch.setattr(manager, "STARTUP_RETRY_INTERVAL", 0.05)
+    failures = 2
+    get_properties = controller.get_properties
+
+    async def flaky_get_properties(unit=manager.VLLM_SERVICE):
+        nonlocal failures
+        if failures:
+            failures -= 1
+            raise ConnectionError("systemd is not up yet")
+        return await get_properties(unit)
+
+    controller.get_properties = flaky_get_properties
+
+    @stub_vllm.app.get("/v1/ping")
+    async def ping():
+        return {"pong": True}
+
+    await manager.startup_event()
+    try:
+        response = await client.get("/v1/ping")
+        assert response.status_code == 200, response.text
+        assert response.json() == {"pong": True}
+        assert failures == 0
+        assert manager.app_state.restored_state is None
+        assert (await client.get("/status")).json()["state"] == "running"
+    finally:
+        await manager.shutdown_event()
@@ -0,0 +1,38 @@
+import pytest
+
+pytestmark = pytest.mark.anyio
+
+
+def chat(system: str) -> list[dict]:
+    return [{"role": "system", "content": system}, {"role": "user", "content": "hello"}]
+
+
+async def test_nothing_is_kept_when_recording_is_off(manager):
+    recorder = manager.warmup_recorder
+    for index in range(5):
+        recorder.observe("small", chat(f"prompt {index}"))
+    await recorder.flush()
+    assert recorder._seen == {}
+    assert recorder._flush_task is None
+    assert not recorder.store.path.exists()
+
+
+async def test_recorded_prompts_are_capped_and_written_off_the_request_path(manager):
+    manager.config_store.path.write_text(manager.config_store.path.read_text() + "warmup:\n  recorded: 2\n")
+    recorder = manager.warmup_recorder
+    for system in ("one", "two", "one", "three"):
+        recorder.observe("small", chat(system))
+    recorder.observe("small", [{"role": "user", "content": "no system prompt"}])
+
+    # observe() only queues; the file is written by the flush task
+    assert not recorder.store.path.exists()
+    assert len(recorder._seen["small"]) == 2
+    await recorder._flush_task
+
+    assert [prefix[0]["content"] for prefix in recorder.prompts("small", 2)] == ["two", "three"]
+    bodies = [body for endpoint, body in manager.warmup_requests("small", manager.warmup_settings("small"))]
+    assert [body["messages"][0]["content"] for body in bodies] == ["two", "three"]
+    assert all(body["messages"][-1] == manager.WARMUP_USER_MESSAGE for body in bodies)
+
+    # a restarted manager reads them back from disk
+    assert len(manager.WarmupRecorder(recorder.store.path).prompts("small", 2)) == 2
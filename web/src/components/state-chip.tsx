@@ -6,6 +6,7 @@ const stateColors: Record<ServerState, string> = {
   stopped: "bg-zinc-500/20 text-zinc-400 border-zinc-500/30",
   starting: "bg-yellow-500/20 text-yellow-400 border-yellow-500/30",
   stopping: "bg-yellow-500/20 text-yellow-400 border-yellow-500/30",
+  sleeping: "bg-zinc-500/20 text-zinc-400 border-zinc-500/30",
   error: "bg-red-500/20 text-red-400 border-red-500/30",
   shutting_down: "bg-red-500/20 text-red-400 border-red-500/30",
 };
@@ -3,6 +3,7 @@ export type ServerState =
   | "stopped"
   | "starting"
   | "stopping"
+  | "sleeping"
   | "error"
   | "shutting_down";
 
@@ -23,7 +24,8 @@ export interface ServerStatus {
 
 export interface Model {
   id: string;
-  script: string;
+  script: string | null;
+  variants: string[];
   active: boolean;
 }
 
@@ -44,6 +46,7 @@ export const stateLabel: Record<ServerState, string> = {
   stopped: "Stopped",
   starting: "Starting",
   stopping: "Stopping",
+  sleeping: "Sleeping",
   error: "Error",
   shutting_down: "Shutting Down",
 };